@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+识别引擎基准测试
+使用合成的屏幕图像评估识别算法的耗时与准确度，不依赖真实桌面
+
+用法:
+    python benchmark_recognition.py pyramid [--width 2560] [--height 1440] [--runs 10]
+    python benchmark_recognition.py locality [--width 1920] [--height 1080] [--runs 50]
+    python benchmark_recognition.py color [--runs 10]
+    python benchmark_recognition.py ocr [--corpus 截图目录] [--lang chi_sim+eng]
+    python benchmark_recognition.py capture [--runs 30] [--region 400x300]
+    python benchmark_recognition.py churn [--duration 600] [--interval 0.1] [--screen]
+    python benchmark_recognition.py record 录制目录 [--duration 30] [--fps 10]
+    python benchmark_recognition.py timing [--actions 50]
+    python benchmark_recognition.py replay 录制目录 [--image 模板.png] [--color #FF0000] [--text 开始]
+                                          [--speed 0] [--output 结果.json] [--compare 上次结果.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+import cv2
+
+# 添加项目路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, 'src'))
+
+from modules.image_recognition import (ImageRecognition, MATCH_MODE_NORMAL, MATCH_MODE_PYRAMID, hit_memory,
+                                       OCR_PRESETS, preprocess_for_ocr)
+from modules.ocr_worker import run_ocr
+from modules.screen_capture import CAPTURE_BACKENDS, create_capture_backend, frame_provider, ArrayBackend
+from modules.frame_recorder import record_screen, ReplayBackend
+
+
+def make_synthetic_screen(width, height, seed=0):
+    """生成带有窗口、按钮和文字的合成屏幕图像（BGR）"""
+    rng = np.random.default_rng(seed)
+    screen = np.full((height, width, 3), 235, dtype=np.uint8)
+
+    # 随机色块模拟窗口和按钮
+    for _ in range(width * height // 15000):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        w, h = int(rng.integers(20, 300)), int(rng.integers(15, 120))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.rectangle(screen, (x, y), (x + w, y + h), color, -1)
+
+    # 随机文字
+    for _ in range(width * height // 10000):
+        x, y = int(rng.integers(0, width)), int(rng.integers(10, height))
+        text = "".join(chr(int(c)) for c in rng.integers(65, 91, int(rng.integers(3, 10))))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.putText(screen, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, float(rng.uniform(0.4, 1.2)), color, 1)
+
+    # 轻微噪声，避免大片完全相同的像素
+    noise = rng.integers(-2, 3, screen.shape)
+    return np.clip(screen.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def timed(func, runs):
+    """多次运行取中位耗时（毫秒），返回 (耗时, 最后一次的结果)"""
+    durations = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return float(np.median(durations)), result
+
+
+def bench_pyramid(args):
+    """标准匹配与金字塔匹配的耗时/准确度对比"""
+    recognizer = ImageRecognition()
+    screen = make_synthetic_screen(args.width, args.height)
+    rng = np.random.default_rng(1)
+
+    print(f"屏幕尺寸: {args.width}x{args.height}，每个模板运行 {args.runs} 次")
+    print(f"{'模板尺寸':>8} {'标准(ms)':>10} {'金字塔(ms)':>10} {'加速比':>8} {'位置一致':>8} {'平均得分差':>10}")
+
+    for size in (32, 64, 128):
+        normal_total = pyramid_total = 0.0
+        same_position = 0
+        score_diff = 0.0
+        for _ in range(args.templates):
+            x = int(rng.integers(0, args.width - size))
+            y = int(rng.integers(0, args.height - size))
+            template = screen[y:y + size, x:x + size].copy()
+
+            normal_ms, (normal_score, normal_loc) = timed(
+                lambda: recognizer.match_template(screen, template, MATCH_MODE_NORMAL), args.runs)
+            pyramid_ms, (pyramid_score, pyramid_loc) = timed(
+                lambda: recognizer.match_template(screen, template, MATCH_MODE_PYRAMID), args.runs)
+
+            normal_total += normal_ms
+            pyramid_total += pyramid_ms
+            if abs(normal_loc[0] - pyramid_loc[0]) <= 1 and abs(normal_loc[1] - pyramid_loc[1]) <= 1:
+                same_position += 1
+            score_diff += abs(normal_score - pyramid_score)
+
+        count = args.templates
+        print(f"{size:>8} {normal_total / count:>10.2f} {pyramid_total / count:>10.2f} "
+              f"{normal_total / max(pyramid_total, 1e-9):>8.1f}x {same_position / count:>8.0%} "
+              f"{score_diff / count:>10.4f}")
+
+
+def bench_locality(args):
+    """
+    整帧搜索与"上次命中位置附近"局部搜索的耗时对比
+
+    同时给出内部定位函数和公开的 find_image(region=...) 两种口径，
+    后者包含取帧、模板缓存和结果处理等脚本实际承担的开销。
+    """
+    recognizer = ImageRecognition()
+    screen = make_synthetic_screen(args.width, args.height)
+    frame_provider.set_backend(ArrayBackend(screen))
+    region = (0, 0, args.width, args.height)
+    rng = np.random.default_rng(2)
+    hit_memory.forget()
+
+    print(f"屏幕尺寸: {args.width}x{args.height}，每个模板运行 {args.runs} 次")
+    print(f"{'模板尺寸':>8} {'整帧(ms)':>10} {'局部(us)':>10} {'加速比':>8} "
+          f"{'find_image整帧(ms)':>20} {'find_image局部(us)':>20} {'加速比':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (32, 64, 128):
+            x = int(rng.integers(0, args.width - size))
+            y = int(rng.integers(0, args.height - size))
+            template = screen[y:y + size, x:x + size].copy()
+            key = f"bench_locality_{size}"
+            path = os.path.join(directory, f"{key}.png")
+            cv2.imwrite(path, template)
+
+            full_ms, _ = timed(
+                lambda: recognizer._locate_template(screen, (0, 0), template, 0.8), args.runs)
+            # 第一次整帧搜索记住位置，之后走局部搜索
+            recognizer._locate_template(screen, (0, 0), template, 0.8, memory_key=key)
+            local_ms, _ = timed(
+                lambda: recognizer._locate_template(screen, (0, 0), template, 0.8, memory_key=key), args.runs)
+
+            # 公开接口：关闭局部搜索测整帧，再打开测局部
+            recognizer.configure_locality(False)
+            public_full_ms, _ = timed(lambda: recognizer.find_image(path, 0.8, region=region), args.runs)
+            recognizer.configure_locality(True)
+            recognizer.find_image(path, 0.8, region=region)
+            public_local_ms, _ = timed(lambda: recognizer.find_image(path, 0.8, region=region), args.runs)
+
+            print(f"{size:>8} {full_ms:>10.2f} {local_ms * 1000:>10.0f} {full_ms / max(local_ms, 1e-9):>8.0f}x "
+                  f"{public_full_ms:>20.2f} {public_local_ms * 1000:>20.0f} "
+                  f"{public_full_ms / max(public_local_ms, 1e-9):>8.0f}x")
+
+    print(f"局部搜索命中率: {recognizer.get_locality_stats()['hit_rate']:.0%}")
+
+
+def legacy_find_color(screen, target_color, tolerance):
+    """改造前的 find_color 算法：三个int16差值平面 + 全图 np.where"""
+    b_diff = np.abs(screen[:, :, 0].astype(np.int16) - target_color[2])
+    g_diff = np.abs(screen[:, :, 1].astype(np.int16) - target_color[1])
+    r_diff = np.abs(screen[:, :, 2].astype(np.int16) - target_color[0])
+    mask = (r_diff <= tolerance) & (g_diff <= tolerance) & (b_diff <= tolerance)
+    locations = np.where(mask)
+    if len(locations[0]) > 0:
+        return (int(locations[1][0]), int(locations[0][0]))
+    return None
+
+
+def bench_color(args):
+    """
+    分块提前退出找色与原实现在1080p/4K下的耗时对比
+
+    find_color 列为公开接口的端到端耗时（每次重新取帧），包含脚本实际承担的全部开销。
+    """
+    recognizer = ImageRecognition()
+    target = (255, 0, 255)  # 合成屏幕中不会随机出现的品红色
+    tolerance = 10
+
+    def public_find_color(region):
+        frame_provider.invalidate()
+        return recognizer.find_color(target, tolerance, region=region)
+
+    print(f"每种情况运行 {args.runs} 次")
+    print(f"{'分辨率':>10} {'目标位置':>8} {'原实现(ms)':>12} {'分块(ms)':>10} {'加速比':>8} "
+          f"{'find_color(ms)':>14} {'加速比':>8} {'结果一致':>8}")
+
+    for width, height in ((1920, 1080), (3840, 2160)):
+        base = make_synthetic_screen(width, height)
+        for label, row in (("顶部", height // 20), ("中部", height // 2), ("底部", height - 5), ("不存在", None)):
+            screen = base.copy()
+            if row is not None:
+                screen[row:row + 3, width // 3:width // 3 + 3] = target[::-1]
+
+            frame_provider.set_backend(ArrayBackend(screen))
+            region = (0, 0, width, height)
+
+            legacy_ms, legacy_pos = timed(lambda: legacy_find_color(screen, target, tolerance), args.runs)
+            tiled_ms, tiled_pos = timed(lambda: recognizer._scan_color(screen, target, tolerance, 0, 0), args.runs)
+            public_ms, public_pos = timed(lambda: public_find_color(region), args.runs)
+
+            print(f"{f'{width}x{height}':>10} {label:>8} {legacy_ms:>12.2f} {tiled_ms:>10.2f} "
+                  f"{legacy_ms / max(tiled_ms, 1e-9):>8.1f}x {public_ms:>14.2f} "
+                  f"{legacy_ms / max(public_ms, 1e-9):>8.1f}x {str(legacy_pos == tiled_pos == public_pos):>8}")
+
+
+def make_text_corpus(count=12, seed=3):
+    """生成带已知文字的合成截图语料：[(名称, BGR图像, [期望文字, ...]), ...]"""
+    rng = np.random.default_rng(seed)
+    words = ["Start", "Cancel", "Confirm", "Level 12", "Gold 3500", "Settings", "Inventory", "Quest", "09:45", "98%"]
+    corpus = []
+    for i in range(count):
+        dark = i % 2 == 1
+        image = np.full((360, 640, 3), 40 if dark else 230, dtype=np.uint8)
+        color = (230, 230, 230) if dark else (30, 30, 30)
+        labels = []
+        for row in range(4):
+            text = words[int(rng.integers(0, len(words)))]
+            font_scale = float(rng.choice([0.45, 0.6, 0.9]))
+            cv2.putText(image, text, (int(rng.integers(10, 300)), 60 + row * 80),
+                        cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, 1, cv2.LINE_AA)
+            labels.append(text)
+        corpus.append((f"synthetic_{i:02d}", image, labels))
+    return corpus
+
+
+def load_text_corpus(directory):
+    """
+    读取截图语料目录：目录下的 labels.json 为 {"文件名": ["期望文字", ...]}
+    """
+    with open(os.path.join(directory, "labels.json"), "r", encoding="utf-8") as f:
+        labels = json.load(f)
+    corpus = []
+    for filename, texts in labels.items():
+        image = cv2.imread(os.path.join(directory, filename))
+        if image is None:
+            print(f"跳过无法读取的截图: {filename}")
+            continue
+        corpus.append((filename, image, texts))
+    return corpus
+
+
+def bench_ocr(args):
+    """各OCR预处理预设的耗时与命中率"""
+    recognizer = ImageRecognition()
+    corpus = load_text_corpus(args.corpus) if args.corpus else make_text_corpus()
+    total_labels = sum(len(texts) for _, _, texts in corpus)
+
+    print(f"语料: {len(corpus)} 张截图，{total_labels} 个期望文字，语言: {args.lang or '默认'}")
+    print(f"{'预设':>12} {'中位耗时(ms)':>12} {'命中率':>8}")
+
+    for preset in OCR_PRESETS:
+        durations = []
+        hits = 0
+        for _, image, texts in corpus:
+            start = time.perf_counter()
+            processed, _, config = preprocess_for_ocr(image, preset)
+            words = run_ocr(processed, args.lang, config)
+            durations.append((time.perf_counter() - start) * 1000)
+            hits += sum(1 for text in texts if recognizer._locate_text(words, text, args.threshold))
+
+        print(f"{preset:>12} {float(np.median(durations)):>12.1f} {hits / max(total_labels, 1):>8.0%}")
+
+
+def bench_capture(args):
+    """各屏幕采集后端的全屏/区域截图耗时与帧率（需要真实桌面）"""
+    try:
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv)  # Qt后端需要QApplication，保持引用直到结束
+    except ImportError:
+        app = None
+
+    region_width, region_height = (int(v) for v in args.region.lower().split("x"))
+    region = (0, 0, region_width, region_height)
+
+    print(f"每种情况运行 {args.runs} 次，区域: {region_width}x{region_height}")
+    print(f"{'后端':>10} {'全屏尺寸':>10} {'全屏(ms)':>10} {'全屏FPS':>8} {'区域(ms)':>10} {'区域FPS':>8}")
+
+    for name in CAPTURE_BACKENDS:
+        try:
+            backend = create_capture_backend(name)
+            frame = backend.grab()  # 预热（首次调用会初始化设备上下文等）
+        except Exception as e:
+            print(f"{name:>10} 不可用: {e}")
+            continue
+
+        full_ms, _ = timed(backend.grab, args.runs)
+        region_ms, _ = timed(lambda: backend.grab(region), args.runs)
+        backend.close()
+
+        size = f"{frame.shape[1]}x{frame.shape[0]}"
+        print(f"{name:>10} {size:>10} {full_ms:>10.2f} {1000 / max(full_ms, 1e-9):>8.1f} "
+              f"{region_ms:>10.2f} {1000 / max(region_ms, 1e-9):>8.1f}")
+
+
+def bench_churn(args):
+    """轮询脚本在每次截图都分配新数组与复用预分配缓冲区两种方式下的内存分配量"""
+    recognizer = ImageRecognition()
+    if args.screen:
+        frame_provider.set_backend(create_capture_backend("auto"))
+    else:
+        frame_provider.set_backend(ArrayBackend(make_synthetic_screen(args.width, args.height)))
+    region = (args.width // 4, args.height // 4, args.width // 2, args.height // 2)
+
+    print(f"每种方式轮询 {args.duration:.0f} 秒，间隔 {args.interval} 秒，采集后端: {frame_provider.backend.name}")
+    print(f"{'方式':>8} {'轮询次数':>8} {'帧分配次数':>10} {'帧分配(MB)':>10} {'MB/分钟':>10} {'峰值(MB)':>10}")
+
+    for label, reuse in (("每次分配", False), ("复用缓冲", True)):
+        frame_provider.set_buffer_reuse(reuse)
+        allocations_before = frame_provider.buffer_allocations
+        bytes_before = frame_provider.allocated_bytes
+        tracemalloc.start()
+        polls = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.duration:
+            # 模拟典型轮询脚本：找一个不存在的颜色、在区域内找色，然后等待下一轮
+            frame_provider.invalidate()
+            recognizer.find_color((255, 0, 255), 10)
+            recognizer.find_color((255, 0, 255), 10, region=region)
+            polls += 1
+            time.sleep(args.interval)
+        elapsed_minutes = (time.perf_counter() - start) / 60
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        allocated_mb = (frame_provider.allocated_bytes - bytes_before) / (1024 * 1024)
+        print(f"{label:>8} {polls:>8} {frame_provider.buffer_allocations - allocations_before:>10} "
+              f"{allocated_mb:>10.1f} {allocated_mb / max(elapsed_minutes, 1e-9):>10.1f} {peak / (1024 * 1024):>10.1f}")
+
+
+def bench_record(args):
+    """录制屏幕帧序列，供 replay 离线回放"""
+    print(f"录制 {args.duration} 秒，{args.fps} 帧/秒 -> {args.path}")
+    frames = record_screen(args.path, args.duration, args.fps, backend=args.backend)
+    print(f"已录制 {frames} 帧")
+
+
+def bench_timing(args):
+    """各操作节奏下一个多次点击积木的停顿与操作耗时（不产生真实输入）"""
+    from modules.timing_profiles import TIMING_PROFILES, ACTION_CLICK, timed_action, timing_stats
+
+    def fake_click():
+        time.sleep(0.002)  # 模拟一次输入注入的耗时
+
+    timing_stats.reset()
+    print(f"每种节奏执行 {args.actions} 次点击")
+    for profile in TIMING_PROFILES:
+        for _ in range(args.actions):
+            timed_action(profile, ACTION_CLICK, fake_click)
+    print(timing_stats.format_report())
+
+
+def replay_queries(args):
+    """根据命令行参数生成回放时要执行的识别查询：[(名称, 函数), ...]"""
+    recognizer = ImageRecognition()
+    queries = []
+    for path in args.image or []:
+        queries.append((f"find_image:{os.path.basename(path)}",
+                        lambda path=path: recognizer.find_image(path, args.threshold)))
+    for color in args.color or []:
+        queries.append((f"find_color:{color}", lambda color=color: recognizer.find_color(color, args.tolerance)))
+    for text in args.text or []:
+        queries.append((f"find_text:{text}",
+                        lambda text=text: recognizer.find_text(text, threshold=args.threshold, lang=args.lang)))
+    return queries
+
+
+def bench_replay(args):
+    """回放录制的帧，逐帧执行识别查询，输出耗时并与上次结果逐帧对比"""
+    queries = replay_queries(args)
+    if not queries:
+        print("请至少指定一个 --image、--color 或 --text")
+        return
+
+    backend = ReplayBackend(args.path, speed=args.speed)
+    frame_provider.set_backend(backend)
+    frame_provider.set_max_age(3600)  # 每帧只截一次，由下面的 invalidate 控制换帧
+    mode = "逐帧" if args.speed == 0 else f"{args.speed:g}倍速"
+    print(f"回放 {args.path}: {len(backend.recording)} 帧，{backend.recording.duration:.1f} 秒，{mode}")
+
+    results = []
+    durations = {name: [] for name, _ in queries}
+    while not backend.finished:
+        frame_provider.invalidate()
+        frame_provider.get_frame()  # 前进到下一帧，之后的查询共享这一帧
+        record = {"frame": backend.index, "results": {}}
+        for name, query in queries:
+            start = time.perf_counter()
+            result = query()
+            durations[name].append((time.perf_counter() - start) * 1000)
+            record["results"][name] = list(result) if isinstance(result, tuple) else result
+        results.append(record)
+
+    print(f"{'查询':>24} {'次数':>6} {'中位(ms)':>10} {'最大(ms)':>10} {'命中':>6}")
+    for name, _ in queries:
+        hits = sum(1 for record in results if record["results"][name])
+        print(f"{name:>24} {len(durations[name]):>6} {float(np.median(durations[name])):>10.2f} "
+              f"{max(durations[name]):>10.2f} {hits:>6}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"recording": args.path, "speed": args.speed, "frames": results}, f, ensure_ascii=False)
+        print(f"结果已保存: {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = {record["frame"]: record["results"] for record in json.load(f)["frames"]}
+        differences = 0
+        for record in results:
+            expected = baseline.get(record["frame"])
+            if expected is None:
+                continue
+            for name, result in record["results"].items():
+                if name in expected and expected[name] != result:
+                    differences += 1
+                    print(f"  第 {record['frame']} 帧 {name}: {expected[name]} -> {result}")
+        print(f"与 {args.compare} 对比: {differences} 处结果不同")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="IDJ 识别引擎基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pyramid_parser = subparsers.add_parser("pyramid", help="标准匹配与金字塔匹配对比")
+    pyramid_parser.add_argument("--width", type=int, default=2560)
+    pyramid_parser.add_argument("--height", type=int, default=1440)
+    pyramid_parser.add_argument("--runs", type=int, default=10)
+    pyramid_parser.add_argument("--templates", type=int, default=10, help="每种尺寸随机抽取的模板数量")
+    pyramid_parser.set_defaults(func=bench_pyramid)
+
+    locality_parser = subparsers.add_parser("locality", help="整帧搜索与局部搜索对比")
+    locality_parser.add_argument("--width", type=int, default=1920)
+    locality_parser.add_argument("--height", type=int, default=1080)
+    locality_parser.add_argument("--runs", type=int, default=50)
+    locality_parser.set_defaults(func=bench_locality)
+
+    color_parser = subparsers.add_parser("color", help="分块找色与原实现对比（1080p/4K）")
+    color_parser.add_argument("--runs", type=int, default=10)
+    color_parser.set_defaults(func=bench_color)
+
+    ocr_parser = subparsers.add_parser("ocr", help="OCR预处理预设的耗时与命中率")
+    ocr_parser.add_argument("--corpus", help="截图语料目录（含labels.json），不指定时使用合成语料")
+    ocr_parser.add_argument("--lang", default=None)
+    ocr_parser.add_argument("--threshold", type=float, default=0.8)
+    ocr_parser.set_defaults(func=bench_ocr)
+
+    capture_parser = subparsers.add_parser("capture", help="屏幕采集后端的截图耗时与帧率")
+    capture_parser.add_argument("--runs", type=int, default=30)
+    capture_parser.add_argument("--region", default="400x300", help="区域截图尺寸，宽x高")
+    capture_parser.set_defaults(func=bench_capture)
+
+    churn_parser = subparsers.add_parser("churn", help="轮询脚本的截图内存分配量（每次分配与复用缓冲区对比）")
+    churn_parser.add_argument("--duration", type=float, default=600, help="每种方式的轮询时长（秒）")
+    churn_parser.add_argument("--interval", type=float, default=0.1)
+    churn_parser.add_argument("--width", type=int, default=3840)
+    churn_parser.add_argument("--height", type=int, default=2160)
+    churn_parser.add_argument("--screen", action="store_true", help="使用真实屏幕而不是合成画面")
+    churn_parser.set_defaults(func=bench_churn)
+
+    record_parser = subparsers.add_parser("record", help="录制屏幕帧序列")
+    record_parser.add_argument("path", help="录制目录")
+    record_parser.add_argument("--duration", type=float, default=30)
+    record_parser.add_argument("--fps", type=float, default=10)
+    record_parser.add_argument("--backend", default="auto", help="采集后端")
+    record_parser.set_defaults(func=bench_record)
+
+    timing_parser = subparsers.add_parser("timing", help="各操作节奏的停顿与操作耗时")
+    timing_parser.add_argument("--actions", type=int, default=50)
+    timing_parser.set_defaults(func=bench_timing)
+
+    replay_parser = subparsers.add_parser("replay", help="回放录制的帧并逐帧执行识别")
+    replay_parser.add_argument("path", help="录制目录")
+    replay_parser.add_argument("--image", action="append", help="find_image 的模板路径，可重复")
+    replay_parser.add_argument("--color", action="append", help="find_color 的颜色，可重复")
+    replay_parser.add_argument("--text", action="append", help="find_text 的文字，可重复")
+    replay_parser.add_argument("--threshold", type=float, default=0.8)
+    replay_parser.add_argument("--tolerance", type=int, default=10)
+    replay_parser.add_argument("--lang", default=None)
+    replay_parser.add_argument("--speed", type=float, default=0, help="0为逐帧，1为原速，大于1为加速")
+    replay_parser.add_argument("--output", help="保存逐帧结果的JSON文件")
+    replay_parser.add_argument("--compare", help="与之前保存的逐帧结果对比")
+    replay_parser.set_defaults(func=bench_replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -27,9 +27,11 @@ def build():
         '--hidden-import=numpy',
         '--hidden-import=PIL',
         '--hidden-import=pyautogui',
+        '--hidden-import=mss',
         '--hidden-import=win32gui',
         '--hidden-import=win32con',
         '--hidden-import=win32api',
+        '--hidden-import=win32clipboard',
         '--hidden-import=psutil',
         '--hidden-import=pynput',
         '--hidden-import=pynput.mouse',
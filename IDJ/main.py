@@ -8,6 +8,7 @@ IDJ - 脚本自动化软件
 import sys
 import os
 import logging
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
@@ -61,4 +62,6 @@ def main():
     return app.exec_()
 
 if __name__ == "__main__":
+    # 打包为exe后OCR进程池的子进程需要
+    multiprocessing.freeze_support()
     sys.exit(main())
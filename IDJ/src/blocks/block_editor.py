@@ -11,10 +11,10 @@ import time
 import re
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton,
-    QListWidget, QTreeWidget, QTreeWidgetItem, QLabel, QLineEdit,
+    QListWidget, QListWidgetItem, QTreeWidget, QTreeWidgetItem, QLabel, QLineEdit,
     QSpinBox, QDoubleSpinBox, QComboBox, QCheckBox, QFileDialog,
     QMessageBox, QScrollArea, QTabWidget, QGraphicsView, QGraphicsScene,
-    QGraphicsRectItem, QGraphicsTextItem, QGraphicsItem, QDialog, QFrame
+    QGraphicsRectItem, QGraphicsTextItem, QGraphicsItem, QDialog, QFrame, QPlainTextEdit
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QPointF, QRectF
 from PyQt5.QtGui import QFont, QColor, QPen, QBrush, QCursor
@@ -124,6 +124,23 @@ class BlockItem(QGraphicsRectItem):
             param_value = str(self.properties.get('time', 1))
             param_label_before = "等待"
             param_label_after = "秒"
+        elif self.block_type in ("wait_for_image", "wait_for_color", "wait_for_text"):
+            param_value = str(self.properties.get('timeout', 10))
+            param_label_before = {"wait_for_image": "等待图像", "wait_for_color": "等待颜色",
+                                  "wait_for_text": "等待文字"}[self.block_type]
+            param_label_after = "秒内"
+        elif self.block_type == "capture_stream":
+            fps = self.properties.get('fps', 30)
+            if fps > 0:
+                param_value = str(fps)
+                param_label_before = "后台截图"
+                param_label_after = "帧/秒"
+            else:
+                param_label_before = "停止后台截图"
+        elif self.block_type == "set_timing_profile":
+            param_value = {"turbo": "极速", "normal": "标准", "human": "拟人"}.get(
+                self.properties.get('timing_profile', 'normal'), "标准")
+            param_label_before = "操作节奏"
         elif self.block_type == "mouse_click":
             param_label_before = "鼠标点击"
         elif self.block_type == "mouse_move":
@@ -145,6 +162,17 @@ class BlockItem(QGraphicsRectItem):
             param_label_before = "按键"
         elif self.block_type == "find_image":
             param_label_before = "查找图像"
+        elif self.block_type == "find_any_image":
+            param_value = f"{len(self.properties.get('image_paths', []))}张"
+            param_label_before = "查找任一图像"
+        elif self.block_type == "find_all_images":
+            param_label_before = "查找所有图像"
+        elif self.block_type == "find_colors":
+            param_value = f"{len(self.properties.get('palette', []))}种"
+            param_label_before = "查找多种颜色"
+        elif self.block_type == "find_color_pattern":
+            param_value = f"{len(self.properties.get('offsets', [])) + 1}点"
+            param_label_before = "多点找色"
         elif self.block_type == "find_text":
             text = self.properties.get('text', '')
             if len(text) > 6:
@@ -566,6 +594,22 @@ class BlockItem(QGraphicsRectItem):
             label_width = fm.width("等待") + 8
             param_width = max(fm.width(time_val) + 20, 40) + 8
             suffix_width = fm.width("秒")
+        elif self.block_type in ("wait_for_image", "wait_for_color", "wait_for_text"):
+            timeout_val = str(self.properties.get('timeout', 10))
+            label_width = fm.width("等待图像") + 8
+            param_width = max(fm.width(timeout_val) + 20, 40) + 8
+            suffix_width = fm.width("秒内")
+        elif self.block_type == "capture_stream":
+            fps = self.properties.get('fps', 30)
+            if fps > 0:
+                label_width = fm.width("后台截图") + 8
+                param_width = max(fm.width(str(fps)) + 20, 40) + 8
+                suffix_width = fm.width("帧/秒")
+            else:
+                label_width = fm.width("停止后台截图")
+        elif self.block_type == "set_timing_profile":
+            label_width = fm.width("操作节奏") + 8
+            param_width = max(fm.width("极速") + 20, 40)
         elif self.block_type == "mouse_click":
             label_width = fm.width("鼠标点击")
         elif self.block_type == "mouse_move":
@@ -586,6 +630,20 @@ class BlockItem(QGraphicsRectItem):
             param_width = max(fm.width(key) + 20, 40)
         elif self.block_type == "find_image":
             label_width = fm.width("查找图像")
+        elif self.block_type == "find_any_image":
+            count_text = f"{len(self.properties.get('image_paths', []))}张"
+            label_width = fm.width("查找任一图像") + 8
+            param_width = max(fm.width(count_text) + 20, 40)
+        elif self.block_type == "find_all_images":
+            label_width = fm.width("查找所有图像")
+        elif self.block_type == "find_colors":
+            count_text = f"{len(self.properties.get('palette', []))}种"
+            label_width = fm.width("查找多种颜色") + 8
+            param_width = max(fm.width(count_text) + 20, 40)
+        elif self.block_type == "find_color_pattern":
+            count_text = f"{len(self.properties.get('offsets', [])) + 1}点"
+            label_width = fm.width("多点找色") + 8
+            param_width = max(fm.width(count_text) + 20, 40)
         elif self.block_type == "find_text":
             text = self.properties.get('text', '')
             display_text = text[:6] + "..." if len(text) > 6 else text
@@ -636,6 +694,9 @@ class BlockItem(QGraphicsRectItem):
             "function": QColor(255, 179, 128),
             "wait": QColor(255, 179, 128),
             "delay": QColor(255, 179, 128),
+            "wait_for_image": QColor(255, 179, 128),
+            "wait_for_color": QColor(255, 179, 128),
+            "wait_for_text": QColor(255, 179, 128),
             "jump": QColor(255, 179, 128),
 
             # 动作积木 - 柔和蓝色
@@ -646,12 +707,18 @@ class BlockItem(QGraphicsRectItem):
             # 键盘积木 - 柔和天蓝色
             "keyboard_input": QColor(153, 204, 255),
             "keyboard_key": QColor(153, 204, 255),
+            "set_timing_profile": QColor(128, 179, 255),
             
             # 图像识别积木 - 柔和紫色
             "find_image": QColor(191, 153, 255),
+            "find_any_image": QColor(191, 153, 255),
+            "find_all_images": QColor(191, 153, 255),
+            "find_colors": QColor(191, 153, 255),
+            "find_color_pattern": QColor(191, 153, 255),
             "find_text": QColor(191, 153, 255),
             "find_color": QColor(191, 153, 255),
             "image_match": QColor(191, 153, 255),
+            "capture_stream": QColor(191, 153, 255),
             
             # 脚本积木 - 柔和青色
             "run_script": QColor(128, 230, 230),
@@ -1963,6 +2030,9 @@ class BlockEditor(QWidget):
         QTreeWidgetItem(control_group, ["如果", "if"])
         QTreeWidgetItem(control_group, ["函数", "function"])
         QTreeWidgetItem(control_group, ["等待", "wait"])
+        QTreeWidgetItem(control_group, ["等待图像出现", "wait_for_image"])
+        QTreeWidgetItem(control_group, ["等待颜色出现", "wait_for_color"])
+        QTreeWidgetItem(control_group, ["等待文字出现", "wait_for_text"])
         QTreeWidgetItem(control_group, ["跳转", "jump"])
         
         # 逻辑操作分组
@@ -1978,13 +2048,19 @@ class BlockEditor(QWidget):
         QTreeWidgetItem(action_group, ["鼠标拖拽", "mouse_drag"])
         QTreeWidgetItem(action_group, ["键盘输入", "keyboard_input"])
         QTreeWidgetItem(action_group, ["键盘按键", "keyboard_key"])
+        QTreeWidgetItem(action_group, ["操作节奏", "set_timing_profile"])
         
         # 图像操作分组
         image_group = QTreeWidgetItem(self.block_library, ["图像操作"])
         QTreeWidgetItem(image_group, ["查找图像", "find_image"])
+        QTreeWidgetItem(image_group, ["查找任一图像", "find_any_image"])
+        QTreeWidgetItem(image_group, ["查找所有图像", "find_all_images"])
         QTreeWidgetItem(image_group, ["查找文字", "find_text"])
         QTreeWidgetItem(image_group, ["查找颜色", "find_color"])
+        QTreeWidgetItem(image_group, ["查找多种颜色", "find_colors"])
+        QTreeWidgetItem(image_group, ["多点找色", "find_color_pattern"])
         QTreeWidgetItem(image_group, ["图像匹配", "image_match"])
+        QTreeWidgetItem(image_group, ["后台截图", "capture_stream"])
         
         # 脚本操作分组
         script_group = QTreeWidgetItem(self.block_library, ["脚本操作"])
@@ -2020,24 +2096,34 @@ class BlockEditor(QWidget):
                     # 保存截图到临时文件
                     import os
                     import time
+                    from modules.image_saver import save_image_async
                     temp_dir = "temp"
                     if not os.path.exists(temp_dir):
                         os.makedirs(temp_dir)
                     
-                    timestamp = int(time.time())
+                    # 毫秒时间戳，连续截取多个模板时文件名不会重复
+                    timestamp = int(time.time() * 1000)
                     filename = f"screenshot_{timestamp}.png"
                     file_path = os.path.join(temp_dir, filename)
                     
-                    pixmap.save(file_path)
-                    logger.info(f"快速截图成功，保存到: {file_path}")
+                    selected_block = self.selected_block
                     
-                    # 更新文本框
-                    if hasattr(self, 'image_path_edit'):
-                        self.image_path_edit.setText(file_path)
-                        # 更新选中积木的属性
-                        if self.selected_block:
-                            self.selected_block.properties["image_path"] = file_path
+                    def on_saved(path, error):
+                        if error is not None:
+                            logger.error(f"快速截图保存失败: {error}")
+                            QMessageBox.critical(self, "错误", f"快速截图保存失败: {error}")
+                            return
+                        logger.info(f"快速截图成功，保存到: {path}")
+                        
+                        # 更新选中积木的属性（保存期间切换了积木时不更新）
+                        if selected_block and self.selected_block is selected_block:
+                            if hasattr(self, 'image_path_edit'):
+                                self.image_path_edit.setText(path)
+                            selected_block.properties["image_path"] = path
                             self.update_script()
+                    
+                    # 编码和写盘在后台进行，文件落盘后才更新积木属性，连续截图时界面不会卡顿
+                    save_image_async(pixmap, file_path, callback=on_saved)
                 else:
                     logger.info("快速截图已取消")
             
@@ -2068,33 +2154,53 @@ class BlockEditor(QWidget):
                     # 保存截图到临时文件
                     import os
                     import time
+                    from modules.image_saver import save_image_async
                     temp_dir = "temp"
                     if not os.path.exists(temp_dir):
                         os.makedirs(temp_dir)
                     
-                    timestamp = int(time.time())
+                    # 毫秒时间戳，连续截取多个模板时文件名不会重复
+                    timestamp = int(time.time() * 1000)
                     filename = f"screenshot_{timestamp}.png"
                     file_path = os.path.join(temp_dir, filename)
                     
-                    pixmap.save(file_path)
-                    logger.info(f"操作数 {operand_name} 快速截图成功，保存到: {file_path}")
-                    
-                    # 更新对应的文本框
-                    if operand_name == "operand1" and hasattr(self, 'operand1_edit'):
-                        self.operand1_edit.setText(file_path)
-                        block_item.properties["operand1"] = file_path
-                    elif operand_name == "operand2" and hasattr(self, 'operand2_edit'):
-                        self.operand2_edit.setText(file_path)
-                        block_item.properties["operand2"] = file_path
-                    elif operand_name == "operand" and hasattr(self, 'operand_edit'):
-                        self.operand_edit.setText(file_path)
-                        block_item.properties["operand"] = file_path
-                    elif operand_name == "image_path" and hasattr(self, 'image_path_edit'):
-                        self.image_path_edit.setText(file_path)
-                        block_item.properties["image_path"] = file_path
+                    def on_saved(path, error):
+                        if error is not None:
+                            logger.error(f"操作数 {operand_name} 快速截图保存失败: {error}")
+                            QMessageBox.critical(self, "错误", f"快速截图保存失败: {error}")
+                            return
+                        logger.info(f"操作数 {operand_name} 快速截图成功，保存到: {path}")
+                        
+                        # 保存期间切换了积木时，属性编辑器已属于其他积木，只更新积木属性
+                        editing = self.selected_block is block_item
+                        
+                        # 更新对应的文本框
+                        if operand_name == "operand1" and hasattr(self, 'operand1_edit'):
+                            if editing:
+                                self.operand1_edit.setText(path)
+                            block_item.properties["operand1"] = path
+                        elif operand_name == "operand2" and hasattr(self, 'operand2_edit'):
+                            if editing:
+                                self.operand2_edit.setText(path)
+                            block_item.properties["operand2"] = path
+                        elif operand_name == "operand" and hasattr(self, 'operand_edit'):
+                            if editing:
+                                self.operand_edit.setText(path)
+                            block_item.properties["operand"] = path
+                        elif operand_name == "image_path" and hasattr(self, 'image_path_edit'):
+                            if editing:
+                                self.image_path_edit.setText(path)
+                            block_item.properties["image_path"] = path
+                        elif operand_name == "image_paths" and hasattr(self, 'image_list_widget'):
+                            if editing:
+                                self.image_list_widget.addItem(path)
+                            block_item.properties.setdefault("image_paths", []).append(path)
+                        
+                        # 更新脚本
+                        self.update_script()
                     
-                    # 更新脚本
-                    self.update_script()
+                    # 编码和写盘在后台进行，文件落盘后才更新积木属性，连续截图时界面不会卡顿
+                    save_image_async(pixmap, file_path, callback=on_saved)
                 else:
                     logger.info(f"操作数 {operand_name} 快速截图已取消")
             
@@ -2367,6 +2473,21 @@ class BlockEditor(QWidget):
                 "desc": "暂停脚本执行指定时间。",
                 "usage": "• 设置等待秒数\n• 用于控制执行节奏\n• 等待页面加载等场景"
             },
+            "wait_for_image": {
+                "title": "⏳ 等待图像出现",
+                "desc": "等待指定图像出现在屏幕上，超时后按设置继续或停止脚本。",
+                "usage": "• 设置超时时间\n• 画面静止时自动降低检查频率\n• 代替\"重复直到找到图像\"循环"
+            },
+            "wait_for_color": {
+                "title": "⏳ 等待颜色出现",
+                "desc": "等待指定颜色出现在屏幕上，超时后按设置继续或停止脚本。",
+                "usage": "• 设置目标颜色和容差\n• 设置超时时间\n• 适合等待状态指示灯、进度条"
+            },
+            "wait_for_text": {
+                "title": "⏳ 等待文字出现",
+                "desc": "等待指定文字出现在屏幕上，超时后按设置继续或停止脚本。",
+                "usage": "• 设置要等待的文字\n• 设置超时时间\n• 建议限定搜索区域以减少识别耗时"
+            },
             "delay": {
                 "title": "⏱️ 延时",
                 "desc": "短暂延迟脚本执行。",
@@ -2390,7 +2511,7 @@ class BlockEditor(QWidget):
             "keyboard_input": {
                 "title": "⌨️ 键盘输入",
                 "desc": "模拟键盘输入文字。",
-                "usage": "• 输入指定文本\n• 可设置输入速度\n• 支持中英文输入"
+                "usage": "• 输入指定文本\n• 可设置输入速度\n• 支持中英文输入\n• 长文本可用剪贴板粘贴快速输入"
             },
             "keyboard_key": {
                 "title": "⌨️ 按键操作",
@@ -2402,6 +2523,26 @@ class BlockEditor(QWidget):
                 "desc": "在屏幕上查找指定图像。",
                 "usage": "• 选择目标图像文件\n• 设置匹配阈值\n• 找到后可点击/移动"
             },
+            "find_any_image": {
+                "title": "🔍 查找任一图像",
+                "desc": "在同一张截图上同时查找多张图像，对找到的第一张执行操作。",
+                "usage": "• 添加多张候选图像\n• 只截图一次，并行匹配\n• 按列表顺序取第一个找到的图像"
+            },
+            "find_all_images": {
+                "title": "🔍 查找所有图像",
+                "desc": "找出屏幕上某个图像的全部出现位置，并依次对每个位置执行操作。",
+                "usage": "• 适合背包格子、未读标记等重复元素\n• 只截图和匹配一次\n• 可按匹配度或从上到下、从左到右排序"
+            },
+            "find_colors": {
+                "title": "🎨 查找多种颜色",
+                "desc": "一次扫描同时查找多种颜色，按找到的颜色执行各自的动作。",
+                "usage": "• 为每种颜色设置动作\n• 列表靠前的颜色优先\n• 比多个查找颜色积木快得多"
+            },
+            "find_color_pattern": {
+                "title": "🎯 多点找色",
+                "desc": "用一个锚点颜色加若干相对位置的颜色识别界面元素，比图像匹配快得多。",
+                "usage": "• 点击\"从截图提取\"框选元素自动生成\n• 每行一个偏移点: dx, dy, #颜色\n• 返回锚点（元素中心）位置"
+            },
             "find_text": {
                 "title": "🔍 查找文字",
                 "desc": "在屏幕上查找指定文字。",
@@ -2417,6 +2558,16 @@ class BlockEditor(QWidget):
                 "desc": "匹配屏幕上的图像并执行操作。",
                 "usage": "• 选择模板图像\n• 设置匹配精度\n• 支持多种匹配动作"
             },
+            "set_timing_profile": {
+                "title": "⚡ 操作节奏",
+                "desc": "设置之后所有鼠标键盘操作的停顿节奏：极速不停顿，标准每次操作后停顿0.1秒，拟人随机停顿。",
+                "usage": "• 放在脚本开头设置整个脚本的节奏\n• 单个积木可以在属性中单独指定节奏\n• 脚本结束时在日志中输出停顿与操作耗时统计"
+            },
+            "capture_stream": {
+                "title": "🎞️ 后台截图",
+                "desc": "在后台按固定帧率持续截图，之后的识别积木直接使用最新画面，不再等待截图。",
+                "usage": "• 设置目标帧率，0表示停止\n• 适合持续监视屏幕的脚本\n• 多个脚本共享同一个截图流"
+            },
             "jump": {
                 "title": "↪️ 跳转",
                 "desc": "跳转到指定的积木位置。",
@@ -2641,10 +2792,146 @@ class BlockEditor(QWidget):
                 self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "click"), 0))
                 self.property_form_layout.addWidget(self.action_combo)
                 
+                # 匹配模式
+                match_mode_label = QLabel("匹配模式:")
+                self.property_form_layout.addWidget(match_mode_label)
+                
+                self.match_mode_combo = QComboBox()
+                self.match_mode_combo.addItems(["标准匹配", "金字塔匹配（大屏更快）"])
+                match_mode_map = {"normal": 0, "pyramid": 1}
+                self.match_mode_combo.setCurrentIndex(match_mode_map.get(block_item.properties.get("match_mode", "normal"), 0))
+                self.property_form_layout.addWidget(self.match_mode_combo)
+                
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
                 self.property_form_layout.addWidget(save_btn)
+            elif block_type == "find_any_image":
+                # 候选图像列表
+                images_label = QLabel("候选图像（按顺序优先）:")
+                self.property_form_layout.addWidget(images_label)
+                
+                self.image_list_widget = QListWidget()
+                self.image_list_widget.addItems(block_item.properties.get("image_paths", []))
+                self.image_list_widget.setFixedHeight(120)
+                self.property_form_layout.addWidget(self.image_list_widget)
+                
+                image_buttons_layout = QHBoxLayout()
+                add_images_btn = QPushButton("添加图像")
+                add_images_btn.clicked.connect(lambda: self.browse_image_list_files(block_item))
+                image_buttons_layout.addWidget(add_images_btn)
+                
+                screenshot_btn = QPushButton("快速截图")
+                screenshot_btn.clicked.connect(lambda: self.quick_screenshot_for_operand(block_item, "image_paths"))
+                image_buttons_layout.addWidget(screenshot_btn)
+                
+                remove_image_btn = QPushButton("删除选中")
+                remove_image_btn.clicked.connect(lambda: self.image_list_widget.takeItem(self.image_list_widget.currentRow()))
+                image_buttons_layout.addWidget(remove_image_btn)
+                
+                self.property_form_layout.addLayout(image_buttons_layout)
+                
+                threshold_label = QLabel("匹配阈值:")
+                self.property_form_layout.addWidget(threshold_label)
+                
+                self.threshold_spin = QDoubleSpinBox()
+                self.threshold_spin.setRange(0.1, 1.0)
+                self.threshold_spin.setSingleStep(0.1)
+                self.threshold_spin.setValue(block_item.properties.get("threshold", 0.8))
+                self.property_form_layout.addWidget(self.threshold_spin)
+                
+                # 找到后的动作
+                action_label = QLabel("找到后的动作:")
+                self.property_form_layout.addWidget(action_label)
+                
+                self.action_combo = QComboBox()
+                self.action_combo.addItems(["点击", "移动", "忽略"])
+                action_map = {"click": 0, "move": 1, "ignore": 2}
+                self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "click"), 0))
+                self.property_form_layout.addWidget(self.action_combo)
+                
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
+            elif block_type == "find_all_images":
+                image_label = QLabel("图像路径:")
+                self.property_form_layout.addWidget(image_label)
+                
+                image_layout = QHBoxLayout()
+                self.image_path_edit = QLineEdit(block_item.properties.get("image_path", ""))
+                image_layout.addWidget(self.image_path_edit)
+                
+                browse_btn = QPushButton("浏览")
+                browse_btn.clicked.connect(lambda: self.browse_image_file(block_item))
+                image_layout.addWidget(browse_btn)
+                
+                screenshot_btn = QPushButton("快速截图")
+                screenshot_btn.clicked.connect(lambda: self.quick_screenshot_for_operand(block_item, "image_path"))
+                image_layout.addWidget(screenshot_btn)
+                
+                self.property_form_layout.addLayout(image_layout)
+                
+                threshold_label = QLabel("匹配阈值:")
+                self.property_form_layout.addWidget(threshold_label)
+                
+                self.threshold_spin = QDoubleSpinBox()
+                self.threshold_spin.setRange(0.1, 1.0)
+                self.threshold_spin.setSingleStep(0.1)
+                self.threshold_spin.setValue(block_item.properties.get("threshold", 0.8))
+                self.property_form_layout.addWidget(self.threshold_spin)
+                
+                # 最大数量
+                max_count_label = QLabel("最多查找数量:")
+                self.property_form_layout.addWidget(max_count_label)
+                
+                self.max_count_spin = QSpinBox()
+                self.max_count_spin.setRange(1, 1000)
+                self.max_count_spin.setValue(block_item.properties.get("max_count", 20))
+                self.property_form_layout.addWidget(self.max_count_spin)
+                
+                # 排序方式
+                sort_label = QLabel("处理顺序:")
+                self.property_form_layout.addWidget(sort_label)
+                
+                self.sort_combo = QComboBox()
+                self.sort_combo.addItems(["匹配度从高到低", "从上到下、从左到右"])
+                sort_map = {"score": 0, "reading": 1}
+                self.sort_combo.setCurrentIndex(sort_map.get(block_item.properties.get("sort", "score"), 0))
+                self.property_form_layout.addWidget(self.sort_combo)
+                
+                # 对每个位置的动作
+                action_label = QLabel("对每个位置的动作:")
+                self.property_form_layout.addWidget(action_label)
+                
+                self.action_combo = QComboBox()
+                self.action_combo.addItems(["点击", "移动", "忽略"])
+                action_map = {"click": 0, "move": 1, "ignore": 2}
+                self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "click"), 0))
+                self.property_form_layout.addWidget(self.action_combo)
+                
+                interval_label = QLabel("每个位置间隔(秒):")
+                self.property_form_layout.addWidget(interval_label)
+                
+                self.interval_spin = QDoubleSpinBox()
+                self.interval_spin.setRange(0.0, 10.0)
+                self.interval_spin.setSingleStep(0.1)
+                self.interval_spin.setValue(block_item.properties.get("interval", 0.2))
+                self.property_form_layout.addWidget(self.interval_spin)
+                
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
             elif block_type == "loop":
                 # 循环类型选择
                 loop_type_label = QLabel("循环类型:")
@@ -2773,6 +3060,8 @@ class BlockEditor(QWidget):
                 self.duration_spin.setValue(block_item.properties.get("duration", 0.5))
                 self.property_form_layout.addWidget(self.duration_spin)
                 
+                self.add_timing_profile_editor(block_item)
+                
                 # 保存按钮
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -2795,6 +3084,19 @@ class BlockEditor(QWidget):
                 self.delay_spin.setValue(block_item.properties.get("delay", 0.1))
                 self.property_form_layout.addWidget(self.delay_spin)
                 
+                # 输入方式
+                strategy_label = QLabel("输入方式:")
+                self.property_form_layout.addWidget(strategy_label)
+                
+                self.type_strategy_combo = QComboBox()
+                self.type_strategy_combo.addItems([name for _, name in self.TYPE_STRATEGY_CHOICES])
+                strategies = [key for key, _ in self.TYPE_STRATEGY_CHOICES]
+                current = block_item.properties.get("type_strategy", "char")
+                self.type_strategy_combo.setCurrentIndex(strategies.index(current) if current in strategies else 0)
+                self.property_form_layout.addWidget(self.type_strategy_combo)
+                
+                self.add_timing_profile_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -2844,6 +3146,8 @@ class BlockEditor(QWidget):
                 self.interval_spin.setValue(block_item.properties.get("interval", 0.0))
                 self.property_form_layout.addWidget(self.interval_spin)
                 
+                self.add_timing_profile_editor(block_item)
+                
                 # 保存按钮
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -2902,6 +3206,8 @@ class BlockEditor(QWidget):
                 self.delay_spin.setValue(block_item.properties.get("delay", 0.2))
                 self.property_form_layout.addWidget(self.delay_spin)
                 
+                self.add_timing_profile_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -2969,6 +3275,8 @@ class BlockEditor(QWidget):
                 self.offset_spin.setValue(block_item.properties.get("random_offset", 5))
                 self.property_form_layout.addWidget(self.offset_spin)
                 
+                self.add_timing_profile_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -3018,6 +3326,9 @@ class BlockEditor(QWidget):
                 self.threshold_spin.setValue(block_item.properties.get("threshold", 0.8))
                 self.property_form_layout.addWidget(self.threshold_spin)
                 
+                # 识别预设
+                self.add_ocr_preset_editor(block_item)
+                
                 #                                                 
                 action_label = QLabel("找到后的动作:")
                 self.property_form_layout.addWidget(action_label)
@@ -3028,6 +3339,9 @@ class BlockEditor(QWidget):
                 self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "click"), 0))
                 self.property_form_layout.addWidget(self.action_combo)
                 
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -3076,6 +3390,132 @@ class BlockEditor(QWidget):
                 self.tolerance_spin.setValue(block_item.properties.get("tolerance", 10))
                 self.property_form_layout.addWidget(self.tolerance_spin)
                 
+                # 查找方式：第一个像素 / 所有色块
+                find_mode_label = QLabel("查找方式:")
+                self.property_form_layout.addWidget(find_mode_label)
+                
+                self.find_mode_combo = QComboBox()
+                self.find_mode_combo.addItems(["第一个匹配位置", "所有色块（逐个处理）"])
+                self.find_mode_combo.setCurrentIndex(1 if block_item.properties.get("find_mode", "first") == "blobs" else 0)
+                self.property_form_layout.addWidget(self.find_mode_combo)
+                
+                area_layout = QHBoxLayout()
+                area_layout.addWidget(QLabel("色块面积:"))
+                self.min_area_spin = QSpinBox()
+                self.min_area_spin.setRange(1, 10000000)
+                self.min_area_spin.setValue(block_item.properties.get("min_area", 4))
+                area_layout.addWidget(self.min_area_spin)
+                area_layout.addWidget(QLabel("至"))
+                self.max_area_spin = QSpinBox()
+                self.max_area_spin.setRange(0, 10000000)
+                self.max_area_spin.setSpecialValueText("不限")
+                self.max_area_spin.setValue(block_item.properties.get("max_area", 0))
+                area_layout.addWidget(self.max_area_spin)
+                self.area_widget = QWidget()
+                self.area_widget.setLayout(area_layout)
+                self.area_widget.setVisible(self.find_mode_combo.currentIndex() == 1)
+                self.find_mode_combo.currentIndexChanged.connect(lambda index: self.area_widget.setVisible(index == 1))
+                self.property_form_layout.addWidget(self.area_widget)
+                
+                # 找到后的动作
+                action_label = QLabel("找到后的动作:")
+                self.property_form_layout.addWidget(action_label)
+                
+                self.action_combo = QComboBox()
+                self.action_combo.addItems(["点击", "移动", "忽略"])
+                action_map = {"click": 0, "move": 1, "ignore": 2}
+                self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "click"), 0))
+                self.property_form_layout.addWidget(self.action_combo)
+                
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
+            elif block_type == "find_colors":
+                # 颜色列表（每项: 颜色 + 找到该颜色时的动作）
+                palette_label = QLabel("颜色列表（靠前的优先）:")
+                self.property_form_layout.addWidget(palette_label)
+                
+                self.palette_list_widget = QListWidget()
+                self.palette_list_widget.setFixedHeight(120)
+                for entry in block_item.properties.get("palette", []):
+                    self.add_palette_item(entry.get("color", "#FF0000"), entry.get("action", "click"))
+                self.property_form_layout.addWidget(self.palette_list_widget)
+                
+                palette_buttons_layout = QHBoxLayout()
+                add_color_btn = QPushButton("选择颜色")
+                add_color_btn.clicked.connect(lambda: self.add_palette_color(block_item, from_screen=False))
+                palette_buttons_layout.addWidget(add_color_btn)
+                
+                screen_color_btn = QPushButton("从屏幕取色")
+                screen_color_btn.clicked.connect(lambda: self.add_palette_color(block_item, from_screen=True))
+                palette_buttons_layout.addWidget(screen_color_btn)
+                
+                remove_color_btn = QPushButton("删除选中")
+                remove_color_btn.clicked.connect(lambda: self.palette_list_widget.takeItem(self.palette_list_widget.currentRow()))
+                palette_buttons_layout.addWidget(remove_color_btn)
+                
+                self.property_form_layout.addLayout(palette_buttons_layout)
+                
+                # 颜色容差
+                tolerance_label = QLabel("颜色容差 (0-255):")
+                self.property_form_layout.addWidget(tolerance_label)
+                
+                self.tolerance_spin = QSpinBox()
+                self.tolerance_spin.setRange(0, 255)
+                self.tolerance_spin.setValue(block_item.properties.get("tolerance", 10))
+                self.property_form_layout.addWidget(self.tolerance_spin)
+                
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
+            elif block_type == "find_color_pattern":
+                # 锚点颜色
+                anchor_label = QLabel("锚点颜色:")
+                self.property_form_layout.addWidget(anchor_label)
+                
+                self.color_edit = QLineEdit(block_item.properties.get("anchor", "#FF0000"))
+                self.color_edit.setPlaceholderText("#FF0000")
+                self.property_form_layout.addWidget(self.color_edit)
+                
+                # 偏移点
+                offsets_label = QLabel("偏移点（每行: dx, dy, #颜色）:")
+                self.property_form_layout.addWidget(offsets_label)
+                
+                self.offsets_edit = QPlainTextEdit()
+                self.offsets_edit.setPlainText(self.format_color_offsets(block_item.properties.get("offsets", [])))
+                self.offsets_edit.setFixedHeight(120)
+                self.property_form_layout.addWidget(self.offsets_edit)
+                
+                capture_pattern_btn = QPushButton("从截图提取")
+                capture_pattern_btn.clicked.connect(lambda: self.capture_color_pattern(block_item))
+                self.property_form_layout.addWidget(capture_pattern_btn)
+                
+                # 颜色容差
+                tolerance_label = QLabel("颜色容差 (0-255):")
+                self.property_form_layout.addWidget(tolerance_label)
+                
+                self.tolerance_spin = QSpinBox()
+                self.tolerance_spin.setRange(0, 255)
+                self.tolerance_spin.setValue(block_item.properties.get("tolerance", 10))
+                self.property_form_layout.addWidget(self.tolerance_spin)
+                
+                # 查找方式
+                find_mode_label = QLabel("查找方式:")
+                self.property_form_layout.addWidget(find_mode_label)
+                
+                self.find_mode_combo = QComboBox()
+                self.find_mode_combo.addItems(["第一个匹配位置", "所有匹配（逐个处理）"])
+                self.find_mode_combo.setCurrentIndex(1 if block_item.properties.get("find_all", False) else 0)
+                self.property_form_layout.addWidget(self.find_mode_combo)
+                
                 # 找到后的动作
                 action_label = QLabel("找到后的动作:")
                 self.property_form_layout.addWidget(action_label)
@@ -3086,6 +3526,9 @@ class BlockEditor(QWidget):
                 self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "click"), 0))
                 self.property_form_layout.addWidget(self.action_combo)
                 
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
                 # 保存按钮
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -3195,6 +3638,131 @@ class BlockEditor(QWidget):
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
                 self.property_form_layout.addWidget(save_btn)
+            elif block_type in ("wait_for_image", "wait_for_color", "wait_for_text"):
+                # 等待目标
+                if block_type == "wait_for_image":
+                    image_label = QLabel("图像路径:")
+                    self.property_form_layout.addWidget(image_label)
+                    
+                    image_layout = QHBoxLayout()
+                    self.image_path_edit = QLineEdit(block_item.properties.get("image_path", ""))
+                    image_layout.addWidget(self.image_path_edit)
+                    
+                    browse_btn = QPushButton("浏览")
+                    browse_btn.clicked.connect(lambda: self.browse_image_file(block_item))
+                    image_layout.addWidget(browse_btn)
+                    
+                    screenshot_btn = QPushButton("快速截图")
+                    screenshot_btn.clicked.connect(lambda: self.quick_screenshot_for_operand(block_item, "image_path"))
+                    image_layout.addWidget(screenshot_btn)
+                    
+                    self.property_form_layout.addLayout(image_layout)
+                elif block_type == "wait_for_color":
+                    color_label = QLabel("目标颜色:")
+                    self.property_form_layout.addWidget(color_label)
+                    
+                    color_layout = QHBoxLayout()
+                    self.color_edit = QLineEdit(block_item.properties.get("color", "#FF0000"))
+                    self.color_edit.setPlaceholderText("#FF0000")
+                    color_layout.addWidget(self.color_edit)
+                    
+                    self.color_picker_btn = QPushButton("选择颜色")
+                    self.color_picker_btn.clicked.connect(lambda: self.pick_color_for_block(block_item))
+                    color_layout.addWidget(self.color_picker_btn)
+                    
+                    self.screen_color_picker_btn = QPushButton("从屏幕取色")
+                    self.screen_color_picker_btn.clicked.connect(lambda: self.pick_color_from_screen(block_item))
+                    color_layout.addWidget(self.screen_color_picker_btn)
+                    
+                    color_widget = QWidget()
+                    color_widget.setLayout(color_layout)
+                    self.property_form_layout.addWidget(color_widget)
+                else:
+                    text_label = QLabel("等待的文字:")
+                    self.property_form_layout.addWidget(text_label)
+                    
+                    self.text_edit = QLineEdit(block_item.properties.get("text", ""))
+                    self.property_form_layout.addWidget(self.text_edit)
+                
+                # 匹配阈值 / 颜色容差
+                if block_type == "wait_for_color":
+                    tolerance_label = QLabel("颜色容差 (0-255):")
+                    self.property_form_layout.addWidget(tolerance_label)
+                    
+                    self.tolerance_spin = QSpinBox()
+                    self.tolerance_spin.setRange(0, 255)
+                    self.tolerance_spin.setValue(block_item.properties.get("tolerance", 10))
+                    self.property_form_layout.addWidget(self.tolerance_spin)
+                else:
+                    threshold_label = QLabel("匹配阈值:")
+                    self.property_form_layout.addWidget(threshold_label)
+                    
+                    self.threshold_spin = QDoubleSpinBox()
+                    self.threshold_spin.setRange(0.1, 1.0)
+                    self.threshold_spin.setSingleStep(0.1)
+                    self.threshold_spin.setValue(block_item.properties.get("threshold", 0.8))
+                    self.property_form_layout.addWidget(self.threshold_spin)
+                
+                if block_type == "wait_for_text":
+                    self.add_ocr_preset_editor(block_item)
+                
+                # 超时时间
+                timeout_label = QLabel("超时时间(秒):")
+                self.property_form_layout.addWidget(timeout_label)
+                
+                self.timeout_spin = QDoubleSpinBox()
+                self.timeout_spin.setRange(0.1, 3600.0)
+                self.timeout_spin.setSingleStep(1.0)
+                self.timeout_spin.setValue(block_item.properties.get("timeout", 10.0))
+                self.property_form_layout.addWidget(self.timeout_spin)
+                
+                # 出现后的动作
+                action_label = QLabel("出现后的动作:")
+                self.property_form_layout.addWidget(action_label)
+                
+                self.action_combo = QComboBox()
+                self.action_combo.addItems(["点击", "移动", "忽略"])
+                action_map = {"click": 0, "move": 1, "ignore": 2}
+                self.action_combo.setCurrentIndex(action_map.get(block_item.properties.get("action", "ignore"), 2))
+                self.property_form_layout.addWidget(self.action_combo)
+                
+                # 超时后的处理
+                on_timeout_label = QLabel("超时后:")
+                self.property_form_layout.addWidget(on_timeout_label)
+                
+                self.on_timeout_combo = QComboBox()
+                self.on_timeout_combo.addItems(["继续执行后续积木", "停止脚本"])
+                on_timeout_map = {"continue": 0, "stop": 1}
+                self.on_timeout_combo.setCurrentIndex(on_timeout_map.get(block_item.properties.get("on_timeout", "continue"), 0))
+                self.property_form_layout.addWidget(self.on_timeout_combo)
+                
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
+            elif block_type == "set_timing_profile":
+                self.add_timing_profile_editor(block_item, include_default=False)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
+            elif block_type == "capture_stream":
+                fps_label = QLabel("目标帧率 (0表示停止):")
+                self.property_form_layout.addWidget(fps_label)
+                
+                self.fps_spin = QSpinBox()
+                self.fps_spin.setRange(0, 120)
+                self.fps_spin.setValue(block_item.properties.get("fps", 30))
+                self.property_form_layout.addWidget(self.fps_spin)
+                
+                # 保存按钮
+                save_btn = QPushButton("保存属性")
+                save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
+                self.property_form_layout.addWidget(save_btn)
             elif block_type == "delay":
                 #                         
                 time_label = QLabel("延迟(秒):")
@@ -3288,6 +3856,9 @@ class BlockEditor(QWidget):
                 self.threshold_spin.setValue(block_item.properties.get("threshold", 0.8))
                 self.property_form_layout.addWidget(self.threshold_spin)
                 
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -3327,6 +3898,9 @@ class BlockEditor(QWidget):
                 self.threshold_spin.setValue(block_item.properties.get("threshold", 0.8))
                 self.property_form_layout.addWidget(self.threshold_spin)
                 
+                # 搜索范围
+                self.add_search_scope_editor(block_item)
+                
                 #                         
                 save_btn = QPushButton("保存属性")
                 save_btn.clicked.connect(lambda: self.save_block_properties(block_item))
@@ -3395,6 +3969,145 @@ class BlockEditor(QWidget):
         else:
             self.clear_property_editor()
     
+    def add_search_scope_editor(self, block_item):
+        """添加搜索范围设置（全屏/仅绑定窗口/指定区域）"""
+        scope_label = QLabel("搜索范围:")
+        self.property_form_layout.addWidget(scope_label)
+        
+        self.search_scope_combo = QComboBox()
+        self.search_scope_combo.addItems(["全屏", "仅绑定窗口", "指定区域"])
+        scope_map = {"full": 0, "window": 1, "region": 2}
+        self.search_scope_combo.setCurrentIndex(scope_map.get(block_item.properties.get("search_scope", "full"), 0))
+        self.property_form_layout.addWidget(self.search_scope_combo)
+        
+        # 指定区域输入（仅"指定区域"时显示）
+        region_layout = QHBoxLayout()
+        region = block_item.properties.get("region") or []
+        self.region_edit = QLineEdit(",".join(str(v) for v in region))
+        self.region_edit.setPlaceholderText("x,y,宽,高")
+        region_layout.addWidget(self.region_edit)
+        
+        select_region_btn = QPushButton("框选区域")
+        select_region_btn.clicked.connect(lambda: self.quick_select_search_region(block_item))
+        region_layout.addWidget(select_region_btn)
+        
+        self.region_widget = QWidget()
+        self.region_widget.setLayout(region_layout)
+        self.region_widget.setVisible(self.search_scope_combo.currentIndex() == 2)
+        self.property_form_layout.addWidget(self.region_widget)
+        
+        self.search_scope_combo.currentIndexChanged.connect(lambda index: self.region_widget.setVisible(index == 2))
+    
+    # OCR预处理预设（与 image_recognition.OCR_PRESETS 对应）
+    OCR_PRESET_CHOICES = [
+        ("gray", "灰度（默认）"),
+        ("raw", "原图"),
+        ("small_text", "小字放大"),
+        ("single_line", "单行文字"),
+        ("digits", "仅数字"),
+    ]
+    
+    def add_ocr_preset_editor(self, block_item):
+        """添加文字识别预处理预设选择"""
+        preset_label = QLabel("识别预设:")
+        self.property_form_layout.addWidget(preset_label)
+        
+        self.ocr_preset_combo = QComboBox()
+        self.ocr_preset_combo.addItems([name for _, name in self.OCR_PRESET_CHOICES])
+        presets = [key for key, _ in self.OCR_PRESET_CHOICES]
+        current = block_item.properties.get("ocr_preset", "gray")
+        self.ocr_preset_combo.setCurrentIndex(presets.index(current) if current in presets else 0)
+        self.property_form_layout.addWidget(self.ocr_preset_combo)
+    
+    def save_ocr_preset(self, block_item):
+        """保存文字识别预处理预设"""
+        block_item.properties["ocr_preset"] = self.OCR_PRESET_CHOICES[self.ocr_preset_combo.currentIndex()][0]
+    
+    # 文本输入方式（与 keyboard_control.TYPE_STRATEGIES 对应）
+    TYPE_STRATEGY_CHOICES = [
+        ("char", "逐字输入"),
+        ("chunked", "分块输入（支持中文）"),
+        ("paste", "剪贴板粘贴（最快）"),
+        ("auto", "自动选择"),
+    ]
+    
+    # 操作节奏选项：(属性值, 显示名称)，空字符串表示沿用脚本的节奏
+    TIMING_PROFILE_CHOICES = [
+        ("", "跟随脚本"),
+        ("turbo", "极速（无停顿）"),
+        ("normal", "标准（每次操作后0.1秒）"),
+        ("human", "拟人（随机停顿）"),
+    ]
+    
+    def add_timing_profile_editor(self, block_item, include_default=True):
+        """
+        添加操作节奏选择
+        
+        Args:
+            block_item: 积木
+            include_default: 是否提供"跟随脚本"选项（设置脚本节奏的积木不需要）
+        """
+        profile_label = QLabel("操作节奏:")
+        self.property_form_layout.addWidget(profile_label)
+        
+        choices = self.TIMING_PROFILE_CHOICES if include_default else self.TIMING_PROFILE_CHOICES[1:]
+        self.timing_profile_choices = [key for key, _ in choices]
+        self.timing_profile_combo = QComboBox()
+        self.timing_profile_combo.addItems([name for _, name in choices])
+        current = block_item.properties.get("timing_profile", self.timing_profile_choices[0])
+        if current in self.timing_profile_choices:
+            self.timing_profile_combo.setCurrentIndex(self.timing_profile_choices.index(current))
+        self.property_form_layout.addWidget(self.timing_profile_combo)
+    
+    def save_timing_profile(self, block_item):
+        """保存操作节奏"""
+        block_item.properties["timing_profile"] = self.timing_profile_choices[self.timing_profile_combo.currentIndex()]
+    
+    def save_search_scope(self, block_item):
+        """保存搜索范围设置"""
+        scope_map = {0: "full", 1: "window", 2: "region"}
+        block_item.properties["search_scope"] = scope_map[self.search_scope_combo.currentIndex()]
+        
+        region = []
+        try:
+            parts = [int(p.strip()) for p in self.region_edit.text().split(',') if p.strip()]
+            if len(parts) == 4 and parts[2] > 0 and parts[3] > 0:
+                region = parts
+        except ValueError:
+            logger.warning(f"无效的搜索区域: {self.region_edit.text()}")
+        block_item.properties["region"] = region
+        
+        if block_item.properties["search_scope"] == "region" and not region:
+            logger.warning("未设置有效的搜索区域，将使用全屏搜索")
+    
+    def quick_select_search_region(self, block_item):
+        """框选屏幕区域作为搜索范围"""
+        try:
+            # 暂时隐藏主窗口
+            self.parent.hide()
+            
+            def on_region_selected(pixmap):
+                self.parent.show()
+                tool = getattr(self, 'current_screenshot_tool', None)
+                if pixmap is None or tool is None:
+                    logger.info("框选区域已取消")
+                    return
+                
+                rect = tool.screenshot_rect
+                region = [rect.x(), rect.y(), rect.width(), rect.height()]
+                self.region_edit.setText(",".join(str(v) for v in region))
+                self.search_scope_combo.setCurrentIndex(2)
+                block_item.properties["search_scope"] = "region"
+                block_item.properties["region"] = region
+                self.update_script()
+                logger.info(f"搜索区域已设置: {region}")
+            
+            self.current_screenshot_tool = self.parent.screenshot_manager.capture_region(callback=on_region_selected)
+        except Exception as e:
+            logger.error(f"框选区域出错: {e}")
+            QMessageBox.critical(self, "错误", f"框选区域出错: {e}")
+            self.parent.show()
+    
     def update_loop_property_editor(self, block_item):
         """根据循环类型更新属性编辑器的显示"""
         if not hasattr(self, 'loop_type_combo'):
@@ -3599,6 +4312,19 @@ class BlockEditor(QWidget):
             self.update_script()
             logger.info(f"                                          : {file_path}")
     
+    def browse_image_list_files(self, block_item):
+        """浏览选择多个图像文件加入候选列表"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "选择图像文件",
+            "",
+            "图像文件 (*.png *.jpg *.jpeg *.bmp)"
+        )
+        for file_path in file_paths:
+            self.image_list_widget.addItem(file_path)
+        if file_paths:
+            logger.info(f"添加 {len(file_paths)} 个候选图像")
+    
     def quick_select_click_position(self, block_item):
         """快速选择点击位置"""
         from PyQt5.QtCore import Qt, QTimer
@@ -3885,9 +4611,30 @@ class BlockEditor(QWidget):
         elif block_type == "find_image":
             block_item.properties["image_path"] = self.image_path_edit.text()
             block_item.properties["threshold"] = self.threshold_spin.value()
+            match_mode_map = {0: "normal", 1: "pyramid"}
+            block_item.properties["match_mode"] = match_mode_map[self.match_mode_combo.currentIndex()]
             
             action_map = {0: "click", 1: "move", 2: "ignore"}
             block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            self.save_search_scope(block_item)
+        elif block_type == "find_any_image":
+            block_item.properties["image_paths"] = [
+                self.image_list_widget.item(i).text() for i in range(self.image_list_widget.count())
+            ]
+            block_item.properties["threshold"] = self.threshold_spin.value()
+            action_map = {0: "click", 1: "move", 2: "ignore"}
+            block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            self.save_search_scope(block_item)
+        elif block_type == "find_all_images":
+            block_item.properties["image_path"] = self.image_path_edit.text()
+            block_item.properties["threshold"] = self.threshold_spin.value()
+            block_item.properties["max_count"] = self.max_count_spin.value()
+            sort_map = {0: "score", 1: "reading"}
+            block_item.properties["sort"] = sort_map[self.sort_combo.currentIndex()]
+            action_map = {0: "click", 1: "move", 2: "ignore"}
+            block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            block_item.properties["interval"] = self.interval_spin.value()
+            self.save_search_scope(block_item)
         elif block_type == "loop":
             # 保存循环类型
             loop_type_map = {0: "count", 1: "forever", 2: "until"}
@@ -3919,9 +4666,12 @@ class BlockEditor(QWidget):
             block_item.properties["x"] = self.x_spin.value()
             block_item.properties["y"] = self.y_spin.value()
             block_item.properties["duration"] = self.duration_spin.value()
+            self.save_timing_profile(block_item)
         elif block_type == "keyboard_input":
             block_item.properties["text"] = self.text_edit.text()
             block_item.properties["delay"] = self.delay_spin.value()
+            block_item.properties["type_strategy"] = self.TYPE_STRATEGY_CHOICES[self.type_strategy_combo.currentIndex()][0]
+            self.save_timing_profile(block_item)
         elif block_type == "keyboard_key":
             # 键盘按键积木属性保存
             key_map = {
@@ -3934,6 +4684,7 @@ class BlockEditor(QWidget):
             block_item.properties["key"] = key_map[self.key_combo.currentIndex()]
             block_item.properties["presses"] = self.presses_spin.value()
             block_item.properties["interval"] = self.interval_spin.value()
+            self.save_timing_profile(block_item)
         elif block_type == "mouse_click":
             button_map = {0: "left", 1: "right", 2: "middle"}
             block_item.properties["button"] = button_map[self.button_combo.currentIndex()]
@@ -3941,6 +4692,7 @@ class BlockEditor(QWidget):
             block_item.properties["delay"] = self.delay_spin.value()
             block_item.properties["x"] = self.click_x_spin.value()
             block_item.properties["y"] = self.click_y_spin.value()
+            self.save_timing_profile(block_item)
         elif block_type == "mouse_drag":
             block_item.properties["start_x"] = self.start_x_spin.value()
             block_item.properties["start_y"] = self.start_y_spin.value()
@@ -3948,20 +4700,42 @@ class BlockEditor(QWidget):
             block_item.properties["end_y"] = self.end_y_spin.value()
             block_item.properties["duration"] = self.duration_spin.value()
             block_item.properties["random_offset"] = self.offset_spin.value()
+            self.save_timing_profile(block_item)
         elif block_type == "find_text":
             block_item.properties["text"] = self.text_edit.text()
             block_item.properties["font"] = self.font_combo.currentText()
             block_item.properties["size"] = self.size_spin.value()
             block_item.properties["color"] = self.color_edit.text()
             block_item.properties["threshold"] = self.threshold_spin.value()
+            self.save_ocr_preset(block_item)
             
             action_map = {0: "click", 1: "move", 2: "ignore"}
             block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            self.save_search_scope(block_item)
         elif block_type == "find_color":
             block_item.properties["color"] = self.color_edit.text()
             block_item.properties["tolerance"] = self.tolerance_spin.value()
+            block_item.properties["find_mode"] = "blobs" if self.find_mode_combo.currentIndex() == 1 else "first"
+            block_item.properties["min_area"] = self.min_area_spin.value()
+            block_item.properties["max_area"] = self.max_area_spin.value()
+            action_map = {0: "click", 1: "move", 2: "ignore"}
+            block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            self.save_search_scope(block_item)
+        elif block_type == "find_color_pattern":
+            block_item.properties["anchor"] = self.color_edit.text().strip()
+            block_item.properties["offsets"] = self.parse_color_offsets(self.offsets_edit.toPlainText())
+            block_item.properties["tolerance"] = self.tolerance_spin.value()
+            block_item.properties["find_all"] = self.find_mode_combo.currentIndex() == 1
             action_map = {0: "click", 1: "move", 2: "ignore"}
             block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            self.save_search_scope(block_item)
+        elif block_type == "find_colors":
+            palette = []
+            for i in range(self.palette_list_widget.count()):
+                palette.append(self.palette_list_widget.item(i).data(Qt.UserRole))
+            block_item.properties["palette"] = palette
+            block_item.properties["tolerance"] = self.tolerance_spin.value()
+            self.save_search_scope(block_item)
         elif block_type == "if":
             # 保存if类型
             if_type_map = {0: "simple", 1: "compound"}
@@ -4003,6 +4777,29 @@ class BlockEditor(QWidget):
             block_item.properties["parameters"] = [p.strip() for p in params_text.split(',') if p.strip()]
         elif block_type == "wait":
             block_item.properties["time"] = self.time_spin.value()
+        elif block_type == "capture_stream":
+            block_item.properties["fps"] = self.fps_spin.value()
+        elif block_type == "set_timing_profile":
+            self.save_timing_profile(block_item)
+        elif block_type in ("wait_for_image", "wait_for_color", "wait_for_text"):
+            if block_type == "wait_for_image":
+                block_item.properties["image_path"] = self.image_path_edit.text()
+            elif block_type == "wait_for_color":
+                block_item.properties["color"] = self.color_edit.text()
+            else:
+                block_item.properties["text"] = self.text_edit.text()
+            if block_type == "wait_for_color":
+                block_item.properties["tolerance"] = self.tolerance_spin.value()
+            else:
+                block_item.properties["threshold"] = self.threshold_spin.value()
+            if block_type == "wait_for_text":
+                self.save_ocr_preset(block_item)
+            block_item.properties["timeout"] = self.timeout_spin.value()
+            action_map = {0: "click", 1: "move", 2: "ignore"}
+            block_item.properties["action"] = action_map[self.action_combo.currentIndex()]
+            on_timeout_map = {0: "continue", 1: "stop"}
+            block_item.properties["on_timeout"] = on_timeout_map[self.on_timeout_combo.currentIndex()]
+            self.save_search_scope(block_item)
         elif block_type == "delay":
             block_item.properties["time"] = self.time_spin.value()
 
@@ -4013,11 +4810,14 @@ class BlockEditor(QWidget):
         elif block_type == "and":
             block_item.properties["operand1"] = self.operand1_edit.text()
             block_item.properties["operand2"] = self.operand2_edit.text()
+            self.save_search_scope(block_item)
         elif block_type == "or":
             block_item.properties["operand1"] = self.operand1_edit.text()
             block_item.properties["operand2"] = self.operand2_edit.text()
+            self.save_search_scope(block_item)
         elif block_type == "not":
             block_item.properties["operand"] = self.operand_edit.text()
+            self.save_search_scope(block_item)
         elif block_type == "run_script":
             block_item.properties["script_path"] = self.script_path_edit.text()
             block_item.properties["speed"] = self.speed_spin.value()
@@ -4139,6 +4939,26 @@ class BlockEditor(QWidget):
             properties["parameters"] = []
         elif block_type == "wait":
             properties["time"] = 1.0
+        elif block_type in ("wait_for_image", "wait_for_color", "wait_for_text"):
+            if block_type == "wait_for_image":
+                properties["image_path"] = ""
+                properties["threshold"] = 0.8
+            elif block_type == "wait_for_color":
+                properties["color"] = "#FF0000"
+                properties["tolerance"] = 10
+            else:
+                properties["text"] = ""
+                properties["threshold"] = 0.8
+                properties["ocr_preset"] = "gray"
+            properties["timeout"] = 10.0
+            properties["action"] = "ignore"
+            properties["on_timeout"] = "continue"  # continue, stop
+            properties["search_scope"] = "full"
+            properties["region"] = []
+        elif block_type == "capture_stream":
+            properties["fps"] = 30
+        elif block_type == "set_timing_profile":
+            properties["timing_profile"] = "normal"  # turbo, normal, human
         elif block_type == "delay":
             properties["time"] = 0.5
 
@@ -4163,6 +4983,7 @@ class BlockEditor(QWidget):
         elif block_type == "keyboard_input":
             properties["text"] = "Hello World"
             properties["delay"] = 0.1
+            properties["type_strategy"] = "auto"
         elif block_type == "keyboard_key":
             properties["key"] = "enter"
             properties["presses"] = 1
@@ -4171,17 +4992,56 @@ class BlockEditor(QWidget):
             properties["image_path"] = ""
             properties["threshold"] = 0.8
             properties["action"] = "click"
+            properties["match_mode"] = "normal"  # normal, pyramid
+            properties["search_scope"] = "full"  # full, window, region
+            properties["region"] = []
+        elif block_type == "find_any_image":
+            properties["image_paths"] = []
+            properties["threshold"] = 0.8
+            properties["action"] = "click"
+            properties["search_scope"] = "full"
+            properties["region"] = []
+        elif block_type == "find_all_images":
+            properties["image_path"] = ""
+            properties["threshold"] = 0.8
+            properties["max_count"] = 20
+            properties["sort"] = "score"  # score, reading
+            properties["action"] = "click"
+            properties["interval"] = 0.2
+            properties["search_scope"] = "full"
+            properties["region"] = []
         elif block_type == "find_text":
             properties["text"] = "                        "
             properties["font"] = "Arial"
+            properties["ocr_preset"] = "gray"  # gray, raw, small_text, single_line, digits
+            properties["search_scope"] = "full"
+            properties["region"] = []
         elif block_type == "find_color":
             properties["color"] = "#FF0000"
             properties["tolerance"] = 10
+            properties["find_mode"] = "first"  # first, blobs
+            properties["min_area"] = 4
+            properties["max_area"] = 0  # 0表示不限
             properties["action"] = "click"
+            properties["search_scope"] = "full"
+            properties["region"] = []
             properties["size"] = 14
             properties["color"] = "#000000"
             properties["threshold"] = 0.8
             properties["action"] = "click"
+        elif block_type == "find_color_pattern":
+            properties["anchor"] = "#FF0000"
+            properties["offsets"] = []  # [{"dx": 10, "dy": 0, "color": "#FFFFFF"}, ...]
+            properties["tolerance"] = 10
+            properties["find_all"] = False
+            properties["action"] = "click"
+            properties["search_scope"] = "full"
+            properties["region"] = []
+        elif block_type == "find_colors":
+            properties["palette"] = []  # [{"color": "#FF0000", "action": "click"}, ...]
+            properties["tolerance"] = 10
+            properties["search_scope"] = "full"
+            properties["region"] = []
         elif block_type == "jump":
             properties["target_block"] = ""
             properties["jump_type"] = "absolute"
@@ -4785,6 +5645,7 @@ class BlockEditor(QWidget):
         code.append("from modules.image_recognition import ImageRecognition")
         code.append("from modules.mouse_control import MouseControl")
         code.append("from modules.keyboard_control import KeyboardControl")
+        code.append("from modules.input_batch import InputBatch")
         code.append("")
         code.append("image_recognizer = ImageRecognition()")
         code.append("mouse_controller = MouseControl()")
@@ -4828,7 +5689,7 @@ class BlockEditor(QWidget):
         
         code.append("")
         
-        for block in self.current_script:
+        for block in self.group_input_batches(self.current_script):
             if block['type'] == "loop":
                 loop_type = block['properties'].get('loop_type', 'count')
                 delay = block['properties'].get('delay', 0.5)
@@ -4846,7 +5707,7 @@ class BlockEditor(QWidget):
                     
                     # 执行子积木
                     if child_blocks:
-                        for child_block in child_blocks:
+                        for child_block in self.group_input_batches(child_blocks):
                             child_code = self.generate_single_block_code(child_block, indent="    ")
                             code.extend(child_code)
                     else:
@@ -4863,7 +5724,7 @@ class BlockEditor(QWidget):
                     
                     # 执行子积木
                     if child_blocks:
-                        for child_block in child_blocks:
+                        for child_block in self.group_input_batches(child_blocks):
                             child_code = self.generate_single_block_code(child_block, indent="    ")
                             code.extend(child_code)
                     else:
@@ -4875,6 +5736,7 @@ class BlockEditor(QWidget):
                     condition = block['properties'].get('condition', 'image_found')
                     threshold = block['properties'].get('threshold', 0.8)
                     condition_value = block['properties'].get('condition_value', '')
+                    region_arg = self.get_region_argument(block['properties'])
                     
                     code.append(f"loop_i = 0")
                     code.append(f"condition_met = False")
@@ -4885,7 +5747,7 @@ class BlockEditor(QWidget):
                     
                     # 执行子积木
                     if child_blocks:
-                        for child_block in child_blocks:
+                        for child_block in self.group_input_batches(child_blocks):
                             child_code = self.generate_single_block_code(child_block, indent="    ")
                             code.extend(child_code)
                     else:
@@ -4897,7 +5759,7 @@ class BlockEditor(QWidget):
                     if condition == 'image_found':
                         code.append(f"    # 检查图像是否出现")
                         if condition_value:
-                            code.append(f"    position = image_recognizer.find_image({json.dumps(condition_value)}, {threshold})")
+                            code.append(f"    position = image_recognizer.find_image({json.dumps(condition_value)}, {threshold}{region_arg}, change_detection=True)")
                             code.append(f"    if position:")
                             code.append(f"        print('找到目标图像，循环结束')")
                             code.append(f"        condition_met = True")
@@ -4907,7 +5769,7 @@ class BlockEditor(QWidget):
                     elif condition == 'text_found':
                         code.append(f"    # 检查文字是否出现")
                         if condition_value:
-                            code.append(f"    position = image_recognizer.find_text({json.dumps(condition_value)}, {threshold})")
+                            code.append(f"    position = image_recognizer.find_text({json.dumps(condition_value)}, threshold={threshold}{region_arg}, change_detection=True)")
                             code.append(f"    if position:")
                             code.append(f"        print('找到目标文字，循环结束')")
                             code.append(f"        condition_met = True")
@@ -4924,6 +5786,9 @@ class BlockEditor(QWidget):
                     code.append(f"    if loop_i > 1000:")
                     code.append(f"        print('循环次数超过1000次，自动停止')")
                     code.append(f"        break")
+                    if condition in ('image_found', 'text_found') and condition_value:
+                        code.append(f"change_stats = image_recognizer.get_change_detection_stats()")
+                        code.append(f"print(f\"画面未变化跳过匹配 {{change_stats['skipped']}} 次，实际匹配 {{change_stats['executed']}} 次\")")
                         
                 code.append("")
                 
@@ -4939,7 +5804,7 @@ class BlockEditor(QWidget):
                 duration = block['properties'].get('duration', 0.5)
                 random_offset = block['properties'].get('random_offset', 5)
                 code.append(f"# {block['name']}")
-                code.append(f"mouse_controller.move_to({x}, {y}, {duration})")
+                code.append(f"mouse_controller.move_to({x}, {y}, {duration}{self.get_timing_profile_argument(block['properties'])})")
                 code.append("")
                 
             elif block['type'] == "mouse_click":
@@ -4950,16 +5815,16 @@ class BlockEditor(QWidget):
                 y = block['properties'].get('y', None)
                 code.append(f"# {block['name']}")
                 if x is not None and y is not None:
-                    code.append(f"mouse_controller.click({x}, {y}, {json.dumps(button)}, {click_count}, {delay})")
+                    code.append(f"mouse_controller.click({x}, {y}, {json.dumps(button)}, {click_count}, {delay}{self.get_timing_profile_argument(block['properties'])})")
                 else:
-                    code.append(f"mouse_controller.click(None, None, {json.dumps(button)}, {click_count}, {delay})")
+                    code.append(f"mouse_controller.click(None, None, {json.dumps(button)}, {click_count}, {delay}{self.get_timing_profile_argument(block['properties'])})")
                 code.append("")
                 
             elif block['type'] == "keyboard_input":
                 text = block['properties'].get('text', 'Hello World')
                 delay = block['properties'].get('delay', 0.1)
                 code.append(f"# {block['name']}")
-                code.append(f"keyboard_controller.type_text({json.dumps(text)}, {delay})")
+                code.append(f"keyboard_controller.type_text({json.dumps(text)}, {delay}{self.get_timing_profile_argument(block['properties'])}{self.get_type_strategy_argument(block['properties'])})")
                 code.append("")
                 
             elif block['type'] == "keyboard_key":
@@ -4967,16 +5832,18 @@ class BlockEditor(QWidget):
                 presses = block['properties'].get('presses', 1)
                 interval = block['properties'].get('interval', 0.0)
                 code.append(f"# {block['name']}")
-                code.append(f"keyboard_controller.press_key('{key}', {presses}, {interval})")
+                code.append(f"keyboard_controller.press_key('{key}', {presses}, {interval}{self.get_timing_profile_argument(block['properties'])})")
                 code.append("")
                 
             elif block['type'] == "find_image":
                 image_path = block['properties'].get('image_path', '')
                 threshold = block['properties'].get('threshold', 0.8)
                 action = block['properties'].get('action', 'click')
+                region_arg = self.get_region_argument(block['properties'])
+                match_mode_arg = self.get_match_mode_argument(block['properties'])
                 code.append(f"# {block['name']}")
                 if image_path:
-                    code.append(f"position = image_recognizer.find_image({json.dumps(image_path)}, {threshold})")
+                    code.append(f"position = image_recognizer.find_image({json.dumps(image_path)}, {threshold}{region_arg}{match_mode_arg})")
                     code.append(f"if position:")
                     if action == 'click':
                         code.append(f"    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -4989,8 +5856,9 @@ class BlockEditor(QWidget):
                 text = block['properties'].get('text', '查找的文字')
                 threshold = block['properties'].get('threshold', 0.8)
                 action = block['properties'].get('action', 'click')
+                region_arg = self.get_region_argument(block['properties'])
                 code.append(f"# {block['name']}")
-                code.append(f"position = image_recognizer.find_text({json.dumps(text)}, {threshold})")
+                code.append(f"position = image_recognizer.find_text({json.dumps(text)}, threshold={threshold}{region_arg}{self.get_ocr_preset_argument(block['properties'])})")
                 code.append(f"if position:")
                 if action == 'click':
                     code.append(f"    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -4999,12 +5867,17 @@ class BlockEditor(QWidget):
                 code.append(f"    print('未找到指定文字')")
                 code.append("")
                 
+            elif block['type'] == "find_color" and block['properties'].get('find_mode') == "blobs":
+                code.extend(self.generate_single_block_code(block))
+                code.append("")
+                
             elif block['type'] == "find_color":
                 color = block['properties'].get('color', '#FF0000')
                 tolerance = block['properties'].get('tolerance', 10)
                 action = block['properties'].get('action', 'click')
+                region_arg = self.get_region_argument(block['properties'])
                 code.append(f"# {block['name']}")
-                code.append(f"position = image_recognizer.find_color({json.dumps(color)}, {tolerance})")
+                code.append(f"position = image_recognizer.find_color({json.dumps(color)}, {tolerance}{region_arg})")
                 code.append(f"if position:")
                 if action == 'click':
                     code.append(f"    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -5021,9 +5894,11 @@ class BlockEditor(QWidget):
                 image_path = block['properties'].get('image_path', '')
                 threshold = block['properties'].get('threshold', 0.8)
                 action = block['properties'].get('action', 'click')
+                region_arg = self.get_region_argument(block['properties'])
+                match_mode_arg = self.get_match_mode_argument(block['properties'])
                 code.append(f"# {block['name']}")
                 if image_path:
-                    code.append(f"position = image_recognizer.find_image({json.dumps(image_path)}, {threshold})")
+                    code.append(f"position = image_recognizer.find_image({json.dumps(image_path)}, {threshold}{region_arg}{match_mode_arg})")
                     code.append(f"if position:")
                     if action == 'click':
                         code.append(f"    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -5038,6 +5913,12 @@ class BlockEditor(QWidget):
                     code.append(f"print('未指定匹配图像')")
                 code.append("")
                 
+            elif block['type'] in ("find_any_image", "find_all_images", "find_colors", "find_color_pattern",
+                                   "wait_for_image", "wait_for_color", "wait_for_text", "capture_stream",
+                                   "set_timing_profile", "input_batch"):
+                code.extend(self.generate_single_block_code(block))
+                code.append("")
+                
             elif block['type'] == "mouse_drag":
                 start_x = block['properties'].get('start_x', 100)
                 start_y = block['properties'].get('start_y', 100)
@@ -5053,9 +5934,9 @@ class BlockEditor(QWidget):
                     code.append(f"offset_y1 = random.randint(-{random_offset}, {random_offset})")
                     code.append(f"offset_x2 = random.randint(-{random_offset}, {random_offset})")
                     code.append(f"offset_y2 = random.randint(-{random_offset}, {random_offset})")
-                    code.append(f"mouse_controller.drag_to({start_x} + offset_x1, {start_y} + offset_y1, {end_x} + offset_x2, {end_y} + offset_y2, {duration})")
+                    code.append(f"mouse_controller.drag_to({start_x} + offset_x1, {start_y} + offset_y1, {end_x} + offset_x2, {end_y} + offset_y2, {duration}{self.get_timing_profile_argument(block['properties'])})")
                 else:
-                    code.append(f"mouse_controller.drag_to({start_x}, {start_y}, {end_x}, {end_y}, {duration})")
+                    code.append(f"mouse_controller.drag_to({start_x}, {start_y}, {end_x}, {end_y}, {duration}{self.get_timing_profile_argument(block['properties'])})")
                 code.append("")
                 
             elif block['type'] == "if":
@@ -5097,6 +5978,7 @@ class BlockEditor(QWidget):
                 operand2 = block['properties'].get('operand2', '')
                 condition_type = block['properties'].get('condition_type', 'image')
                 threshold = block['properties'].get('threshold', 0.8)
+                region_arg = self.get_region_argument(block['properties'])
                 code.append(f"# {block['name']}")
                 code.append(f"#                             ?             1                ?")
                 code.append(f"#                         : {condition_type}")
@@ -5104,26 +5986,26 @@ class BlockEditor(QWidget):
                 if condition_type == "image":
                     code.append(f"#                       ? -                         ")
                     if operand1:
-                        code.append(f"condition1 = image_recognizer.find_image({json.dumps(operand1)}, {threshold}) is not None")
+                        code.append(f"condition1 = image_recognizer.find_image({json.dumps(operand1)}, {threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition1 = False")
                 else:
                     code.append(f"#                       ? -                         ")
                     if operand1:
-                        code.append(f"condition1 = image_recognizer.find_text({json.dumps(operand1)}, {threshold}) is not None")
+                        code.append(f"condition1 = image_recognizer.find_text({json.dumps(operand1)}, threshold={threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition1 = False")
                 
                 if condition_type == "image":
                     code.append(f"#                       ? -                         ")
                     if operand2:
-                        code.append(f"condition2 = image_recognizer.find_image({json.dumps(operand2)}, {threshold}) is not None")
+                        code.append(f"condition2 = image_recognizer.find_image({json.dumps(operand2)}, {threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition2 = False")
                 else:
                     code.append(f"#                       ? -                         ")
                     if operand2:
-                        code.append(f"condition2 = image_recognizer.find_text({json.dumps(operand2)}, {threshold}) is not None")
+                        code.append(f"condition2 = image_recognizer.find_text({json.dumps(operand2)}, threshold={threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition2 = False")
                 
@@ -5136,6 +6018,7 @@ class BlockEditor(QWidget):
                 operand2 = block['properties'].get('operand2', '')
                 condition_type = block['properties'].get('condition_type', 'image')
                 threshold = block['properties'].get('threshold', 0.8)
+                region_arg = self.get_region_argument(block['properties'])
                 code.append(f"# {block['name']}")
                 code.append(f"#                             ?             1                ?")
                 code.append(f"#                         : {condition_type}")
@@ -5143,26 +6026,26 @@ class BlockEditor(QWidget):
                 if condition_type == "image":
                     code.append(f"#                       ? -                         ")
                     if operand1:
-                        code.append(f"condition1 = image_recognizer.find_image({json.dumps(operand1)}, {threshold}) is not None")
+                        code.append(f"condition1 = image_recognizer.find_image({json.dumps(operand1)}, {threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition1 = False")
                 else:
                     code.append(f"#                       ? -                         ")
                     if operand1:
-                        code.append(f"condition1 = image_recognizer.find_text({json.dumps(operand1)}, {threshold}) is not None")
+                        code.append(f"condition1 = image_recognizer.find_text({json.dumps(operand1)}, threshold={threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition1 = False")
                 
                 if condition_type == "image":
                     code.append(f"#                       ? -                         ")
                     if operand2:
-                        code.append(f"condition2 = image_recognizer.find_image({json.dumps(operand2)}, {threshold}) is not None")
+                        code.append(f"condition2 = image_recognizer.find_image({json.dumps(operand2)}, {threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition2 = False")
                 else:
                     code.append(f"#                       ? -                         ")
                     if operand2:
-                        code.append(f"condition2 = image_recognizer.find_text({json.dumps(operand2)}, {threshold}) is not None")
+                        code.append(f"condition2 = image_recognizer.find_text({json.dumps(operand2)}, threshold={threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition2 = False")
                 
@@ -5174,6 +6057,7 @@ class BlockEditor(QWidget):
                 operand = block['properties'].get('operand', '')
                 condition_type = block['properties'].get('condition_type', 'image')
                 threshold = block['properties'].get('threshold', 0.8)
+                region_arg = self.get_region_argument(block['properties'])
                 code.append(f"# {block['name']}")
                 code.append(f"#                             ?")
                 code.append(f"#                         : {condition_type}")
@@ -5181,13 +6065,13 @@ class BlockEditor(QWidget):
                 if condition_type == "image":
                     code.append(f"#                       ?-                         ")
                     if operand:
-                        code.append(f"condition = image_recognizer.find_image({json.dumps(operand)}, {threshold}) is not None")
+                        code.append(f"condition = image_recognizer.find_image({json.dumps(operand)}, {threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition = False")
                 else:
                     code.append(f"#                       ?-                         ")
                     if operand:
-                        code.append(f"condition = image_recognizer.find_text({json.dumps(operand)}, {threshold}) is not None")
+                        code.append(f"condition = image_recognizer.find_text({json.dumps(operand)}, threshold={threshold}{region_arg}) is not None")
                     else:
                         code.append(f"condition = False")
                 
@@ -5214,6 +6098,73 @@ class BlockEditor(QWidget):
         
         return '\n'.join(code_lines)
     
+    def get_region_argument(self, properties):
+        """根据积木的搜索范围属性生成识别调用的 region 参数"""
+        scope = properties.get("search_scope", "full")
+        if scope == "window":
+            return ", region='window'"
+        if scope == "region":
+            region = properties.get("region") or []
+            if len(region) == 4:
+                return f", region={tuple(int(v) for v in region)}"
+        return ""
+    
+    def get_ocr_preset_argument(self, properties):
+        """根据积木的识别预设属性生成 find_text 的 preset 参数"""
+        preset = properties.get("ocr_preset", "gray")
+        if preset and preset != "gray":
+            return f", preset={preset!r}"
+        return ""
+    
+    def get_timing_profile_argument(self, properties):
+        """根据积木的操作节奏属性生成鼠标键盘调用的 profile 参数"""
+        profile = properties.get("timing_profile", "")
+        if profile:
+            return f", profile={profile!r}"
+        return ""
+    
+    def group_input_batches(self, blocks):
+        """把相邻的鼠标点击、键盘输入、键盘按键积木合并为一个批量输入积木"""
+        from blocks.input_grouping import group_input_batches
+        return group_input_batches(blocks)
+    
+    def generate_input_batch_step(self, block, indent=""):
+        """生成批量输入序列中一个输入积木的代码"""
+        import json
+        properties = block['properties']
+        profile_arg = self.get_timing_profile_argument(properties)
+        if block['type'] == "mouse_click":
+            button = properties.get('button', 'left')
+            click_count = properties.get('click_count', 1)
+            delay = properties.get('delay', 0.2)
+            x = properties.get('x', None)
+            y = properties.get('y', None)
+            if x is None or y is None:
+                x, y = None, None
+            return f"{indent}input_batch.click({x}, {y}, {json.dumps(button)}, {click_count}, {delay}{profile_arg})  # {block['name']}"
+        if block['type'] == "keyboard_input":
+            text = properties.get('text', 'Hello World')
+            delay = properties.get('delay', 0.1)
+            return (f"{indent}input_batch.type({json.dumps(text)}, {delay}{profile_arg}"
+                    f"{self.get_type_strategy_argument(properties)})  # {block['name']}")
+        key = properties.get('key', 'enter')
+        presses = properties.get('presses', 1)
+        interval = properties.get('interval', 0.0)
+        return f"{indent}input_batch.press('{key}', {presses}, {interval}{profile_arg})  # {block['name']}"
+    
+    def get_type_strategy_argument(self, properties):
+        """根据积木的输入方式属性生成 type_text 的 strategy 参数"""
+        strategy = properties.get("type_strategy", "char")
+        if strategy and strategy != "char":
+            return f", strategy={strategy!r}"
+        return ""
+    
+    def get_match_mode_argument(self, properties):
+        """根据积木的匹配模式属性生成 find_image 的 match_mode 参数"""
+        if properties.get("match_mode", "normal") == "pyramid":
+            return ", match_mode='pyramid'"
+        return ""
+    
     def generate_single_block_code(self, block, indent=""):
         """生成单个积木的代码"""
         import json
@@ -5224,7 +6175,7 @@ class BlockEditor(QWidget):
             y = block['properties'].get('y', 100)
             duration = block['properties'].get('duration', 0.5)
             code.append(f"{indent}# {block['name']}")
-            code.append(f"{indent}mouse_controller.move_to({x}, {y}, {duration})")
+            code.append(f"{indent}mouse_controller.move_to({x}, {y}, {duration}{self.get_timing_profile_argument(block['properties'])})")
             
         elif block['type'] == "mouse_click":
             button = block['properties'].get('button', 'left')
@@ -5234,30 +6185,40 @@ class BlockEditor(QWidget):
             y = block['properties'].get('y', None)
             code.append(f"{indent}# {block['name']}")
             if x is not None and y is not None:
-                code.append(f"{indent}mouse_controller.click({x}, {y}, {json.dumps(button)}, {click_count}, {delay})")
+                code.append(f"{indent}mouse_controller.click({x}, {y}, {json.dumps(button)}, {click_count}, {delay}{self.get_timing_profile_argument(block['properties'])})")
             else:
-                code.append(f"{indent}mouse_controller.click(None, None, {json.dumps(button)}, {click_count}, {delay})")
+                code.append(f"{indent}mouse_controller.click(None, None, {json.dumps(button)}, {click_count}, {delay}{self.get_timing_profile_argument(block['properties'])})")
                 
         elif block['type'] == "keyboard_input":
             text = block['properties'].get('text', 'Hello World')
             delay = block['properties'].get('delay', 0.1)
             code.append(f"{indent}# {block['name']}")
-            code.append(f"{indent}keyboard_controller.type_text({json.dumps(text)}, {delay})")
+            code.append(f"{indent}keyboard_controller.type_text({json.dumps(text)}, {delay}{self.get_timing_profile_argument(block['properties'])}{self.get_type_strategy_argument(block['properties'])})")
             
         elif block['type'] == "keyboard_key":
             key = block['properties'].get('key', 'enter')
             presses = block['properties'].get('presses', 1)
             interval = block['properties'].get('interval', 0.0)
             code.append(f"{indent}# {block['name']}")
-            code.append(f"{indent}keyboard_controller.press_key('{key}', {presses}, {interval})")
+            code.append(f"{indent}keyboard_controller.press_key('{key}', {presses}, {interval}{self.get_timing_profile_argument(block['properties'])})")
+            
+        elif block['type'] == "input_batch":
+            # 相邻的输入积木编译为一条序列一次性注入，间隔和节奏停顿保留
+            code.append(f"{indent}# 批量输入: {block['name']}")
+            code.append(f"{indent}input_batch = InputBatch(keyboard_controller.timing_profile)")
+            for step in block['blocks']:
+                code.append(self.generate_input_batch_step(step, indent))
+            code.append(f"{indent}input_batch.run(check_execution_control)")
             
         elif block['type'] == "find_image":
             image_path = block['properties'].get('image_path', '')
             threshold = block['properties'].get('threshold', 0.8)
             action = block['properties'].get('action', 'click')
+            region_arg = self.get_region_argument(block['properties'])
+            match_mode_arg = self.get_match_mode_argument(block['properties'])
             code.append(f"{indent}# {block['name']}")
             if image_path:
-                code.append(f"{indent}position = image_recognizer.find_image({json.dumps(image_path)}, {threshold})")
+                code.append(f"{indent}position = image_recognizer.find_image({json.dumps(image_path)}, {threshold}{region_arg}{match_mode_arg})")
                 code.append(f"{indent}if position:")
                 if action == 'click':
                     code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -5265,12 +6226,62 @@ class BlockEditor(QWidget):
                 code.append(f"{indent}else:")
                 code.append(f"{indent}    print('未找到指定图像')")
                 
+        elif block['type'] == "find_any_image":
+            image_paths = block['properties'].get('image_paths', [])
+            threshold = block['properties'].get('threshold', 0.8)
+            action = block['properties'].get('action', 'click')
+            region_arg = self.get_region_argument(block['properties'])
+            code.append(f"{indent}# {block['name']}")
+            if image_paths:
+                code.append(f"{indent}found_images = image_recognizer.find_images({json.dumps(image_paths)}, {threshold}{region_arg})")
+                code.append(f"{indent}position = next((pos for pos in found_images.values() if pos), None)")
+                code.append(f"{indent}if position:")
+                if action == 'click':
+                    code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                    code.append(f"{indent}    mouse_controller.click(position[0], position[1], 'left', 1, 0.1)")
+                elif action == 'move':
+                    code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                else:
+                    code.append(f"{indent}    print(f'找到图像，位置: {{position}}')")
+                code.append(f"{indent}else:")
+                code.append(f"{indent}    print('未找到任何指定图像')")
+            else:
+                code.append(f"{indent}print('未指定查找图像')")
+            
+        elif block['type'] == "find_all_images":
+            image_path = block['properties'].get('image_path', '')
+            threshold = block['properties'].get('threshold', 0.8)
+            max_count = block['properties'].get('max_count', 20)
+            sort = block['properties'].get('sort', 'score')
+            action = block['properties'].get('action', 'click')
+            interval = block['properties'].get('interval', 0.2)
+            region_arg = self.get_region_argument(block['properties'])
+            code.append(f"{indent}# {block['name']}")
+            if image_path:
+                # 只匹配一次，之后遍历结果列表，不会为每个目标重新截图
+                code.append(f"{indent}found_positions = image_recognizer.find_all_images({json.dumps(image_path)}, {threshold}{region_arg}, max_count={max_count}, sort={sort!r})")
+                code.append(f"{indent}print(f'找到 {{len(found_positions)}} 个图像')")
+                code.append(f"{indent}for position in found_positions:")
+                code.append(f"{indent}    check_execution_control()  # 检查暂停/停止状态")
+                if action == 'click':
+                    code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                    code.append(f"{indent}    mouse_controller.click(position[0], position[1], 'left', 1, 0.1)")
+                elif action == 'move':
+                    code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                else:
+                    code.append(f"{indent}    print(f'图像位置: {{position}}')")
+                if interval > 0:
+                    code.append(f"{indent}    time.sleep({interval})")
+            else:
+                code.append(f"{indent}print('未指定查找图像')")
+            
         elif block['type'] == "find_text":
             text = block['properties'].get('text', '查找的文字')
             threshold = block['properties'].get('threshold', 0.8)
             action = block['properties'].get('action', 'click')
+            region_arg = self.get_region_argument(block['properties'])
             code.append(f"{indent}# {block['name']}")
-            code.append(f"{indent}position = image_recognizer.find_text({json.dumps(text)}, {threshold})")
+            code.append(f"{indent}position = image_recognizer.find_text({json.dumps(text)}, threshold={threshold}{region_arg}{self.get_ocr_preset_argument(block['properties'])})")
             code.append(f"{indent}if position:")
             if action == 'click':
                 code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -5278,12 +6289,35 @@ class BlockEditor(QWidget):
             code.append(f"{indent}else:")
             code.append(f"{indent}    print('未找到指定文字')")
             
+        elif block['type'] == "find_color" and block['properties'].get('find_mode') == "blobs":
+            color = block['properties'].get('color', '#FF0000')
+            tolerance = block['properties'].get('tolerance', 10)
+            action = block['properties'].get('action', 'click')
+            min_area = block['properties'].get('min_area', 4)
+            max_area = block['properties'].get('max_area', 0) or None
+            region_arg = self.get_region_argument(block['properties'])
+            code.append(f"{indent}# {block['name']}")
+            code.append(f"{indent}color_blobs = image_recognizer.find_all_colors({json.dumps(color)}, {tolerance}{region_arg}, "
+                        f"mode='blobs', min_area={min_area}, max_area={max_area})")
+            code.append(f"{indent}print(f'找到 {{len(color_blobs)}} 个色块')")
+            code.append(f"{indent}for blob in color_blobs:")
+            code.append(f"{indent}    check_execution_control()  # 检查暂停/停止状态")
+            code.append(f"{indent}    position = blob['center']")
+            if action == 'click':
+                code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                code.append(f"{indent}    mouse_controller.click(position[0], position[1], 'left', 1, 0.1)")
+            elif action == 'move':
+                code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+            else:
+                code.append(f"{indent}    print(f'色块位置: {{position}}，面积: {{blob[\"area\"]}}')")
+            
         elif block['type'] == "find_color":
             color = block['properties'].get('color', '#FF0000')
             tolerance = block['properties'].get('tolerance', 10)
             action = block['properties'].get('action', 'click')
+            region_arg = self.get_region_argument(block['properties'])
             code.append(f"{indent}# {block['name']}")
-            code.append(f"{indent}position = image_recognizer.find_color({json.dumps(color)}, {tolerance})")
+            code.append(f"{indent}position = image_recognizer.find_color({json.dumps(color)}, {tolerance}{region_arg})")
             code.append(f"{indent}if position:")
             if action == 'click':
                 code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
@@ -5295,6 +6329,61 @@ class BlockEditor(QWidget):
             code.append(f"{indent}else:")
             code.append(f"{indent}    print('未找到指定颜色')")
             
+        elif block['type'] == "find_color_pattern":
+            anchor = block['properties'].get('anchor', '#FF0000')
+            offsets = block['properties'].get('offsets', [])
+            tolerance = block['properties'].get('tolerance', 10)
+            find_all = block['properties'].get('find_all', False)
+            action = block['properties'].get('action', 'click')
+            region_arg = self.get_region_argument(block['properties'])
+            code.append(f"{indent}# {block['name']}")
+            call = f"image_recognizer.find_color_pattern({json.dumps(anchor)}, {json.dumps(offsets)}{region_arg}, tolerance={tolerance}"
+            if find_all:
+                code.append(f"{indent}pattern_positions = {call}, find_all=True)")
+                code.append(f"{indent}print(f'多点找色找到 {{len(pattern_positions)}} 处')")
+                code.append(f"{indent}for position in pattern_positions:")
+                code.append(f"{indent}    check_execution_control()  # 检查暂停/停止状态")
+            else:
+                code.append(f"{indent}position = {call})")
+                code.append(f"{indent}if position:")
+            if action == 'click':
+                code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                code.append(f"{indent}    mouse_controller.click(position[0], position[1], 'left', 1, 0.1)")
+            elif action == 'move':
+                code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+            else:
+                code.append(f"{indent}    print(f'多点找色位置: {{position}}')")
+            if not find_all:
+                code.append(f"{indent}else:")
+                code.append(f"{indent}    print('未找到多点找色目标')")
+            
+        elif block['type'] == "find_colors":
+            palette = block['properties'].get('palette', [])
+            tolerance = block['properties'].get('tolerance', 10)
+            region_arg = self.get_region_argument(block['properties'])
+            code.append(f"{indent}# {block['name']}")
+            if palette:
+                colors = [entry.get('color', '#FF0000') for entry in palette]
+                code.append(f"{indent}found_colors = image_recognizer.find_colors({json.dumps(colors)}, {tolerance}{region_arg})")
+                code.append(f"{indent}found_color = next((color for color, pos in found_colors.items() if pos), None)")
+                for i, entry in enumerate(palette):
+                    color = entry.get('color', '#FF0000')
+                    action = entry.get('action', 'click')
+                    keyword = "if" if i == 0 else "elif"
+                    code.append(f"{indent}{keyword} found_color == {json.dumps(color)}:")
+                    code.append(f"{indent}    position = found_colors[found_color]")
+                    if action == 'click':
+                        code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                        code.append(f"{indent}    mouse_controller.click(position[0], position[1], 'left', 1, 0.1)")
+                    elif action == 'move':
+                        code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                    else:
+                        code.append(f"{indent}    print(f'找到颜色 {color}，位置: {{position}}')")
+                code.append(f"{indent}else:")
+                code.append(f"{indent}    print('未找到任何指定颜色')")
+            else:
+                code.append(f"{indent}print('未指定查找颜色')")
+            
         elif block['type'] == "run_script":
             script_path = block['properties'].get('script_path', '')
             speed = block['properties'].get('speed', 1.0)
@@ -5328,6 +6417,58 @@ class BlockEditor(QWidget):
             code.append(f"{indent}# {block['name']}")
             code.append(f"{indent}time.sleep({wait_time})")
             
+        elif block['type'] in ("wait_for_image", "wait_for_color", "wait_for_text"):
+            properties = block['properties']
+            timeout = properties.get('timeout', 10.0)
+            action = properties.get('action', 'ignore')
+            on_timeout = properties.get('on_timeout', 'continue')
+            region_arg = self.get_region_argument(properties)
+            code.append(f"{indent}# {block['name']}")
+            if block['type'] == "wait_for_image":
+                target = properties.get('image_path', '')
+                target_name = "图像"
+                call = f"image_recognizer.wait_for_image({json.dumps(target)}, {timeout}, threshold={properties.get('threshold', 0.8)}"
+            elif block['type'] == "wait_for_color":
+                target = properties.get('color', '#FF0000')
+                target_name = "颜色"
+                call = f"image_recognizer.wait_for_color({json.dumps(target)}, {timeout}, tolerance={properties.get('tolerance', 10)}"
+            else:
+                target = properties.get('text', '')
+                target_name = "文字"
+                call = (f"image_recognizer.wait_for_text({json.dumps(target)}, {timeout}, "
+                        f"threshold={properties.get('threshold', 0.8)}{self.get_ocr_preset_argument(properties)}")
+            if target:
+                code.append(f"{indent}position = {call}{region_arg}, on_poll=check_execution_control)")
+                code.append(f"{indent}if position:")
+                if action == 'click':
+                    code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                    code.append(f"{indent}    mouse_controller.click(position[0], position[1], 'left', 1, 0.1)")
+                elif action == 'move':
+                    code.append(f"{indent}    mouse_controller.move_to(position[0], position[1], 0.5)")
+                else:
+                    code.append(f"{indent}    print(f'{target_name}已出现，位置: {{position}}')")
+                code.append(f"{indent}else:")
+                if on_timeout == 'stop':
+                    code.append(f"{indent}    raise TimeoutError('等待{target_name}超时（{timeout}秒），脚本停止')")
+                else:
+                    code.append(f"{indent}    print('等待{target_name}超时（{timeout}秒），继续执行')")
+            else:
+                code.append(f"{indent}print('未指定等待的{target_name}')")
+            
+        elif block['type'] == "set_timing_profile":
+            profile = block['properties'].get('timing_profile', 'normal')
+            code.append(f"{indent}# {block['name']}")
+            code.append(f"{indent}mouse_controller.set_timing_profile({profile!r})")
+            code.append(f"{indent}keyboard_controller.set_timing_profile({profile!r})")
+            
+        elif block['type'] == "capture_stream":
+            fps = block['properties'].get('fps', 30)
+            code.append(f"{indent}# {block['name']}")
+            if fps > 0:
+                code.append(f"{indent}image_recognizer.start_capture_stream({fps})")
+            else:
+                code.append(f"{indent}image_recognizer.stop_capture_stream()")
+            
         elif block['type'] == "broadcast":
             message = block['properties'].get('message', '消息1')
             delay = block['properties'].get('delay', 0.0)
@@ -5378,6 +6519,119 @@ class BlockEditor(QWidget):
                 self.color_preview.setStyleSheet(f"background-color: {hex_color}; border: 1px solid black;")
             logger.info(f"选择颜色: {hex_color}")
     
+    def format_color_offsets(self, offsets):
+        """将偏移点列表格式化为每行 "dx, dy, #颜色" 的文本"""
+        return "\n".join(f"{o.get('dx', 0)}, {o.get('dy', 0)}, {o.get('color', '#000000')}" for o in offsets)
+    
+    def parse_color_offsets(self, text):
+        """解析偏移点文本，格式不正确的行会被忽略"""
+        offsets = []
+        for line in text.splitlines():
+            parts = [part.strip() for part in line.split(',')]
+            if len(parts) < 3:
+                continue
+            try:
+                offset = {"dx": int(parts[0]), "dy": int(parts[1]), "color": parts[2]}
+                if len(parts) > 3 and parts[3]:
+                    offset["tolerance"] = int(parts[3])
+            except ValueError:
+                logger.warning(f"忽略格式不正确的偏移点: {line}")
+                continue
+            offsets.append(offset)
+        return offsets
+    
+    def capture_color_pattern(self, block_item):
+        """框选界面元素截图，自动提取锚点颜色和偏移点"""
+        try:
+            self.parent.hide()
+            
+            def on_screenshot_complete(pixmap):
+                self.parent.show()
+                if not pixmap:
+                    logger.info("多点找色截图已取消")
+                    return
+                
+                import cv2
+                from modules.image_recognition import ImageRecognition
+                
+                temp_dir = "temp"
+                if not os.path.exists(temp_dir):
+                    os.makedirs(temp_dir)
+                file_path = os.path.join(temp_dir, f"pattern_{int(time.time())}.png")
+                pixmap.save(file_path)
+                
+                image = cv2.imread(file_path)
+                if image is None:
+                    QMessageBox.warning(self, "提取失败", "无法读取截图")
+                    return
+                anchor, offsets = ImageRecognition().extract_color_pattern(image)
+                if hasattr(self, 'color_edit'):
+                    self.color_edit.setText(anchor)
+                if hasattr(self, 'offsets_edit'):
+                    self.offsets_edit.setPlainText(self.format_color_offsets(offsets))
+                logger.info(f"提取多点找色特征: 锚点 {anchor}，{len(offsets)} 个偏移点")
+            
+            self.current_screenshot_tool = self.parent.screenshot_manager.capture_region(callback=on_screenshot_complete)
+            
+        except Exception as e:
+            logger.error(f"多点找色截图出错: {e}")
+            QMessageBox.critical(self, "错误", f"多点找色截图出错: {e}")
+            self.parent.show()
+    
+    def add_palette_item(self, color, action):
+        """向颜色列表添加一项，显示为"颜色 → 动作"，数据保存在UserRole中"""
+        action_names = {"click": "点击", "move": "移动", "ignore": "忽略"}
+        item = QListWidgetItem(f"{color} → {action_names.get(action, action)}")
+        item.setData(Qt.UserRole, {"color": color, "action": action})
+        item.setBackground(QColor(color))
+        self.palette_list_widget.addItem(item)
+    
+    def add_palette_color(self, block_item, from_screen=False):
+        """选择一种颜色及其动作，加入查找多种颜色积木的颜色列表"""
+        from PyQt5.QtWidgets import QColorDialog
+        
+        if from_screen:
+            self.pick_palette_color_from_screen()
+            return
+        
+        color = QColorDialog.getColor(QColor("#FF0000"), self, "选择颜色")
+        if not color.isValid():
+            return
+        self.add_palette_color_with_action(color.name())
+    
+    def pick_palette_color_from_screen(self):
+        """用取色器在屏幕上点击取色（经当前采集后端截取），取到后加入颜色列表"""
+        main_window = self.parent
+        try:
+            from modules.script_recorder import ColorPicker
+            
+            QMessageBox.information(self, "屏幕取色", "点击确定后，在屏幕上单击目标颜色位置取色，按ESC取消。")
+            self.palette_color_picker = ColorPicker()
+            
+            def on_color_picked(color):
+                main_window.show()
+                self.add_palette_color_with_action(f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}")
+            
+            self.palette_color_picker.color_picked.connect(on_color_picked)
+            self.palette_color_picker.picking_cancelled.connect(main_window.show)
+            main_window.hide()
+            self.palette_color_picker.start_picking()
+        except Exception as e:
+            logger.error(f"屏幕取色失败: {e}")
+            main_window.show()
+            QMessageBox.warning(self, "取色失败", f"屏幕取色失败: {str(e)}")
+    
+    def add_palette_color_with_action(self, hex_color):
+        """选择找到颜色后的动作，并把颜色加入颜色列表"""
+        from PyQt5.QtWidgets import QInputDialog
+        
+        action_name, ok = QInputDialog.getItem(self, "找到该颜色后", "动作:", ["点击", "移动", "忽略"], 0, False)
+        if not ok:
+            return
+        action = {"点击": "click", "移动": "move", "忽略": "ignore"}[action_name]
+        self.add_palette_item(hex_color, action)
+        logger.info(f"添加颜色 {hex_color}，动作: {action}")
+    
     def pick_color_from_screen(self, block_item):
         """从屏幕取色"""
         try:
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+输入积木分组模块
+生成脚本前把相邻的输入积木合并为批量输入积木（不依赖界面，可单独测试）。
+"""
+
+# 相邻时合并为批量输入序列的积木类型
+INPUT_BATCH_BLOCK_TYPES = ("mouse_click", "keyboard_input", "keyboard_key")
+
+
+def group_input_batches(blocks):
+    """
+    把相邻的鼠标点击、键盘输入、键盘按键积木合并为一个批量输入积木
+
+    连续两个及以上的输入积木生成为一条 InputBatch 序列一次性注入，
+    其余积木原样返回。
+    """
+    grouped = []
+    run = []
+    for block in list(blocks) + [None]:
+        if block is not None and block['type'] in INPUT_BATCH_BLOCK_TYPES:
+            run.append(block)
+            continue
+        if len(run) > 1:
+            grouped.append({
+                'name': "、".join(item['name'] for item in run),
+                'type': "input_batch",
+                'properties': {},
+                'blocks': run,
+            })
+        else:
+            grouped.extend(run)
+        run = []
+        if block is not None:
+            grouped.append(block)
+    return grouped
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剪贴板模块
+在执行线程中直接读写系统剪贴板（Win32 API，不依赖Qt界面线程），
+供粘贴方式输入文本时临时占用剪贴板，并在粘贴后恢复原有内容。
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 剪贴板被其他程序占用时的重试次数与间隔
+OPEN_RETRIES = 10
+OPEN_RETRY_INTERVAL = 0.02
+
+# 标准剪贴板格式的名称（注册格式通过 GetClipboardFormatName 获取）
+STANDARD_FORMAT_NAMES = {
+    1: "CF_TEXT", 2: "CF_BITMAP", 3: "CF_METAFILEPICT", 4: "CF_SYLK", 5: "CF_DIF", 6: "CF_TIFF",
+    7: "CF_OEMTEXT", 8: "CF_DIB", 9: "CF_PALETTE", 10: "CF_PENDATA", 11: "CF_RIFF", 12: "CF_WAVE",
+    13: "CF_UNICODETEXT", 14: "CF_ENHMETAFILE", 15: "CF_HDROP", 16: "CF_LOCALE", 17: "CF_DIBV5",
+}
+
+# 系统会从 CF_DIB/CF_DIBV5 自动合成的句柄格式，保存了DIB时不算丢失
+DIB_FORMATS = (8, 17)
+SYNTHESIZED_FROM_DIB = (2, 9)
+
+
+def clipboard_available():
+    """当前环境是否能直接读写剪贴板"""
+    try:
+        import win32clipboard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class _OpenClipboard:
+    """打开剪贴板的上下文，其他程序占用时短暂重试"""
+
+    def __enter__(self):
+        import win32clipboard
+        self._clipboard = win32clipboard
+        for attempt in range(OPEN_RETRIES):
+            try:
+                win32clipboard.OpenClipboard()
+                return win32clipboard
+            except Exception:
+                if attempt == OPEN_RETRIES - 1:
+                    raise
+                time.sleep(OPEN_RETRY_INTERVAL)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._clipboard.CloseClipboard()
+
+
+def _format_name(clipboard, fmt):
+    if fmt in STANDARD_FORMAT_NAMES:
+        return STANDARD_FORMAT_NAMES[fmt]
+    try:
+        return clipboard.GetClipboardFormatName(fmt)
+    except Exception:
+        return str(fmt)
+
+
+def save_clipboard():
+    """
+    保存剪贴板当前内容
+
+    只有能按字节或文本读取的格式可以原样恢复；文件列表（CF_HDROP）、位图句柄等
+    格式无法恢复，以格式名称列在 lost 中，调用方应据此决定是否占用剪贴板。
+
+    Returns:
+        (saved, lost)：saved 为 [(格式, 数据)]，lost 为无法恢复的格式名称列表
+    """
+    saved = []
+    unreadable = []
+    with _OpenClipboard() as clipboard:
+        fmt = clipboard.EnumClipboardFormats(0)
+        while fmt:
+            try:
+                data = clipboard.GetClipboardData(fmt)
+            except Exception:
+                data = None
+            if isinstance(data, (bytes, str)):
+                saved.append((fmt, data))
+            else:
+                unreadable.append(fmt)
+            fmt = clipboard.EnumClipboardFormats(fmt)
+        has_dib = any(fmt in DIB_FORMATS for fmt, _ in saved)
+        lost = [_format_name(clipboard, fmt) for fmt in unreadable
+                if not (has_dib and fmt in SYNTHESIZED_FROM_DIB)]
+    return saved, lost
+
+
+def restore_clipboard(saved):
+    """恢复 save_clipboard 保存的内容"""
+    with _OpenClipboard() as clipboard:
+        clipboard.EmptyClipboard()
+        for fmt, data in saved:
+            try:
+                clipboard.SetClipboardData(fmt, data)
+            except Exception as e:
+                logger.warning(f"剪贴板格式 {_format_name(clipboard, fmt)} 恢复失败: {e}")
+
+
+def set_clipboard_text(text):
+    """把剪贴板内容替换为文本"""
+    with _OpenClipboard() as clipboard:
+        clipboard.EmptyClipboard()
+        clipboard.SetClipboardText(text, clipboard.CF_UNICODETEXT)
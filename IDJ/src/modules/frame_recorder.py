@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧录制与回放模块
+把屏幕帧序列连同时间戳录制到磁盘，并提供按原速或加速回放的采集后端，
+用于在无桌面的环境中对识别引擎做可重复的性能分析和回归对比。
+
+录制格式为一个目录：
+    index.json          元数据（版本、帧尺寸、各分块的帧数与时间戳）
+    chunk_00000.npz     分块数据，np.savez_compressed 保存
+
+每个分块的第一帧原样保存，其余帧保存与前一帧的异或差值。相邻帧大部分像素相同，
+差值几乎全为0，压缩后体积很小。
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+import numpy as np
+
+from modules.screen_capture import CaptureBackend, crop_region, create_capture_backend
+
+logger = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+RECORDING_INDEX = "index.json"
+
+# 每个分块最多包含的帧数与字节数（取两者中较小的帧数，至少1帧）
+CHUNK_FRAMES = 30
+CHUNK_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _chunk_name(number):
+    return f"chunk_{number:05d}.npz"
+
+
+class FrameRecorder:
+    """
+    帧录制器
+
+    分块的压缩和写盘交给后台保存队列（与截图保存共用线程和内存上限），
+    采集线程只做异或差值；待写入的分块过多时 add() 会等待。
+
+    用法:
+        with FrameRecorder("recordings/login") as recorder:
+            recorder.add(frame)
+    """
+
+    def __init__(self, path, chunk_frames=CHUNK_FRAMES, chunk_max_bytes=CHUNK_MAX_BYTES, writer=None):
+        """
+        Args:
+            path: 录制目录
+            chunk_frames: 每个分块最多包含的帧数
+            chunk_max_bytes: 每个分块最多占用的字节数，4K帧时一个分块只有两三帧
+            writer: 后台写盘队列（ImageSaveQueue），None表示共享的保存队列
+        """
+        from modules.image_saver import get_image_saver
+
+        self.path = path
+        self.chunk_frames = max(1, int(chunk_frames))
+        self.chunk_max_bytes = max(1, int(chunk_max_bytes))
+        self._writer = writer or get_image_saver()
+        os.makedirs(path, exist_ok=True)
+        self._chunks = []  # [{"file", "count", "shape", "timestamps"}]
+        self._written = []  # 各分块是否已写入磁盘
+        self._futures = []
+        self._buffer = None  # 当前分块的帧数组（已转换为差值），预先按分块容量分配
+        self._count = 0
+        self._pending_times = []
+        self._previous = None
+        self._start = None
+        # 可重入：写盘在当前线程同步执行时（界面线程超过内存上限），_chunk_written 在持有锁时被调用
+        self._lock = threading.RLock()
+        self.frames = 0
+        self.closed = False
+
+    def _chunk_capacity(self, frame):
+        return max(1, min(self.chunk_frames, self.chunk_max_bytes // max(1, frame.nbytes)))
+
+    def add(self, frame, timestamp=None):
+        """
+        追加一帧
+
+        Args:
+            frame: BGR图像数组
+            timestamp: 时间戳（秒，time.perf_counter），None表示当前时刻
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("录制已结束")
+            if self._start is None:
+                self._start = timestamp
+            # 分辨率变化时开始新分块
+            if self._previous is not None and self._previous.shape != frame.shape:
+                self._flush()
+            if self._buffer is None:
+                self._buffer = np.empty((self._chunk_capacity(frame),) + frame.shape, dtype=frame.dtype)
+            slot = self._buffer[self._count]
+            if self._previous is None:
+                np.copyto(slot, frame)
+                self._previous = np.array(frame, copy=True)
+            else:
+                np.bitwise_xor(frame, self._previous, out=slot)
+                np.copyto(self._previous, frame)
+            self._count += 1
+            self._pending_times.append(timestamp - self._start)
+            self.frames += 1
+            if self._count >= len(self._buffer):
+                self._flush()
+
+    def _flush(self):
+        """把当前分块交给后台写盘（调用方持有锁）"""
+        if not self._count:
+            return
+        number = len(self._chunks)
+        name = _chunk_name(number)
+        frames = self._buffer[:self._count]
+        times = np.array(self._pending_times, dtype=np.float64)
+        self._chunks.append({
+            "file": name,
+            "count": self._count,
+            "shape": list(frames.shape[1:]),
+            "timestamps": [round(t, 6) for t in self._pending_times],
+        })
+        self._written.append(False)
+        chunk_path = os.path.join(self.path, name)
+
+        def write():
+            np.savez_compressed(chunk_path, frames=frames, timestamps=times)
+            self._chunk_written(number)
+
+        self._futures.append(self._writer.submit_write(chunk_path, write, frames.nbytes))
+        self._buffer = None
+        self._count = 0
+        self._pending_times = []
+        self._previous = None  # 下一个分块从完整帧开始，分块之间可以独立解码
+
+    def _chunk_written(self, number):
+        """分块写入完成（写盘线程），索引只列出从头连续写完的分块"""
+        with self._lock:
+            self._written[number] = True
+            self._write_index()
+
+    def _write_index(self):
+        """写出索引（调用方持有锁）"""
+        done = 0
+        while done < len(self._written) and self._written[done]:
+            done += 1
+        chunks = self._chunks[:done]
+        index = {"version": RECORDING_VERSION, "frames": sum(chunk["count"] for chunk in chunks), "chunks": chunks}
+        with open(os.path.join(self.path, RECORDING_INDEX), "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+
+    def close(self):
+        """写出剩余帧，等待所有分块写入完成并结束录制"""
+        with self._lock:
+            if self.closed:
+                return
+            self._flush()
+            self.closed = True
+        for future in self._futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"帧录制分块写入失败: {e}")
+        with self._lock:
+            self._write_index()
+        logger.info(f"帧录制完成: {self.path}，共 {self.frames} 帧")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def record_screen(path, duration, fps=10, backend=None, stop_event=None):
+    """
+    按固定帧率录制屏幕
+
+    Args:
+        path: 录制目录
+        duration: 录制时长（秒）
+        fps: 帧率
+        backend: 采集后端或名称，None表示自动选择
+        stop_event: 可选的 threading.Event，置位时提前结束
+
+    Returns:
+        录制的帧数
+    """
+    if backend is None or isinstance(backend, str):
+        backend = create_capture_backend(backend or "auto")
+    interval = 1.0 / max(0.1, float(fps))
+    with FrameRecorder(path) as recorder:
+        start = time.perf_counter()
+        next_time = start
+        while time.perf_counter() - start < duration:
+            if stop_event is not None and stop_event.is_set():
+                break
+            captured_at = time.perf_counter()
+            recorder.add(backend.grab(), captured_at)
+            next_time += interval
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+    return recorder.frames
+
+
+class FrameRecording:
+    """
+    读取录制的帧序列
+
+    按分块懒加载并解码，最近使用的一个分块保留在内存中。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, RECORDING_INDEX), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != RECORDING_VERSION:
+            raise ValueError(f"不支持的录制格式版本: {index.get('version')}")
+        self._chunks = index["chunks"]
+        self._chunk_starts = []  # 每个分块第一帧的全局序号
+        self.timestamps = []
+        for chunk in self._chunks:
+            self._chunk_starts.append(len(self.timestamps))
+            self.timestamps.extend(chunk["timestamps"])
+        self._cached_chunk = None  # (分块序号, 解码后的帧数组)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def duration(self):
+        """录制时长（秒）"""
+        return self.timestamps[-1] if self.timestamps else 0.0
+
+    def _decode_chunk(self, number):
+        with np.load(os.path.join(self.path, self._chunks[number]["file"])) as data:
+            frames = data["frames"]
+        # 差值逐帧累积异或还原为完整帧
+        np.bitwise_xor.accumulate(frames, axis=0, out=frames)
+        return frames
+
+    def frame(self, index):
+        """
+        获取第 index 帧
+
+        Returns:
+            BGR图像数组（只读视图，需修改时请复制）
+        """
+        if not 0 <= index < len(self.timestamps):
+            raise IndexError(f"帧序号超出范围: {index}")
+        number = bisect.bisect_right(self._chunk_starts, index) - 1
+        with self._lock:
+            if self._cached_chunk is None or self._cached_chunk[0] != number:
+                frames = self._decode_chunk(number)
+                frames.flags.writeable = False
+                self._cached_chunk = (number, frames)
+            return self._cached_chunk[1][index - self._chunk_starts[number]]
+
+    def index_at(self, elapsed):
+        """返回在录制开始后 elapsed 秒时正在显示的帧序号"""
+        return max(0, bisect.bisect_right(self.timestamps, elapsed) - 1)
+
+    def __iter__(self):
+        for index in range(len(self.timestamps)):
+            yield self.frame(index)
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    回放录制帧的采集后端
+
+    speed > 0 时按录制的时间线回放（1为原速，4为四倍速），grab返回当前时刻应显示的帧；
+    speed = 0 时为逐帧模式，每次grab前进一帧，适合逐帧对比两个版本的识别结果。
+    回放到末尾后停在最后一帧，loop=True时从头循环。
+    """
+
+    name = "replay"
+
+    def __init__(self, path, speed=1.0, loop=False):
+        self.recording = path if isinstance(path, FrameRecording) else FrameRecording(path)
+        if not len(self.recording):
+            raise ValueError(f"录制中没有帧: {self.recording.path}")
+        self.speed = max(0.0, float(speed))
+        self.loop = loop
+        self.index = -1  # 最近一次grab返回的帧序号
+        self._start = None
+        self._lock = threading.Lock()
+
+    def rewind(self):
+        """回到录制开头"""
+        with self._lock:
+            self.index = -1
+            self._start = None
+
+    @property
+    def finished(self):
+        """是否已回放到最后一帧（循环回放时始终为False）"""
+        return not self.loop and self.index >= len(self.recording) - 1
+
+    def _next_index(self):
+        """计算本次grab应返回的帧序号（调用方持有锁）"""
+        count = len(self.recording)
+        if self.speed == 0:
+            index = self.index + 1
+        else:
+            now = time.perf_counter()
+            if self._start is None:
+                self._start = now
+            elapsed = (now - self._start) * self.speed
+            if self.loop and self.recording.duration > 0:
+                elapsed %= self.recording.duration
+            index = self.recording.index_at(elapsed)
+        if index >= count:
+            index = 0 if self.loop else count - 1
+        return index
+
+    def grab(self, region=None, out=None):
+        with self._lock:
+            self.index = self._next_index()
+            frame = self.recording.frame(self.index)
+        if region is not None:
+            frame = crop_region(frame, region)[0]
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            return out
+        return frame.copy()
@@ -5,18 +5,469 @@
 提供图像匹配、文字识别等功能
 """
 
+import os
+import time
 import logging
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from PIL import Image
 import pytesseract
 
+from modules.screen_capture import frame_provider, frame_fingerprint, set_capture_backend
+from modules.ocr_worker import ocr_words, ocr_cache
+
 logger = logging.getLogger(__name__)
 
+
+class TemplateCache:
+    """
+    模板图像缓存
+    
+    以 (路径, 读取模式) 为键缓存解码后的模板图像，命中时用文件修改时间和大小校验，
+    文件被替换后会自动重新读取。总占用超过字节预算时按LRU顺序淘汰。
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (signature, image)
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, path, flags=cv2.IMREAD_COLOR):
+        """
+        获取模板图像
+        
+        Args:
+            path: 图像路径
+            flags: cv2.imread 读取模式
+            
+        Returns:
+            解码后的图像数组，读取失败返回None
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        
+        key = (os.path.abspath(path), flags)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        image = cv2.imread(path, flags)
+        if image is None:
+            return None
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._current_bytes -= old[1].nbytes
+            # 单张超过预算的图像不缓存
+            if image.nbytes <= self.max_bytes:
+                self._entries[key] = (signature, image)
+                self._current_bytes += image.nbytes
+                self._evict()
+        return image
+    
+    def _evict(self):
+        """淘汰最久未使用的条目直到满足字节预算（调用方持有锁）"""
+        while self._current_bytes > self.max_bytes and self._entries:
+            _, (_, image) = self._entries.popitem(last=False)
+            self._current_bytes -= image.nbytes
+            self.evictions += 1
+    
+    def set_max_bytes(self, max_bytes):
+        """设置缓存字节预算"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+    
+    def clear(self):
+        """清空缓存（不重置计数器）"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+    
+    def stats(self):
+        """
+        获取缓存统计
+        
+        Returns:
+            包含 hits/misses/evictions/entries/bytes/max_bytes/hit_rate 的字典
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 进程内共享的模板缓存，所有ImageRecognition实例共用
+template_cache = TemplateCache()
+
+
+class HitMemory:
+    """
+    模板命中位置记忆
+    
+    记录每个模板上一次被找到的屏幕坐标（左上角）。下次查找时先在该位置附近的
+    小窗口内匹配，得分低于阈值才回退到整帧搜索。
+    """
+    
+    def __init__(self, margin=16):
+        self.margin = margin
+        self.enabled = True
+        self._positions = {}  # 模板绝对路径 -> (x, y) 屏幕坐标
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.local_misses = 0
+    
+    def get(self, key):
+        """获取模板上次命中的屏幕坐标，没有记录或已禁用时返回None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._positions.get(os.path.abspath(key))
+    
+    def remember(self, key, position):
+        """记录模板本次命中的屏幕坐标"""
+        with self._lock:
+            self._positions[os.path.abspath(key)] = position
+    
+    def forget(self, key=None):
+        """清除某个模板的记录，key为None时全部清除"""
+        with self._lock:
+            if key is None:
+                self._positions.clear()
+            else:
+                self._positions.pop(os.path.abspath(key), None)
+    
+    def record(self, hit):
+        """统计一次局部搜索的结果"""
+        with self._lock:
+            if hit:
+                self.local_hits += 1
+            else:
+                self.local_misses += 1
+    
+    def stats(self):
+        """
+        获取局部搜索统计
+        
+        Returns:
+            包含 local_hits/local_misses/hit_rate/entries/margin/enabled 的字典
+        """
+        with self._lock:
+            total = self.local_hits + self.local_misses
+            return {
+                "local_hits": self.local_hits,
+                "local_misses": self.local_misses,
+                "hit_rate": self.local_hits / total if total else 0.0,
+                "entries": len(self._positions),
+                "margin": self.margin,
+                "enabled": self.enabled,
+            }
+
+
+# 进程内共享的命中位置记忆
+hit_memory = HitMemory()
+
+
+# 图像相似度比较时统一缩放到的尺寸
+FEATURE_IMAGE_SIZE = (300, 300)
+
+
+def compute_orb_features(image):
+    """
+    计算图像的ORB特征
+    
+    Args:
+        image: 灰度或BGR图像数组
+        
+    Returns:
+        (关键点数量, 描述子数组或None)
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    image = cv2.resize(image, FEATURE_IMAGE_SIZE)
+    keypoints, descriptors = cv2.ORB_create().detectAndCompute(image, None)
+    return len(keypoints), descriptors
+
+
+class FeatureCache:
+    """
+    ORB特征缓存
+    
+    以文件绝对路径为键缓存关键点数量和描述子，用修改时间和大小校验，
+    对同一参考图库的重复比较不再重新解码和提取特征。
+    """
+    
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # path -> (signature, (count, descriptors))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, path):
+        """
+        获取图像文件的ORB特征
+        
+        Returns:
+            (关键点数量, 描述子数组或None)，文件无法读取时返回None
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        
+        key = os.path.abspath(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return None
+        features = compute_orb_features(image)
+        
+        with self._lock:
+            self._entries[key] = (signature, features)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return features
+    
+    def clear(self):
+        """清空缓存（不重置计数器）"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """
+        获取缓存统计
+        
+        Returns:
+            包含 hits/misses/entries/hit_rate 的字典
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 进程内共享的ORB特征缓存
+feature_cache = FeatureCache()
+
+
+class MatchResultCache:
+    """
+    识别结果缓存（帧变化检测）
+    
+    以调用参数为键记录上一次的帧指纹和识别结果。搜索区域与上次检查逐像素相同时
+    直接返回上次结果，跳过匹配。轮询等待画面变化时可以省掉绝大部分匹配开销。
+    """
+    
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.enabled = True
+        self._entries = OrderedDict()  # key -> (fingerprint, result)
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.executed = 0
+    
+    def lookup(self, key, fingerprint):
+        """
+        查找缓存结果
+        
+        Returns:
+            (True, 上次结果) 或 (False, None)
+        """
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.skipped += 1
+                return True, entry[1]
+        return False, None
+    
+    def store(self, key, fingerprint, result):
+        """记录一次实际执行的识别结果"""
+        with self._lock:
+            self.executed += 1
+            if not self.enabled:
+                return
+            self._entries[key] = (fingerprint, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """清空缓存（不重置计数器）"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """
+        获取跳过/执行统计
+        
+        Returns:
+            包含 skipped/executed/entries/skip_rate/enabled 的字典
+        """
+        with self._lock:
+            total = self.skipped + self.executed
+            return {
+                "skipped": self.skipped,
+                "executed": self.executed,
+                "entries": len(self._entries),
+                "skip_rate": self.skipped / total if total else 0.0,
+                "enabled": self.enabled,
+            }
+
+
+# 进程内共享的识别结果缓存
+result_cache = MatchResultCache()
+
+
+def _file_stamp(path):
+    """文件修改时间，用于让结果缓存在模板文件被替换后失效"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+# 模板匹配模式
+MATCH_MODE_NORMAL = "normal"    # 全分辨率匹配
+MATCH_MODE_PYRAMID = "pyramid"  # 金字塔由粗到精匹配
+
+# 金字塔匹配参数
+PYRAMID_MAX_LEVELS = 2          # 最多缩小 2^2 = 4 倍
+PYRAMID_MIN_TEMPLATE_SIZE = 12  # 缩小后模板的最小边长（像素）
+PYRAMID_CANDIDATES = 5          # 在全分辨率下复核的候选数量
+
+# 多目标查找结果排序方式
+SORT_BY_SCORE = "score"      # 按匹配度从高到低
+SORT_BY_READING = "reading"  # 按阅读顺序（从上到下、从左到右）
+
+# 非极大值抑制：两个命中中心在x、y方向上都小于模板尺寸的该比例时视为同一目标
+NMS_OVERLAP = 0.5
+# 参与抑制的候选峰值上限（相对于max_count的倍数），避免低阈值时候选过多
+NMS_CANDIDATE_FACTOR = 50
+
+# OCR预处理预设
+#   grayscale: 转灰度；scale: 放大倍数（小字放大后识别更准）；binarize: 自适应阈值二值化
+#   psm: Tesseract页面分割模式（7 = 单行文字，None为默认）；whitelist: 字符白名单
+OCR_PRESETS = {
+    "raw": {"grayscale": False, "scale": 1.0, "binarize": False, "psm": None, "whitelist": None},
+    "gray": {"grayscale": True, "scale": 1.0, "binarize": False, "psm": None, "whitelist": None},
+    "small_text": {"grayscale": True, "scale": 2.0, "binarize": True, "psm": None, "whitelist": None},
+    "single_line": {"grayscale": True, "scale": 1.5, "binarize": True, "psm": 7, "whitelist": None},
+    "digits": {"grayscale": True, "scale": 2.0, "binarize": True, "psm": 7, "whitelist": "0123456789.,:/-%"},
+}
+OCR_DEFAULT_PRESET = "gray"
+
+
+def preprocess_for_ocr(frame, preset=OCR_DEFAULT_PRESET):
+    """
+    按预设预处理待识别的BGR图像
+    
+    Args:
+        frame: BGR图像数组
+        preset: OCR_PRESETS中的预设名，或同样结构的字典
+        
+    Returns:
+        (image, scale, config)：送入Tesseract的图像、相对原图的放大倍数、Tesseract参数
+    """
+    options = preset if isinstance(preset, dict) else OCR_PRESETS.get(preset)
+    if options is None:
+        logger.warning(f"未知的OCR预设: {preset}，使用默认预设")
+        options = OCR_PRESETS[OCR_DEFAULT_PRESET]
+    
+    if options.get("grayscale"):
+        image = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    else:
+        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    
+    scale = float(options.get("scale") or 1.0)
+    if scale != 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    
+    if options.get("binarize"):
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        # 深色背景上的浅色文字先反色，保证二值化后是白底黑字
+        if image.mean() < 127:
+            image = cv2.bitwise_not(image)
+        image = cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
+    
+    config = []
+    if options.get("psm") is not None:
+        config.append(f"--psm {options['psm']}")
+    if options.get("whitelist"):
+        config.append(f"-c tessedit_char_whitelist={options['whitelist']}")
+    return image, scale, " ".join(config)
+
+
+# 找色时每次检查的行数：按行分块扫描，找到第一个匹配所在的块就停止
+COLOR_SCAN_TILE_ROWS = 64
+
+# 等待类接口的自适应轮询间隔（秒）：画面静止时逐步放慢，画面变化时恢复最快
+WAIT_MIN_INTERVAL = 0.03
+WAIT_MAX_INTERVAL = 0.25
+WAIT_BACKOFF = 1.5
+
+# 批量模板匹配线程池（OpenCV在matchTemplate期间释放GIL，多线程可并行）
+_match_executor = None
+_match_executor_lock = threading.Lock()
+
+
+def get_match_executor():
+    """获取共享的模板匹配线程池（首次使用时创建）"""
+    global _match_executor
+    with _match_executor_lock:
+        if _match_executor is None:
+            _match_executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="idj-match"
+            )
+        return _match_executor
+
+
 class ImageRecognition:
     """图像识别主类"""
     
     def __init__(self):
+        self._stream_subscription = None  # 本识别器对后台截图流的订阅
         self.init_recognition()
     
     def init_recognition(self):
@@ -26,96 +477,761 @@ class ImageRecognition:
             if not hasattr(cv2, 'matchTemplate'):
                 logger.warning("OpenCV图像匹配功能未找到")
             
-            if not hasattr(pytesseract, 'image_to_string'):
+            if not hasattr(pytesseract, 'image_to_data'):
                 logger.warning("Tesseract OCR功能未找到")
             
-            logger.info("图像识别模块初始化成功")
+            logger.info("图像识别模块初始化成功")
+        except Exception as e:
+            logger.error(f"图像识别模块初始化失败: {e}")
+    
+    def load_template(self, template_path, flags=cv2.IMREAD_COLOR):
+        """
+        通过共享缓存加载模板图像
+        
+        Args:
+            template_path: 模板图像路径
+            flags: cv2.imread 读取模式
+            
+        Returns:
+            图像数组，加载失败返回None
+        """
+        return template_cache.get(template_path, flags)
+    
+    def configure_template_cache(self, max_mb):
+        """
+        设置模板缓存的内存预算
+        
+        Args:
+            max_mb: 最大占用（MB）
+        """
+        template_cache.set_max_bytes(int(max_mb * 1024 * 1024))
+        logger.info(f"模板缓存预算设置为 {max_mb} MB")
+    
+    def get_template_cache_stats(self):
+        """
+        获取模板缓存的命中/未命中/淘汰统计，可在运行中的脚本里读取
+        
+        Returns:
+            统计信息字典
+        """
+        return template_cache.stats()
+    
+    def configure_frame_sharing(self, max_age_ms):
+        """
+        设置截图共享的新鲜度窗口，窗口内的所有识别调用复用同一张截图
+        
+        Args:
+            max_age_ms: 毫秒，0表示每次识别都重新截图
+        """
+        frame_provider.set_max_age(max_age_ms / 1000.0)
+    
+    def get_frame_stats(self):
+        """
+        获取截图次数与复用次数统计
+        
+        Returns:
+            统计信息字典
+        """
+        return frame_provider.stats()
+    
+    def configure_capture_backend(self, backend):
+        """
+        切换屏幕采集后端（对所有识别器生效）
+        
+        Args:
+            backend: "auto"、"mss"、"pil"、"qt"、"pyautogui" 或 CaptureBackend实例
+        """
+        try:
+            set_capture_backend(backend)
+        except Exception as e:
+            logger.error(f"切换采集后端失败: {e}")
+    
+    def start_capture_stream(self, fps=30):
+        """
+        订阅后台截图流：识别调用直接取最新帧，不再同步截图
+        
+        多个识别器（脚本组）共享同一个流，帧率取各订阅者要求的最大值。
+        
+        Args:
+            fps: 目标帧率
+        """
+        try:
+            self.stop_capture_stream()
+            self._stream_subscription = frame_provider.stream.subscribe(fps)
+        except Exception as e:
+            logger.error(f"启动后台截图失败: {e}")
+    
+    def stop_capture_stream(self):
+        """取消本识别器的订阅，最后一个订阅者取消时后台截图停止"""
+        if self._stream_subscription is not None:
+            self._stream_subscription.close()
+            self._stream_subscription = None
+    
+    def get_capture_stream_stats(self):
+        """
+        获取后台截图流的帧率与丢帧统计
+        
+        Returns:
+            统计信息字典
+        """
+        return frame_provider.stream.stats()
+    
+    def configure_locality(self, enabled=True, margin=16):
+        """
+        设置"先在上次命中位置附近搜索"的行为
+        
+        Args:
+            enabled: 是否启用
+            margin: 上次位置四周额外搜索的像素数
+        """
+        hit_memory.enabled = bool(enabled)
+        hit_memory.margin = max(0, int(margin))
+        if not enabled:
+            hit_memory.forget()
+    
+    def get_locality_stats(self):
+        """
+        获取局部搜索命中率统计
+        
+        Returns:
+            统计信息字典
+        """
+        return hit_memory.stats()
+    
+    def configure_ocr_cache(self, max_entries=128, ttl=60.0):
+        """
+        设置OCR结果缓存
+        
+        Args:
+            max_entries: 最大缓存条目数，0表示禁用
+            ttl: 条目过期时间（秒）
+        """
+        ocr_cache.configure(max_entries, ttl)
+        logger.info(f"OCR缓存设置为 {max_entries} 条，过期时间 {ttl} 秒")
+    
+    def get_ocr_cache_stats(self):
+        """
+        获取OCR缓存的命中/未命中/过期/淘汰统计
+        
+        Returns:
+            统计信息字典
+        """
+        return ocr_cache.stats()
+    
+    def configure_change_detection(self, enabled=True):
+        """
+        设置帧变化检测：画面未变化时直接返回上次的识别结果
+        
+        Args:
+            enabled: 是否启用
+        """
+        result_cache.enabled = bool(enabled)
+        if not enabled:
+            result_cache.clear()
+    
+    def get_change_detection_stats(self):
+        """
+        获取因画面未变化而跳过的匹配次数与实际执行次数
+        
+        Returns:
+            统计信息字典
+        """
+        return result_cache.stats()
+    
+    def match_template(self, screenshot, template, match_mode=MATCH_MODE_NORMAL):
+        """
+        在图像中匹配模板
+        
+        Args:
+            screenshot: 被搜索的BGR图像
+            template: 模板图像（不大于screenshot）
+            match_mode: "normal" 全分辨率匹配，"pyramid" 金字塔由粗到精匹配
+            
+        Returns:
+            (score, (x, y)) 最佳匹配的 TM_CCOEFF_NORMED 得分和左上角坐标
+        """
+        if match_mode == MATCH_MODE_PYRAMID:
+            return self._match_template_pyramid(screenshot, template)
+        
+        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+    
+    def _match_template_pyramid(self, screenshot, template):
+        """
+        金字塔匹配：先在缩小的截图和模板上粗匹配，再只在前几个候选位置附近
+        做全分辨率匹配。返回的得分与坐标都来自全分辨率结果。
+        """
+        frame_h, frame_w = screenshot.shape[:2]
+        template_h, template_w = template.shape[:2]
+        
+        # 选择缩放倍数，保证缩小后的模板仍有足够细节
+        scale = 1
+        for _ in range(PYRAMID_MAX_LEVELS):
+            if min(template_h, template_w) // (scale * 2) < PYRAMID_MIN_TEMPLATE_SIZE:
+                break
+            scale *= 2
+        if scale == 1:
+            return self.match_template(screenshot, template)
+        
+        small_frame = cv2.resize(screenshot, (frame_w // scale, frame_h // scale), interpolation=cv2.INTER_AREA)
+        small_template = cv2.resize(template, (template_w // scale, template_h // scale), interpolation=cv2.INTER_AREA)
+        coarse = cv2.matchTemplate(small_frame, small_template, cv2.TM_CCOEFF_NORMED)
+        
+        small_h, small_w = small_template.shape[:2]
+        margin = scale * 2
+        best_score, best_loc = -1.0, (0, 0)
+        for _ in range(PYRAMID_CANDIDATES):
+            _, coarse_val, _, (coarse_x, coarse_y) = cv2.minMaxLoc(coarse)
+            if coarse_val <= -1.0:
+                break
+            
+            # 在候选位置附近做全分辨率复核
+            x1 = max(coarse_x * scale - margin, 0)
+            y1 = max(coarse_y * scale - margin, 0)
+            x2 = min(coarse_x * scale + template_w + margin, frame_w)
+            y2 = min(coarse_y * scale + template_h + margin, frame_h)
+            if x2 - x1 >= template_w and y2 - y1 >= template_h:
+                fine = cv2.matchTemplate(screenshot[y1:y2, x1:x2], template, cv2.TM_CCOEFF_NORMED)
+                _, fine_val, _, (fine_x, fine_y) = cv2.minMaxLoc(fine)
+                if fine_val > best_score:
+                    best_score, best_loc = fine_val, (x1 + fine_x, y1 + fine_y)
+            
+            # 抑制该候选周围，下一轮取次优位置
+            coarse[max(coarse_y - small_h // 2, 0):coarse_y + small_h // 2 + 1,
+                   max(coarse_x - small_w // 2, 0):coarse_x + small_w // 2 + 1] = -1.0
+        
+        return best_score, best_loc
+    
+    def find_image(self, template_path, threshold=0.8, region=None, match_mode=MATCH_MODE_NORMAL,
+                   change_detection=False):
+        """
+        在屏幕上寻找指定图像
+        
+        Args:
+            template_path: 模板图像路径
+            threshold: 匹配阈值
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            match_mode: "normal" 全分辨率匹配，"pyramid" 金字塔匹配（大屏幕上更快）
+            change_detection: 轮询调用时启用，搜索区域与上次检查相同时直接返回上次结果
+            
+        Returns:
+            (x, y) 匹配位置坐标，未找到返回None
+        """
+        # 获取屏幕截图（同一刷新周期内共享）
+        try:
+            screenshot, offset = frame_provider.get_frame(region)
+        except Exception as e:
+            logger.error(f"图像匹配失败: {e}")
+            return None
+        fingerprint = frame_fingerprint(screenshot) if change_detection else None
+        return self._find_image_in_frame(screenshot, offset, template_path, threshold, match_mode, fingerprint)
+    
+    def _find_image_in_frame(self, screenshot, offset, template_path, threshold=0.8, match_mode=MATCH_MODE_NORMAL,
+                             fingerprint=None):
+        """
+        在已截取的帧中寻找图像
+        
+        Args:
+            fingerprint: 帧指纹，给出时先查识别结果缓存（仅轮询时使用）
+        """
+        try:
+            # 加载模板图像
+            template = self.load_template(template_path)
+            if template is None:
+                logger.error(f"无法加载模板图像: {template_path}")
+                return None
+            
+            # 搜索区域与上次检查完全相同时复用上次结果
+            if fingerprint is not None:
+                cache_key = ("find_image", os.path.abspath(template_path), _file_stamp(template_path),
+                             threshold, match_mode, offset)
+                cached, position = result_cache.lookup(cache_key, fingerprint)
+                if cached:
+                    return position
+            
+            # 模板匹配
+            position, max_val = self._locate_template(screenshot, offset, template, threshold, match_mode, template_path)
+            if fingerprint is not None:
+                result_cache.store(cache_key, fingerprint, position)
+            
+            if position:
+                logger.info(f"找到图像匹配，位置: {position}，匹配度: {max_val:.2f}")
+                return position
+            else:
+                logger.info("未找到匹配的图像")
+                return None
+                
+        except Exception as e:
+            logger.error(f"图像匹配失败: {e}")
+            return None
+    
+    def _locate_template(self, screenshot, offset, template, threshold, match_mode=MATCH_MODE_NORMAL, memory_key=None):
+        """
+        在已截取的帧中定位模板
+        
+        Args:
+            screenshot: BGR帧
+            offset: 帧左上角的屏幕坐标 (x, y)
+            template: 模板图像
+            threshold: 匹配阈值
+            match_mode: 匹配模式
+            memory_key: 命中位置记忆的键（模板路径），None表示不使用局部搜索
+            
+        Returns:
+            (center, score)，center为屏幕中心坐标，低于阈值时为None
+        """
+        h, w = template.shape[:2]
+        if screenshot.shape[0] < h or screenshot.shape[1] < w:
+            return None, 0.0
+        
+        # 先在上次命中位置附近搜索
+        if memory_key is not None:
+            last = hit_memory.get(memory_key)
+            if last is not None:
+                score, loc = self._match_near(screenshot, template, last[0] - offset[0], last[1] - offset[1])
+                hit_memory.record(score >= threshold)
+                if score >= threshold:
+                    x, y = loc
+                    return (offset[0] + x + w // 2, offset[1] + y + h // 2), score
+        
+        score, (x, y) = self.match_template(screenshot, template, match_mode)
+        if score < threshold:
+            return None, score
+        if memory_key is not None:
+            hit_memory.remember(memory_key, (offset[0] + x, offset[1] + y))
+        return (offset[0] + x + w // 2, offset[1] + y + h // 2), score
+    
+    def _match_near(self, screenshot, template, x, y):
+        """
+        只在帧内 (x, y) 附近的小窗口里匹配模板
+        
+        Args:
+            x, y: 期望的模板左上角（帧坐标）
+            
+        Returns:
+            (score, (x, y))，窗口落在帧外时得分为-1
+        """
+        h, w = template.shape[:2]
+        frame_h, frame_w = screenshot.shape[:2]
+        margin = hit_memory.margin
+        x1, y1 = max(x - margin, 0), max(y - margin, 0)
+        x2, y2 = min(x + w + margin, frame_w), min(y + h + margin, frame_h)
+        if x2 - x1 < w or y2 - y1 < h:
+            return -1.0, (0, 0)
+        
+        result = cv2.matchTemplate(screenshot[y1:y2, x1:x2], template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, (local_x, local_y) = cv2.minMaxLoc(result)
+        return max_val, (x1 + local_x, y1 + local_y)
+    
+    def find_images(self, template_paths, threshold=0.8, region=None, match_mode=MATCH_MODE_NORMAL):
+        """
+        在同一张截图上批量查找多个模板
+        
+        只截图和转换一次，各模板在线程池中并行匹配。
+        
+        Args:
+            template_paths: 模板图像路径列表
+            threshold: 匹配阈值
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            match_mode: 匹配模式
+            
+        Returns:
+            {模板路径: (x, y) 或 None}，顺序与 template_paths 一致
+        """
+        template_paths = list(template_paths)
+        results = {path: None for path in template_paths}
+        if not template_paths:
+            return results
+        
+        try:
+            screenshot, offset = frame_provider.get_frame(region)
+            
+            def match_one(template_path):
+                template = self.load_template(template_path)
+                if template is None:
+                    logger.error(f"无法加载模板图像: {template_path}")
+                    return None
+                position, _ = self._locate_template(screenshot, offset, template, threshold, match_mode, template_path)
+                return position
+            
+            positions = get_match_executor().map(match_one, template_paths)
+            for template_path, position in zip(template_paths, positions):
+                results[template_path] = position
+            
+            found = sum(1 for position in results.values() if position)
+            logger.info(f"批量查找 {len(template_paths)} 个图像，找到 {found} 个")
         except Exception as e:
-            logger.error(f"图像识别模块初始化失败: {e}")
+            logger.error(f"批量图像匹配失败: {e}")
+        
+        return results
     
-    def find_image(self, template_path, threshold=0.8):
+    def find_all_images(self, template_path, threshold=0.8, region=None, max_count=100, sort=SORT_BY_SCORE):
         """
-        在屏幕上寻找指定图像
+        在屏幕上寻找模板的所有出现位置
+        
+        对整张响应图做一次匹配，再用非极大值抑制去掉同一目标的重复命中。
+        返回的是列表，遍历它不会重新截图或匹配。
         
         Args:
             template_path: 模板图像路径
             threshold: 匹配阈值
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            max_count: 最大返回数量
+            sort: "score" 按匹配度排序，"reading" 按从上到下、从左到右排序
             
         Returns:
-            (x, y) 匹配位置坐标，未找到返回None
+            [(x, y), ...] 各目标的中心坐标列表
         """
         try:
-            # 加载模板图像
-            template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+            template = self.load_template(template_path)
             if template is None:
                 logger.error(f"无法加载模板图像: {template_path}")
-                return None
+                return []
             
-            # 获取屏幕截图
-            import pyautogui
-            screenshot = pyautogui.screenshot()
-            screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            screenshot, (offset_x, offset_y) = frame_provider.get_frame(region)
+            h, w = template.shape[:2]
+            if screenshot.shape[0] < h or screenshot.shape[1] < w:
+                logger.info("搜索区域小于模板，未找到匹配的图像")
+                return []
             
-            # 模板匹配
             result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+            peaks = self._suppress_peaks(result, threshold, w, h, max_count)
             
-            # 找到匹配位置
-            locations = np.where(result >= threshold)
+            if sort == SORT_BY_READING:
+                peaks = self._sort_reading_order(peaks, h)
             
-            if len(locations[0]) > 0:
-                # 取第一个匹配位置
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                x, y = max_loc
-                h, w = template.shape[:2]
-                
-                # 返回中心点坐标
-                center_x = x + w // 2
-                center_y = y + h // 2
-                
-                logger.info(f"找到图像匹配，位置: ({center_x}, {center_y})，匹配度: {max_val:.2f}")
-                return (center_x, center_y)
+            positions = [(offset_x + x + w // 2, offset_y + y + h // 2) for _, (x, y) in peaks]
+            logger.info(f"找到 {len(positions)} 个图像匹配: {template_path}")
+            return positions
+            
+        except Exception as e:
+            logger.error(f"多目标图像匹配失败: {e}")
+            return []
+    
+    def _suppress_peaks(self, result, threshold, width, height, max_count):
+        """
+        对匹配响应图做非极大值抑制
+        
+        先用3x3膨胀找出高于阈值的局部极大值，再按得分从高到低贪心保留，
+        与已保留命中距离过近的候选被丢弃。
+        
+        Returns:
+            [(score, (x, y)), ...] 按得分从高到低，坐标为模板左上角
+        """
+        if max_count <= 0:
+            return []
+        
+        local_max = cv2.dilate(result, np.ones((3, 3), np.uint8))
+        ys, xs = np.nonzero((result >= threshold) & (result >= local_max))
+        if len(xs) == 0:
+            return []
+        
+        scores = result[ys, xs]
+        limit = max_count * NMS_CANDIDATE_FACTOR
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+            xs, ys, scores = xs[top], ys[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        
+        min_dx = max(int(width * NMS_OVERLAP), 1)
+        min_dy = max(int(height * NMS_OVERLAP), 1)
+        kept_x = np.empty(max_count, dtype=np.int64)
+        kept_y = np.empty(max_count, dtype=np.int64)
+        peaks = []
+        for index in order:
+            x, y = int(xs[index]), int(ys[index])
+            count = len(peaks)
+            if count and np.any((np.abs(kept_x[:count] - x) < min_dx) & (np.abs(kept_y[:count] - y) < min_dy)):
+                continue
+            kept_x[count], kept_y[count] = x, y
+            peaks.append((float(scores[index]), (x, y)))
+            if len(peaks) >= max_count:
+                break
+        return peaks
+    
+    def _sort_reading_order(self, peaks, height):
+        """按阅读顺序排序：纵向相差不超过半个模板高度的命中视为同一行"""
+        rows = []
+        for peak in sorted(peaks, key=lambda p: p[1][1]):
+            if rows and peak[1][1] - rows[-1][0][1][1] <= height // 2:
+                rows[-1].append(peak)
             else:
-                logger.info("未找到匹配的图像")
+                rows.append([peak])
+        return [peak for row in rows for peak in sorted(row, key=lambda p: p[1][0])]
+    
+    def wait_for_image(self, template_path, timeout=10.0, threshold=0.8, region=None,
+                       match_mode=MATCH_MODE_NORMAL, on_poll=None):
+        """
+        等待图像出现
+        
+        Args:
+            template_path: 模板图像路径
+            timeout: 超时时间（秒）
+            threshold: 匹配阈值
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            match_mode: 匹配模式
+            on_poll: 每次检查前调用的函数（如脚本的暂停/停止检查）
+            
+        Returns:
+            (x, y) 匹配位置坐标，超时返回None
+        """
+        return self._wait_until(
+            lambda frame, offset: self._find_image_in_frame(frame, offset, template_path, threshold, match_mode),
+            timeout, region, f"图像 {template_path}", on_poll
+        )
+    
+    def wait_for_color(self, color, timeout=10.0, tolerance=10, region=None, on_poll=None):
+        """
+        等待颜色出现
+        
+        Args:
+            color: 目标颜色 (RGB元组或十六进制字符串)
+            timeout: 超时时间（秒）
+            tolerance: 颜色容差 (0-255)
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            on_poll: 每次检查前调用的函数
+            
+        Returns:
+            (x, y) 颜色位置坐标，超时返回None
+        """
+        return self._wait_until(
+            lambda frame, offset: self._find_color_in_frame(frame, offset, color, tolerance),
+            timeout, region, f"颜色 {color}", on_poll
+        )
+    
+    def wait_for_text(self, target_text, timeout=10.0, threshold=0.8, region=None, on_poll=None,
+                      preset=OCR_DEFAULT_PRESET):
+        """
+        等待文字出现
+        
+        Args:
+            target_text: 目标文字
+            timeout: 超时时间（秒）
+            threshold: 匹配阈值
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            on_poll: 每次检查前调用的函数
+            preset: OCR预处理预设，见 OCR_PRESETS
+            
+        Returns:
+            (x, y) 文字位置坐标，超时返回None
+        """
+        return self._wait_until(
+            lambda frame, offset: self._find_text_in_frame(frame, offset, target_text, threshold, preset=preset),
+            timeout, region, f"文字 {target_text}", on_poll
+        )
+    
+    def _wait_until(self, check, timeout, region, description, on_poll=None):
+        """
+        轮询直到check返回非空结果或超时
+        
+        每次检查截取一帧，以 check(frame, offset) 调用（不经过识别结果缓存）。
+        搜索区域与上次检查的画面逐像素相同时跳过检查，轮询间隔按WAIT_BACKOFF放大到
+        WAIT_MAX_INTERVAL，画面一变化就重新检查并恢复到WAIT_MIN_INTERVAL。
+        """
+        start = time.perf_counter()
+        deadline = start + max(0.0, float(timeout))
+        interval = WAIT_MIN_INTERVAL
+        last_frame = None  # 上次检查过（未找到目标）的画面副本
+        polls = 0
+        
+        while True:
+            if on_poll is not None:
+                on_poll()
+            
+            frame_provider.invalidate()
+            try:
+                frame, offset = frame_provider.get_frame(region)
+            except Exception as e:
+                logger.error(f"等待{description}时截图失败: {e}")
+                frame = None
+            unchanged = frame is not None and last_frame is not None and np.array_equal(frame, last_frame)
+            result = None
+            if frame is not None and not unchanged:
+                result = check(frame, offset)
+                polls += 1
+            if result:
+                logger.info(f"等待{description}成功，用时 {time.perf_counter() - start:.2f} 秒，检查 {polls} 次")
+                return result
+            
+            now = time.perf_counter()
+            if now >= deadline:
+                logger.info(f"等待{description}超时（{timeout} 秒，检查 {polls} 次）")
                 return None
-                
-        except Exception as e:
-            logger.error(f"图像匹配失败: {e}")
-            return None
+            
+            if unchanged:
+                interval = min(interval * WAIT_BACKOFF, WAIT_MAX_INTERVAL)
+            else:
+                interval = WAIT_MIN_INTERVAL
+                last_frame = frame.copy() if frame is not None else None
+            
+            time.sleep(min(interval, deadline - now))
     
-    def find_text(self, target_text, font=None, size=None, color=None, threshold=0.8):
+    def find_text(self, target_text, font=None, size=None, color=None, threshold=0.8, region=None, lang=None,
+                  preset=OCR_DEFAULT_PRESET, change_detection=False):
         """
         在屏幕上寻找指定文字
         
+        按Tesseract的逐词结果在每一行内查找目标文字（忽略空白，可跨多个词），
+        找不到完全匹配时取相似度不低于threshold的最佳片段。
+        
         Args:
             target_text: 目标文字
             font: 字体
             size: 字体大小
             color: 文字颜色
-            threshold: 匹配阈值
+            threshold: 相似度阈值，1表示必须完全匹配
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            lang: Tesseract语言，如 "chi_sim+eng"，None表示默认语言
+            preset: OCR预处理预设，见 OCR_PRESETS
+            change_detection: 轮询调用时启用，搜索区域与上次检查相同时直接返回上次结果
             
         Returns:
-            (x, y) 文字位置坐标，未找到返回None
+            (x, y) 匹配文字的中心坐标，未找到返回None
+        """
+        # 获取屏幕截图（同一刷新周期内共享）
+        try:
+            frame, offset = frame_provider.get_frame(region)
+        except Exception as e:
+            logger.error(f"文字识别失败: {e}")
+            return None
+        fingerprint = frame_fingerprint(frame) if change_detection and frame.size else None
+        return self._find_text_in_frame(frame, offset, target_text, threshold, lang, preset, fingerprint)
+    
+    def _find_text_in_frame(self, frame, offset, target_text, threshold=0.8, lang=None, preset=OCR_DEFAULT_PRESET,
+                            fingerprint=None):
+        """
+        在已截取的帧中寻找文字
+        
+        Args:
+            fingerprint: 帧指纹，给出时先查识别结果缓存（仅轮询时使用）
         """
         try:
-            # 获取屏幕截图
-            import pyautogui
-            screenshot = pyautogui.screenshot()
-            screenshot = np.array(screenshot)
+            if frame.size == 0:
+                logger.info(f"搜索区域为空，未找到文字: {target_text}")
+                return None
+            
+            # 搜索区域与上次检查完全相同时复用上次结果
+            if fingerprint is not None:
+                cache_key = ("find_text", target_text, threshold, lang, str(preset), offset)
+                cached, position = result_cache.lookup(cache_key, fingerprint)
+                if cached:
+                    return position
             
-            # 文字识别
-            text = pytesseract.image_to_string(screenshot)
+            # 文字识别（预处理后在OCR进程池中执行）
+            words = self._ocr_frame(frame, lang, preset)
+            position = self._locate_text(words, target_text, threshold)
             
-            if target_text in text:
-                logger.info(f"找到文字: {target_text}")
-                return (100, 100)  # 临时返回固定位置
+            if position:
+                position = (position[0] + offset[0], position[1] + offset[1])
+                logger.info(f"找到文字: {target_text}，位置: {position}")
             else:
                 logger.info(f"未找到文字: {target_text}")
-                return None
+            if fingerprint is not None:
+                result_cache.store(cache_key, fingerprint, position)
+            return position
                 
         except Exception as e:
             logger.error(f"文字识别失败: {e}")
             return None
     
+    def read_text(self, region=None, lang=None, preset=OCR_DEFAULT_PRESET):
+        """
+        识别区域内的所有文字
+        
+        Args:
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            lang: Tesseract语言，None表示默认语言
+            preset: OCR预处理预设，见 OCR_PRESETS
+            
+        Returns:
+            [{"text", "left", "top", "width", "height", "conf", "line"}, ...]，坐标为屏幕坐标
+        """
+        try:
+            frame, (offset_x, offset_y) = frame_provider.get_frame(region)
+            if frame.size == 0:
+                return []
+            words = self._ocr_frame(frame, lang, preset)
+            for word in words:
+                word["left"] += offset_x
+                word["top"] += offset_y
+            return words
+        except Exception as e:
+            logger.error(f"文字识别失败: {e}")
+            return []
+    
+    def _ocr_frame(self, frame, lang=None, preset=OCR_DEFAULT_PRESET):
+        """
+        预处理并识别BGR帧，返回的词坐标已换算回帧坐标
+        """
+        image, scale, config = preprocess_for_ocr(frame, preset)
+        words = ocr_words(image, lang, config)
+        if scale != 1.0:
+            for word in words:
+                word["left"] = int(word["left"] / scale)
+                word["top"] = int(word["top"] / scale)
+                word["width"] = int(round(word["width"] / scale))
+                word["height"] = int(round(word["height"] / scale))
+        return words
+    
+    def _locate_text(self, words, target_text, threshold=0.8):
+        """
+        在OCR逐词结果中定位目标文字
+        
+        Returns:
+            匹配片段包围盒的中心 (x, y)（与words同一坐标系），未找到返回None
+        """
+        target = "".join(target_text.split())
+        if not target:
+            return None
+        
+        lines = OrderedDict()
+        for word in words:
+            lines.setdefault(word["line"], []).append(word)
+        
+        # 行内完全匹配，目标可以跨越多个词
+        for line_words in lines.values():
+            line_text = ""
+            spans = []
+            for word in line_words:
+                spans.append((len(line_text), len(line_text) + len(word["text"])))
+                line_text += word["text"]
+            start = line_text.find(target)
+            if start >= 0:
+                end = start + len(target)
+                covered = [word for word, (a, b) in zip(line_words, spans) if b > start and a < end]
+                return self._words_center(covered)
+        
+        if threshold >= 1.0:
+            return None
+        
+        # 模糊匹配：在每行的连续词片段中取与目标最相似的一段
+        best_ratio, best_words = threshold, None
+        target_lower = target.lower()
+        for line_words in lines.values():
+            for i in range(len(line_words)):
+                candidate = ""
+                for j in range(i, len(line_words)):
+                    candidate += line_words[j]["text"].lower()
+                    if len(candidate) > len(target) * 2:
+                        break
+                    ratio = SequenceMatcher(None, candidate, target_lower).ratio()
+                    if ratio >= best_ratio:
+                        best_ratio, best_words = ratio, line_words[i:j + 1]
+        
+        if best_words:
+            logger.info(f"文字模糊匹配，相似度: {best_ratio:.2f}")
+            return self._words_center(best_words)
+        return None
+    
+    def _words_center(self, words):
+        """多个词的合并包围盒中心"""
+        left = min(word["left"] for word in words)
+        top = min(word["top"] for word in words)
+        right = max(word["left"] + word["width"] for word in words)
+        bottom = max(word["top"] + word["height"] for word in words)
+        return ((left + right) // 2, (top + bottom) // 2)
+    
     def image_match(self, image1_path, image2_path, threshold=0.8):
         """
         比较两张图像的相似度
@@ -129,41 +1245,87 @@ class ImageRecognition:
             相似度值 [0, 1]，超过阈值返回True
         """
         try:
-            # 读取图像
-            img1 = cv2.imread(image1_path, cv2.IMREAD_GRAYSCALE)
-            img2 = cv2.imread(image2_path, cv2.IMREAD_GRAYSCALE)
+            # 读取特征（按路径和修改时间缓存）
+            features1 = feature_cache.get(image1_path)
+            features2 = feature_cache.get(image2_path)
             
-            if img1 is None or img2 is None:
+            if features1 is None or features2 is None:
                 logger.error("无法读取图像文件")
                 return False
             
-            # 调整图像大小
-            img1 = cv2.resize(img1, (300, 300))
-            img2 = cv2.resize(img2, (300, 300))
-            
-            # 计算相似度
-            orb = cv2.ORB_create()
-            kp1, des1 = orb.detectAndCompute(img1, None)
-            kp2, des2 = orb.detectAndCompute(img2, None)
-            
-            bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
-            matches = bf.match(des1, des2)
-            
-            # 计算匹配率
-            if len(kp1) > 0 and len(kp2) > 0:
-                similarity = len(matches) / max(len(kp1), len(kp2))
-                logger.info(f"图像相似度: {similarity:.2f}")
-                
-                return similarity >= threshold
-            else:
+            similarity = self._feature_similarity(features1, features2)
+            if similarity is None:
                 logger.warning("图像特征提取失败")
                 return False
+            
+            logger.info(f"图像相似度: {similarity:.2f}")
+            return similarity >= threshold
                 
         except Exception as e:
             logger.error(f"图像相似度计算失败: {e}")
             return False
     
-    def find_color(self, color, tolerance=10, region=None):
+    def image_match_many(self, query, references):
+        """
+        将一张图像与一组参考图像比较，按相似度从高到低排序
+        
+        Args:
+            query: 查询图像路径，或BGR/灰度图像数组（如截图的一部分）
+            references: 参考图像路径列表
+            
+        Returns:
+            [(参考图像路径, 相似度), ...]，无法读取或没有特征的参考图像相似度为0
+        """
+        try:
+            if isinstance(query, np.ndarray):
+                query_features = compute_orb_features(query)
+            else:
+                query_features = feature_cache.get(query)
+            if query_features is None:
+                logger.error(f"无法读取查询图像: {query}")
+                return [(path, 0.0) for path in references]
+            
+            ranking = []
+            for path in references:
+                features = feature_cache.get(path)
+                similarity = self._feature_similarity(query_features, features) if features else None
+                ranking.append((path, similarity or 0.0))
+            ranking.sort(key=lambda item: item[1], reverse=True)
+            
+            if ranking:
+                logger.info(f"比较 {len(ranking)} 张参考图像，最相似: {ranking[0][0]} ({ranking[0][1]:.2f})")
+            return ranking
+            
+        except Exception as e:
+            logger.error(f"批量图像相似度计算失败: {e}")
+            return [(path, 0.0) for path in references]
+    
+    def get_feature_cache_stats(self):
+        """
+        获取ORB特征缓存统计
+        
+        Returns:
+            统计信息字典
+        """
+        return feature_cache.stats()
+    
+    def _feature_similarity(self, features1, features2):
+        """
+        根据ORB特征计算相似度
+        
+        Returns:
+            相似度 [0, 1]，任一图像没有可用特征时返回None
+        """
+        count1, des1 = features1
+        count2, des2 = features2
+        if des1 is None or des2 is None or count1 == 0 or count2 == 0:
+            return None
+        
+        bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
+        matches = bf.match(des1, des2)
+        return len(matches) / max(count1, count2)
+    
+    def find_color(self, color, tolerance=10, region=None, change_detection=False):
         """
         在屏幕上寻找指定颜色
         
@@ -172,125 +1334,355 @@ class ImageRecognition:
                    - RGB元组 (R, G, B)，如 (255, 0, 0) 表示红色
                    - 十六进制字符串，如 "#FF0000" 或 "FF0000"
             tolerance: 颜色容差 (0-255)，默认10
-            region: 搜索区域 (x, y, width, height)，None表示全屏
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            change_detection: 轮询调用时启用，搜索区域与上次检查相同时直接返回上次结果
             
         Returns:
             (x, y) 找到的颜色位置坐标，未找到返回None
         """
+        # 获取屏幕截图（BGR格式，同一刷新周期内共享）
+        try:
+            screenshot_np, offset = frame_provider.get_frame(region)
+        except Exception as e:
+            logger.error(f"颜色查找失败: {e}")
+            return None
+        fingerprint = frame_fingerprint(screenshot_np) if change_detection else None
+        return self._find_color_in_frame(screenshot_np, offset, color, tolerance, fingerprint)
+    
+    def _find_color_in_frame(self, screenshot_np, offset, color, tolerance=10, fingerprint=None):
+        """
+        在已截取的帧中寻找颜色
+        
+        Args:
+            fingerprint: 帧指纹，给出时先查识别结果缓存（仅轮询时使用）
+        """
         try:
-            import pyautogui
-            
             # 解析颜色
-            if isinstance(color, str):
-                # 十六进制颜色
-                color = color.lstrip('#')
-                if len(color) == 6:
-                    r = int(color[0:2], 16)
-                    g = int(color[2:4], 16)
-                    b = int(color[4:6], 16)
-                    target_color = (r, g, b)
-                else:
-                    logger.error(f"无效的颜色格式: {color}")
-                    return None
-            elif isinstance(color, (tuple, list)) and len(color) == 3:
-                target_color = tuple(color)
-            else:
+            target_color = self._parse_color(color)
+            if target_color is None:
                 logger.error(f"无效的颜色格式: {color}")
                 return None
             
-            # 获取屏幕截图
-            if region:
-                screenshot = pyautogui.screenshot(region=region)
-                offset_x, offset_y = region[0], region[1]
-            else:
-                screenshot = pyautogui.screenshot()
-                offset_x, offset_y = 0, 0
-            
-            # 转换为numpy数组 (RGB格式)
-            screenshot_np = np.array(screenshot)
+            offset_x, offset_y = offset
             
-            # 计算颜色差异
-            r_diff = np.abs(screenshot_np[:, :, 0].astype(np.int16) - target_color[0])
-            g_diff = np.abs(screenshot_np[:, :, 1].astype(np.int16) - target_color[1])
-            b_diff = np.abs(screenshot_np[:, :, 2].astype(np.int16) - target_color[2])
+            # 搜索区域与上次检查完全相同时复用上次结果
+            if fingerprint is not None:
+                cache_key = ("find_color", target_color, tolerance, (offset_x, offset_y))
+                cached, position = result_cache.lookup(cache_key, fingerprint)
+                if cached:
+                    return position
             
-            # 找到在容差范围内的像素
-            mask = (r_diff <= tolerance) & (g_diff <= tolerance) & (b_diff <= tolerance)
-            
-            # 找到匹配的位置
-            locations = np.where(mask)
-            
-            if len(locations[0]) > 0:
-                # 返回第一个匹配位置
-                y, x = locations[0][0], locations[1][0]
+            position = self._scan_color(screenshot_np, target_color, tolerance, offset_x, offset_y)
+            if fingerprint is not None:
+                result_cache.store(cache_key, fingerprint, position)
+            return position
+                
+        except Exception as e:
+            logger.error(f"颜色查找失败: {e}")
+            return None
+    
+    def _scan_color(self, screenshot_np, target_color, tolerance, offset_x, offset_y):
+        """
+        在BGR帧中查找第一个在容差范围内的像素（按行优先顺序）
+        
+        按 COLOR_SCAN_TILE_ROWS 行分块，用 cv2.inRange 直接在uint8上做逐通道容差判断，
+        第一个含有匹配像素的块即为答案所在，后面的块不再扫描。
+        
+        Returns:
+            屏幕坐标 (x, y)，未找到返回None
+        """
+        lower, upper = self._color_bounds(target_color, tolerance)
+        height = screenshot_np.shape[0] if screenshot_np.size and tolerance >= 0 else 0
+        
+        for top in range(0, height, COLOR_SCAN_TILE_ROWS):
+            mask = cv2.inRange(screenshot_np[top:top + COLOR_SCAN_TILE_ROWS], lower, upper)
+            if cv2.countNonZero(mask):
+                # 掩码按行存储，argmax返回第一个非零元素
+                y, x = divmod(int(np.argmax(mask)), mask.shape[1])
                 result_x = x + offset_x
-                result_y = y + offset_y
+                result_y = top + y + offset_y
                 
                 logger.info(f"找到颜色 RGB{target_color}，位置: ({result_x}, {result_y})")
                 return (result_x, result_y)
-            else:
-                logger.info(f"未找到颜色 RGB{target_color}")
+        
+        logger.info(f"未找到颜色 RGB{target_color}")
+        return None
+    
+    def find_colors(self, palette, tolerance=10, region=None, find_all=False, max_count=100):
+        """
+        在一次扫描中查找调色板里的多种颜色
+        
+        每个通道预先构建256项查找表，表项是"该通道取值落在哪些颜色容差范围内"的位掩码，
+        三个通道的查表结果按位与即得到每个像素命中的颜色集合。整个调色板只截图一次、扫描一遍。
+        
+        Args:
+            palette: 颜色列表，每项为RGB元组或十六进制字符串
+            tolerance: 颜色容差 (0-255)
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            find_all: False时每种颜色返回第一个位置，True时返回位置列表
+            max_count: find_all时每种颜色的最大返回数量
+            
+        Returns:
+            {颜色: (x, y) 或 None}，find_all时为 {颜色: [(x, y), ...]}，顺序与palette一致
+        """
+        keys = [tuple(color) if isinstance(color, list) else color for color in palette]
+        results = {key: ([] if find_all else None) for key in keys}
+        
+        try:
+            targets = []
+            for key in keys:
+                target_color = self._parse_color(key)
+                if target_color is None:
+                    logger.error(f"无效的颜色格式: {key}")
+                    continue
+                targets.append((key, target_color))
+            if not targets or tolerance < 0:
+                return results
+            
+            screenshot_np, (offset_x, offset_y) = frame_provider.get_frame(region)
+            if screenshot_np.size == 0:
+                return results
+            
+            # 每组最多32种颜色，对应uint32位掩码的32位
+            for start in range(0, len(targets), 32):
+                group = targets[start:start + 32]
+                self._scan_palette(screenshot_np, group, tolerance, offset_x, offset_y,
+                                   results, find_all, max_count)
+            
+            found = sum(1 for value in results.values() if value)
+            logger.info(f"查找 {len(targets)} 种颜色，找到 {found} 种")
+        except Exception as e:
+            logger.error(f"多颜色查找失败: {e}")
+        
+        return results
+    
+    def _scan_palette(self, screenshot_np, group, tolerance, offset_x, offset_y, results, find_all, max_count):
+        """按行分块扫描一组（不超过32种）颜色，结果写入results"""
+        luts = np.zeros((3, 256), dtype=np.uint32)
+        for bit, (_, target_color) in enumerate(group):
+            lower, upper = self._color_bounds(target_color, tolerance)
+            for channel in range(3):
+                luts[channel, lower[channel]:int(upper[channel]) + 1] |= np.uint32(1 << bit)
+        
+        pending = set(range(len(group)))
+        height, width = screenshot_np.shape[:2]
+        for top in range(0, height, COLOR_SCAN_TILE_ROWS):
+            tile = screenshot_np[top:top + COLOR_SCAN_TILE_ROWS]
+            combined = luts[0][tile[:, :, 0]] & luts[1][tile[:, :, 1]] & luts[2][tile[:, :, 2]]
+            hit_indices = np.flatnonzero(combined)
+            if len(hit_indices) == 0:
+                continue
+            
+            hit_values = combined.ravel()[hit_indices]
+            for bit in list(pending):
+                matched = hit_indices[(hit_values & np.uint32(1 << bit)) != 0]
+                if len(matched) == 0:
+                    continue
+                key = group[bit][0]
+                if find_all:
+                    for index in matched[:max_count - len(results[key])]:
+                        y, x = divmod(int(index), width)
+                        results[key].append((x + offset_x, top + y + offset_y))
+                    if len(results[key]) >= max_count:
+                        pending.discard(bit)
+                else:
+                    y, x = divmod(int(matched[0]), width)
+                    results[key] = (x + offset_x, top + y + offset_y)
+                    pending.discard(bit)
+            
+            if not pending:
+                break
+    
+    def _parse_color(self, color):
+        """
+        解析颜色参数
+        
+        Args:
+            color: RGB元组/列表或十六进制字符串（可带#）
+            
+        Returns:
+            (r, g, b) 元组，格式无效返回None
+        """
+        if isinstance(color, str):
+            color = color.lstrip('#')
+            if len(color) != 6:
+                return None
+            try:
+                return (int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16))
+            except ValueError:
                 return None
+        if isinstance(color, (tuple, list)) and len(color) == 3:
+            return tuple(int(c) for c in color)
+        return None
+    
+    def _color_bounds(self, target_color, tolerance):
+        """
+        将RGB目标颜色和容差转换为 cv2.inRange 使用的BGR上下界
+        
+        Returns:
+            (lower, upper) uint8数组
+        """
+        bgr = np.array(target_color[::-1], dtype=np.int32)
+        lower = np.clip(bgr - tolerance, 0, 255).astype(np.uint8)
+        upper = np.clip(bgr + tolerance, 0, 255).astype(np.uint8)
+        return lower, upper
+    
+    def find_color_pattern(self, anchor, offsets, region=None, tolerance=10, find_all=False, max_count=100):
+        """
+        多点找色：锚点颜色加若干相对偏移点的颜色共同确定一个界面元素
+        
+        先用 cv2.inRange 找出所有锚点颜色的候选像素，再对每个偏移点一次性从帧数组中
+        取出所有候选对应位置的像素做向量化比较，逐步淘汰候选。
+        
+        Args:
+            anchor: 锚点颜色 (RGB元组或十六进制字符串)
+            offsets: 偏移点列表，每项为 (dx, dy, color) 或 (dx, dy, color, tolerance)，
+                     也可以是包含 dx/dy/color/tolerance 键的字典
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
+            tolerance: 锚点颜色容差，也是偏移点未指定容差时的默认值
+            find_all: False时返回第一个匹配，True时返回所有匹配
+            max_count: find_all时的最大返回数量
+            
+        Returns:
+            锚点的屏幕坐标 (x, y)，未找到返回None；find_all时返回 [(x, y), ...]
+        """
+        not_found = [] if find_all else None
+        try:
+            anchor_color = self._parse_color(anchor)
+            if anchor_color is None:
+                logger.error(f"无效的颜色格式: {anchor}")
+                return not_found
+            
+            points = []
+            for offset in offsets:
+                if isinstance(offset, dict):
+                    dx, dy, color = offset.get("dx", 0), offset.get("dy", 0), offset.get("color")
+                    point_tolerance = offset.get("tolerance", tolerance)
+                else:
+                    dx, dy, color = offset[:3]
+                    point_tolerance = offset[3] if len(offset) > 3 else tolerance
+                target_color = self._parse_color(color)
+                if target_color is None:
+                    logger.error(f"无效的颜色格式: {color}")
+                    return not_found
+                # 帧为BGR格式
+                points.append((int(dx), int(dy), np.array(target_color[::-1], dtype=np.int16), point_tolerance))
+            
+            screenshot_np, (offset_x, offset_y) = frame_provider.get_frame(region)
+            if screenshot_np.size == 0 or tolerance < 0:
+                return not_found
+            
+            lower, upper = self._color_bounds(anchor_color, tolerance)
+            height, width = screenshot_np.shape[:2]
+            results = []
+            
+            for top in range(0, height, COLOR_SCAN_TILE_ROWS):
+                mask = cv2.inRange(screenshot_np[top:top + COLOR_SCAN_TILE_ROWS], lower, upper)
+                if not cv2.countNonZero(mask):
+                    continue
+                
+                # 候选锚点（按行优先顺序）
+                ys, xs = np.nonzero(mask)
+                ys = ys + top
+                for dx, dy, target_bgr, point_tolerance in points:
+                    px, py = xs + dx, ys + dy
+                    inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                    xs, ys, px, py = xs[inside], ys[inside], px[inside], py[inside]
+                    pixels = screenshot_np[py, px].astype(np.int16)
+                    matched = np.all(np.abs(pixels - target_bgr) <= point_tolerance, axis=1)
+                    xs, ys = xs[matched], ys[matched]
+                    if len(xs) == 0:
+                        break
                 
+                for x, y in zip(xs, ys):
+                    results.append((int(x) + offset_x, int(y) + offset_y))
+                    if not find_all or len(results) >= max_count:
+                        break
+                if results and (not find_all or len(results) >= max_count):
+                    break
+            
+            logger.info(f"多点找色 锚点RGB{anchor_color} + {len(points)} 个偏移点，找到 {len(results)} 处")
+            if find_all:
+                return results
+            return results[0] if results else None
+            
         except Exception as e:
-            logger.error(f"颜色查找失败: {e}")
-            return None
+            logger.error(f"多点找色失败: {e}")
+            return not_found
+    
+    def extract_color_pattern(self, image, grid=3, margin=0.15):
+        """
+        从元素截图中提取多点找色特征
+        
+        以图像中心像素为锚点，在 grid x grid 网格（去掉中心点）上取样作为偏移点。
+        
+        Args:
+            image: 元素截图（BGR数组）
+            grid: 每个方向的取样点数
+            margin: 取样点距离图像边缘的比例
+            
+        Returns:
+            (锚点颜色十六进制字符串, [{"dx", "dy", "color"}, ...])
+        """
+        height, width = image.shape[:2]
+        center_x, center_y = width // 2, height // 2
+        
+        def to_hex(pixel):
+            b, g, r = (int(v) for v in pixel[:3])
+            return f"#{r:02X}{g:02X}{b:02X}"
+        
+        xs = np.linspace(width * margin, width * (1 - margin) - 1, grid).round().astype(int)
+        ys = np.linspace(height * margin, height * (1 - margin) - 1, grid).round().astype(int)
+        offsets = []
+        for y in ys:
+            for x in xs:
+                if x == center_x and y == center_y:
+                    continue
+                offsets.append({"dx": int(x - center_x), "dy": int(y - center_y), "color": to_hex(image[y, x])})
+        return to_hex(image[center_y, center_x]), offsets
     
-    def find_all_colors(self, color, tolerance=10, region=None, max_count=100):
+    def find_all_colors(self, color, tolerance=10, region=None, max_count=100, mode="pixels",
+                        min_area=1, max_area=None):
         """
         在屏幕上寻找所有指定颜色的位置
         
         Args:
             color: 目标颜色 (RGB元组或十六进制字符串)
             tolerance: 颜色容差 (0-255)
-            region: 搜索区域 (x, y, width, height)
+            region: 搜索区域 (x, y, width, height)，"window" 表示绑定窗口，None表示全屏
             max_count: 最大返回数量
+            mode: "pixels" 返回匹配像素坐标；"blobs" 返回连通色块
+            min_area: blobs模式下色块的最小像素数
+            max_area: blobs模式下色块的最大像素数，None表示不限制
             
         Returns:
-            [(x, y), ...] 所有找到的位置列表
+            pixels模式: [(x, y), ...] 所有找到的位置列表
+            blobs模式: [{"center": (x, y), "bbox": (x, y, w, h), "area": 像素数}, ...]，
+                       按从上到下、从左到右排序
         """
         try:
-            import pyautogui
-            
             # 解析颜色
-            if isinstance(color, str):
-                color = color.lstrip('#')
-                if len(color) == 6:
-                    r = int(color[0:2], 16)
-                    g = int(color[2:4], 16)
-                    b = int(color[4:6], 16)
-                    target_color = (r, g, b)
-                else:
-                    logger.error(f"无效的颜色格式: {color}")
-                    return []
-            elif isinstance(color, (tuple, list)) and len(color) == 3:
-                target_color = tuple(color)
-            else:
+            target_color = self._parse_color(color)
+            if target_color is None:
                 logger.error(f"无效的颜色格式: {color}")
                 return []
             
-            # 获取屏幕截图
-            if region:
-                screenshot = pyautogui.screenshot(region=region)
-                offset_x, offset_y = region[0], region[1]
-            else:
-                screenshot = pyautogui.screenshot()
-                offset_x, offset_y = 0, 0
-            
-            screenshot_np = np.array(screenshot)
+            # 获取屏幕截图（BGR格式，同一刷新周期内共享）
+            screenshot_np, (offset_x, offset_y) = frame_provider.get_frame(region)
+            if screenshot_np.size == 0 or tolerance < 0:
+                return []
             
-            # 计算颜色差异
-            r_diff = np.abs(screenshot_np[:, :, 0].astype(np.int16) - target_color[0])
-            g_diff = np.abs(screenshot_np[:, :, 1].astype(np.int16) - target_color[1])
-            b_diff = np.abs(screenshot_np[:, :, 2].astype(np.int16) - target_color[2])
+            lower, upper = self._color_bounds(target_color, tolerance)
+            mask = cv2.inRange(screenshot_np, lower, upper)
             
-            mask = (r_diff <= tolerance) & (g_diff <= tolerance) & (b_diff <= tolerance)
-            locations = np.where(mask)
+            if mode == "blobs":
+                results = self._color_blobs(mask, offset_x, offset_y, max_count, min_area, max_area)
+                logger.info(f"找到 {len(results)} 个颜色 RGB{target_color} 的色块")
+                return results
             
-            results = []
-            for i in range(min(len(locations[0]), max_count)):
-                y, x = locations[0][i], locations[1][i]
-                results.append((x + offset_x, y + offset_y))
+            indices = np.flatnonzero(mask)[:max_count]
+            width = mask.shape[1]
+            results = [(int(i % width) + offset_x, int(i // width) + offset_y) for i in indices]
             
             logger.info(f"找到 {len(results)} 个颜色 RGB{target_color} 的位置")
             return results
@@ -298,3 +1690,33 @@ class ImageRecognition:
         except Exception as e:
             logger.error(f"颜色查找失败: {e}")
             return []
+    
+    def _color_blobs(self, mask, offset_x, offset_y, max_count, min_area=1, max_area=None):
+        """
+        对颜色掩码做8连通标记，返回过滤后的色块信息
+        
+        Returns:
+            [{"center": (x, y), "bbox": (x, y, w, h), "area": 像素数}, ...]
+        """
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        
+        # 第0个连通域是背景
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        keep = areas >= min_area
+        if max_area is not None:
+            keep &= areas <= max_area
+        labels = np.flatnonzero(keep) + 1
+        
+        # 按包围盒左上角的阅读顺序排序
+        labels = labels[np.lexsort((stats[labels, cv2.CC_STAT_LEFT], stats[labels, cv2.CC_STAT_TOP]))]
+        
+        blobs = []
+        for label in labels[:max_count]:
+            left, top, width, height, area = (int(v) for v in stats[label])
+            center_x, center_y = centroids[label]
+            blobs.append({
+                "center": (int(round(center_x)) + offset_x, int(round(center_y)) + offset_y),
+                "bbox": (left + offset_x, top + offset_y, width, height),
+                "area": area,
+            })
+        return blobs
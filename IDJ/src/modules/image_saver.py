@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步图像保存模块
+截图的编码（PNG压缩）和写盘放到后台线程执行，界面线程只做一次像素拷贝。
+待保存图像占用的内存有上限，超过上限时提交方等待，避免批量截图时内存无限增长。
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# 压缩选择：fast 编码快、文件较大；small 编码慢、文件最小
+SAVE_FAST = "fast"
+SAVE_SMALL = "small"
+
+# 各压缩选择对应的PNG压缩级别（0-9）
+PNG_COMPRESSION_LEVELS = {SAVE_FAST: 1, SAVE_SMALL: 9}
+
+# 后台保存的线程数与待保存图像的内存上限
+SAVE_MAX_WORKERS = 2
+SAVE_MAX_PENDING_MB = 256
+
+
+def _qt_quality(path, compression):
+    """Qt保存参数：PNG时quality与压缩级别的关系为 level = (100 - quality) * 9 / 91"""
+    if os.path.splitext(path)[1].lower() == ".png":
+        level = PNG_COMPRESSION_LEVELS.get(compression, PNG_COMPRESSION_LEVELS[SAVE_FAST])
+        return 100 - (level * 91 + 8) // 9
+    return -1  # 其他格式使用默认质量
+
+
+def _encode(image, path, compression):
+    """把图像编码为文件内容（在工作线程中执行）"""
+    extension = os.path.splitext(path)[1].lower() or ".png"
+    if hasattr(image, "shape"):
+        import cv2
+        params = []
+        if extension == ".png":
+            params = [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION_LEVELS.get(compression, 1)]
+        ok, encoded = cv2.imencode(extension, image, params)
+        if not ok:
+            raise ValueError(f"图像编码失败: {path}")
+        return encoded.tobytes()
+
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    if not image.save(buffer, extension[1:].upper(), _qt_quality(path, compression)):
+        raise ValueError(f"图像编码失败: {path}")
+    buffer.close()
+    return bytes(data)
+
+
+def _write_durable(path, content):
+    """先写临时文件并落盘，再原子替换为目标文件，读者不会看到写了一半的图像"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _on_gui_thread():
+    """当前线程是否为Qt界面线程（没有QApplication时返回False）"""
+    try:
+        from PyQt5.QtCore import QThread
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return False
+    app = QApplication.instance()
+    return app is not None and QThread.currentThread() == app.thread()
+
+
+class _CallbackRelay:
+    """把保存完成的回调转到Qt界面线程执行"""
+
+    def __init__(self):
+        from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+        from PyQt5.QtWidgets import QApplication
+
+        class Relay(QObject):
+            deliver = pyqtSignal(object, object, object)
+
+            @pyqtSlot(object, object, object)
+            def invoke(self, callback, path, error):
+                _CallbackRelay._invoke(callback, path, error)
+
+        # 接收方归属界面线程，工作线程发出的信号会排队到界面线程执行
+        self._relay = Relay()
+        self._relay.moveToThread(QApplication.instance().thread())
+        self._relay.deliver.connect(self._relay.invoke)
+
+    @staticmethod
+    def _invoke(callback, path, error):
+        try:
+            callback(path, error)
+        except Exception as e:
+            logger.error(f"图像保存回调执行失败: {e}")
+
+    def post(self, callback, path, error):
+        self._relay.deliver.emit(callback, path, error)
+
+
+class ImageSaveQueue:
+    """
+    后台图像保存队列
+
+    submit() 立即返回 Future，文件写入磁盘并落盘后 Future 完成（结果为路径）。
+    待保存图像超过内存上限时，工作线程提交会等待；界面线程提交不等待，
+    改为在当前线程同步保存并记录警告，避免界面冻结。
+    """
+
+    def __init__(self, max_workers=SAVE_MAX_WORKERS, max_pending_mb=SAVE_MAX_PENDING_MB):
+        self.max_pending_bytes = int(max_pending_mb * 1024 * 1024)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="idj-save")
+        self._cond = threading.Condition()
+        self._pending_bytes = 0
+        self._pending = 0
+        self._relay = None
+        self.saved = 0
+        self.failed = 0
+        self.waits = 0  # 因内存上限而等待的次数
+        self.sync_saves = 0  # 因内存上限在界面线程同步保存的次数
+
+    def _callback_relay(self):
+        """界面线程回调中转（没有QApplication时返回None，回调在工作线程执行）"""
+        if self._relay is None:
+            try:
+                from PyQt5.QtWidgets import QApplication
+                if QApplication.instance() is not None:
+                    self._relay = _CallbackRelay()
+            except ImportError:
+                pass
+        return self._relay
+
+    def submit(self, image, path, compression=SAVE_FAST, callback=None):
+        """
+        提交一张图像到后台保存
+
+        Args:
+            image: QPixmap、QImage或BGR图像数组
+            path: 保存路径，扩展名决定格式
+            compression: SAVE_FAST 或 SAVE_SMALL（只影响PNG）
+            callback: 可选，完成后调用 callback(path, error)，error为None表示成功；
+                      有QApplication时在界面线程中调用
+
+        Returns:
+            concurrent.futures.Future，结果为保存路径
+        """
+        # QPixmap只能在界面线程使用，先转为可跨线程的QImage（一次像素拷贝）
+        if hasattr(image, "toImage"):
+            image = image.toImage()
+        size = image.nbytes if hasattr(image, "nbytes") else image.byteCount()
+
+        def work():
+            _write_durable(path, _encode(image, path, compression))
+
+        return self._submit(path, work, size, callback)
+
+    def submit_write(self, path, write, size):
+        """
+        提交自定义的写盘任务（如帧录制的分块），与图像保存共用工作线程和内存上限
+
+        Args:
+            path: 写入的文件路径（用于日志和Future结果）
+            write: 无参数函数，在工作线程中执行编码和写盘
+            size: 任务持有的内存字节数，计入待保存内存上限
+
+        Returns:
+            concurrent.futures.Future，结果为 path
+        """
+        return self._submit(path, write, size)
+
+    def _submit(self, path, work, size, callback=None):
+        """提交写盘任务，callback 同 submit"""
+        if not self._reserve(path, size):
+            # 界面线程超过内存上限：在当前线程同步执行
+            future = Future()
+            try:
+                future.set_result(self._execute(path, work))
+                error = None
+            except Exception as e:
+                future.set_exception(e)
+                error = e
+            if callback is not None:
+                _CallbackRelay._invoke(callback, path, error)
+            return future
+
+        relay = self._callback_relay() if callback is not None else None
+        future = self._executor.submit(self._execute, path, work, size)
+
+        if callback is not None:
+            def on_done(done):
+                error = done.exception()
+                if relay is not None:
+                    relay.post(callback, path, error)
+                else:
+                    _CallbackRelay._invoke(callback, path, error)
+            future.add_done_callback(on_done)
+        return future
+
+    def _reserve(self, path, size):
+        """
+        登记待保存的内存，超过上限时等待其他任务完成
+
+        Returns:
+            是否已登记；界面线程不能等待（否则整个界面冻结），超过上限时返回False，
+            由调用方在当前线程同步执行
+        """
+        with self._cond:
+            if self._pending_bytes + size > self.max_pending_bytes and self._pending:
+                if _on_gui_thread():
+                    self.sync_saves += 1
+                    logger.warning(f"待保存图像超过内存上限（{self.max_pending_bytes // (1024 * 1024)} MB），"
+                                   f"改为同步保存: {path}")
+                    return False
+                self.waits += 1
+                self._cond.wait_for(lambda: self._pending_bytes + size <= self.max_pending_bytes
+                                    or not self._pending)
+            self._pending_bytes += size
+            self._pending += 1
+            return True
+
+    def _execute(self, path, work, size=None):
+        """执行写盘任务并更新统计，size不为None时释放 _reserve 登记的内存"""
+        success = False
+        try:
+            work()
+            success = True
+            logger.debug(f"图像已保存: {path}")
+            return path
+        except Exception as e:
+            logger.error(f"图像保存失败: {path}: {e}")
+            raise
+        finally:
+            with self._cond:
+                if success:
+                    self.saved += 1
+                else:
+                    self.failed += 1
+                if size is not None:
+                    self._pending_bytes -= size
+                    self._pending -= 1
+                    self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        """
+        等待所有已提交的图像保存完成
+
+        Returns:
+            是否全部完成（超时返回False）
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def stats(self):
+        """
+        获取保存队列统计
+
+        Returns:
+            包含 pending/pending_mb/saved/failed/waits/sync_saves 的字典
+        """
+        with self._cond:
+            return {
+                "pending": self._pending,
+                "pending_mb": self._pending_bytes / (1024 * 1024),
+                "saved": self.saved,
+                "failed": self.failed,
+                "waits": self.waits,
+                "sync_saves": self.sync_saves,
+            }
+
+    def shutdown(self, wait=True):
+        """关闭保存队列，wait为True时等待剩余图像写完"""
+        self._executor.shutdown(wait=wait)
+
+
+_image_saver = None
+_image_saver_lock = threading.Lock()
+
+
+def get_image_saver():
+    """获取共享的图像保存队列（首次使用时创建）"""
+    global _image_saver
+    with _image_saver_lock:
+        if _image_saver is None:
+            _image_saver = ImageSaveQueue()
+        return _image_saver
+
+
+def save_image_async(image, path, compression=SAVE_FAST, callback=None):
+    """提交到共享保存队列，参数见 ImageSaveQueue.submit"""
+    return get_image_saver().submit(image, path, compression, callback)
+
+
+def shutdown_image_saver():
+    """等待剩余图像写完并关闭保存队列（程序退出时调用）"""
+    global _image_saver
+    with _image_saver_lock:
+        if _image_saver is not None:
+            _image_saver.shutdown(wait=True)
+            _image_saver = None
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量输入模块
+把连续的点击、按键、输入文本操作编译为一条事件序列后一次性注入，
+事件之间不再经过pyautogui的参数检查、故障保护检查和逐次日志，
+积木指定的间隔和节奏配置的停顿照常保留，并统计实际达到的事件速率。
+文本输入与 KeyboardControl.type_text 使用同一套输入方式（逐字、分块、粘贴）。
+
+用法:
+    batch = InputBatch("turbo")
+    batch.click(100, 200)
+    batch.type("hello", 0.01)
+    batch.press("tab")
+    stats = batch.run()
+"""
+
+import time
+import logging
+
+import pyautogui
+
+from modules.screen_capture import frame_provider
+from modules.keyboard_control import TYPE_CHAR, choose_type_strategy, type_with_strategy
+from modules.timing_profiles import (timing_stats, profile_pause, resolve_timing_profile, disable_pyautogui_pause,
+                                     DEFAULT_TIMING_PROFILE, ACTION_CLICK, ACTION_KEY, ACTION_TYPE, ACTION_HOTKEY)
+
+logger = logging.getLogger(__name__)
+
+# 事件类型
+EVENT_MOVE = "move"
+EVENT_MOUSE_DOWN = "mouse_down"
+EVENT_MOUSE_UP = "mouse_up"
+EVENT_KEY_DOWN = "key_down"
+EVENT_KEY_UP = "key_up"
+EVENT_TEXT = "text"
+EVENT_SLEEP = "sleep"
+
+# pyautogui按键名 -> pynput Key 属性名（未列出的按同名查找，仍找不到的交给pyautogui）
+PYNPUT_KEY_NAMES = {
+    "return": "enter",
+    "escape": "esc",
+    "del": "delete",
+    "pageup": "page_up",
+    "pgup": "page_up",
+    "pagedown": "page_down",
+    "pgdn": "page_down",
+    "capslock": "caps_lock",
+    "numlock": "num_lock",
+    "scrolllock": "scroll_lock",
+    "printscreen": "print_screen",
+    "prtsc": "print_screen",
+    "win": "cmd",
+    "winleft": "cmd_l",
+    "winright": "cmd_r",
+    "command": "cmd",
+    "shiftleft": "shift_l",
+    "shiftright": "shift_r",
+    "ctrlleft": "ctrl_l",
+    "ctrlright": "ctrl_r",
+    "altleft": "alt_l",
+    "altright": "alt_r",
+}
+
+
+class _PynputInjector:
+    """通过pynput直接发送系统输入事件，支持中文等非ASCII字符"""
+
+    name = "pynput"
+
+    def __init__(self):
+        from pynput import mouse, keyboard
+        self._mouse = mouse.Controller()
+        self._keyboard = keyboard.Controller()
+        self._buttons = {"left": mouse.Button.left, "right": mouse.Button.right, "middle": mouse.Button.middle}
+        self._key_class = keyboard.Key
+        self._keys = {}  # 按键名 -> pynput按键（缓存）
+
+    def _key(self, name):
+        """pynput按键，pynput没有对应按键时返回None"""
+        if name not in self._keys:
+            lowered = name.lower()
+            key = getattr(self._key_class, PYNPUT_KEY_NAMES.get(lowered, lowered), None)
+            if key is None and len(name) == 1:
+                key = name
+            self._keys[name] = key
+        return self._keys[name]
+
+    def move(self, x, y):
+        self._mouse.position = (x, y)
+
+    def mouse_down(self, button):
+        self._mouse.press(self._buttons[button])
+
+    def mouse_up(self, button):
+        self._mouse.release(self._buttons[button])
+
+    def key_down(self, key):
+        pynput_key = self._key(key)
+        if pynput_key is None:
+            # num0、volumeup 等pyautogui支持而pynput没有的按键
+            pyautogui.keyDown(key, _pause=False)
+        else:
+            self._keyboard.press(pynput_key)
+
+    def key_up(self, key):
+        pynput_key = self._key(key)
+        if pynput_key is None:
+            pyautogui.keyUp(key, _pause=False)
+        else:
+            self._keyboard.release(pynput_key)
+
+    def text(self, text):
+        self._keyboard.type(text)
+
+
+class _PyAutoGuiInjector:
+    """pynput不可用时使用pyautogui的底层函数，跳过每次调用的停顿和故障保护检查"""
+
+    name = "pyautogui"
+
+    def move(self, x, y):
+        pyautogui.moveTo(x, y, _pause=False)
+
+    def mouse_down(self, button):
+        pyautogui.mouseDown(button=button, _pause=False)
+
+    def mouse_up(self, button):
+        pyautogui.mouseUp(button=button, _pause=False)
+
+    def key_down(self, key):
+        pyautogui.keyDown(key, _pause=False)
+
+    def key_up(self, key):
+        pyautogui.keyUp(key, _pause=False)
+
+    def text(self, text):
+        pyautogui.typewrite(text, _pause=False)
+
+
+_injector = None
+
+
+def get_injector():
+    """获取共享的输入注入器（优先pynput）"""
+    global _injector
+    if _injector is None:
+        try:
+            _injector = _PynputInjector()
+        except Exception as e:
+            logger.warning(f"pynput不可用，批量输入改用pyautogui: {e}")
+            _injector = _PyAutoGuiInjector()
+    return _injector
+
+
+class InputBatch:
+    """
+    批量输入序列
+
+    click/press/type/hotkey/pause 只把操作编译为事件追加到序列中，run() 时才依次注入。
+    每个操作是一步，步与步之间按节奏配置停顿，故障保护（鼠标移到屏幕角落）每步检查一次。
+    与逐个调用控制模块时一样，某一步失败只记录错误，继续执行后续步骤；
+    触发故障保护时中止整个序列并抛出 pyautogui.FailSafeException。
+    """
+
+    def __init__(self, profile=DEFAULT_TIMING_PROFILE, keep_timing=True):
+        """
+        Args:
+            profile: 各步默认的节奏配置
+            keep_timing: 是否保留积木指定的间隔和节奏配置的停顿，False时全部事件连续注入
+        """
+        disable_pyautogui_pause()
+        self.profile = resolve_timing_profile(profile)
+        self.keep_timing = keep_timing
+        self._steps = []  # [(操作类别, 节奏配置, 描述, [事件])]
+        self.last_stats = None
+
+    def __len__(self):
+        """序列中的输入事件数（不含停顿，文本按字符计）"""
+        return sum(self._event_count(event) for _, _, _, events in self._steps for event in events)
+
+    @staticmethod
+    def _event_count(event):
+        """单个事件计入的输入事件数"""
+        if event[0] == EVENT_SLEEP:
+            return 0
+        if event[0] == EVENT_TEXT:
+            return len(event[1])
+        return 1
+
+    def _add(self, action, profile, description, events):
+        profile = resolve_timing_profile(profile) if profile else self.profile
+        self._steps.append((action, profile, description, events))
+        return self
+
+    @staticmethod
+    def _repeat(group, times, interval):
+        """重复一组事件，组与组之间插入间隔"""
+        events = []
+        for i in range(max(0, int(times))):
+            if i and interval > 0:
+                events.append((EVENT_SLEEP, interval))
+            events.extend(group)
+        return events
+
+    def click(self, x=None, y=None, button='left', clicks=1, interval=0.0, profile=None):
+        """点击鼠标，参数同 MouseControl.click"""
+        events = [(EVENT_MOVE, int(x), int(y))] if x is not None and y is not None else []
+        events += self._repeat([(EVENT_MOUSE_DOWN, button), (EVENT_MOUSE_UP, button)], clicks, interval)
+        return self._add(ACTION_CLICK, profile, f"鼠标{button}键点击", events)
+
+    def press(self, key, presses=1, interval=0.0, profile=None):
+        """按键，参数同 KeyboardControl.press_key"""
+        events = self._repeat([(EVENT_KEY_DOWN, key), (EVENT_KEY_UP, key)], presses, interval)
+        return self._add(ACTION_KEY, profile, f"按键 '{key}'", events)
+
+    def type(self, text, interval=0.0, profile=None, strategy=TYPE_CHAR):
+        """输入文本，参数同 KeyboardControl.type_text（文本按字符数计入事件数）"""
+        return self._add(ACTION_TYPE, profile, f"输入文本 '{text}'", [(EVENT_TEXT, text, interval, strategy)])
+
+    def hotkey(self, *keys, profile=None):
+        """组合键，按顺序按下后逆序释放"""
+        events = [(EVENT_KEY_DOWN, key) for key in keys] + [(EVENT_KEY_UP, key) for key in reversed(keys)]
+        return self._add(ACTION_HOTKEY, profile, f"组合键 {'+'.join(keys)}", events)
+
+    def pause(self, seconds):
+        """在序列中插入固定等待"""
+        return self._add(None, None, f"等待 {seconds} 秒", [(EVENT_SLEEP, float(seconds))])
+
+    def clear(self):
+        """清空序列"""
+        self._steps = []
+
+    def run(self, on_step=None):
+        """
+        注入整个序列
+
+        Args:
+            on_step: 每步之前调用的函数（如脚本的暂停/停止检查），其异常会中止整个序列
+
+        Returns:
+            统计字典:
+                events: 注入的输入事件数
+                steps: 操作步数
+                failed: 失败（已记录错误并跳过）的步数
+                duration: 总耗时（秒，含间隔和停顿）
+                inject_time: 注入事件本身的耗时（秒）
+                events_per_second: 按总耗时计算的事件速率
+                inject_rate: 按注入耗时计算的事件速率（本机能达到的上限）
+        """
+        injector = get_injector()
+        keep_timing = self.keep_timing
+        events_sent = 0
+        failed = 0
+        inject_time = 0.0
+        start = time.perf_counter()
+        try:
+            for action, profile, description, events in self._steps:
+                if on_step is not None:
+                    on_step()
+                step_start = time.perf_counter()
+                sleeping = 0.0
+                try:
+                    pyautogui.failSafeCheck()
+                    for event in events:
+                        kind = event[0]
+                        if kind == EVENT_SLEEP:
+                            if keep_timing:
+                                sleep_start = time.perf_counter()
+                                time.sleep(event[1])
+                                sleeping += time.perf_counter() - sleep_start
+                            continue
+                        if kind == EVENT_TEXT:
+                            text, interval, strategy = event[1:]
+                            type_with_strategy(text, interval if keep_timing else 0.0,
+                                               choose_type_strategy(text, strategy))
+                        else:
+                            getattr(injector, kind)(*event[1:])
+                        events_sent += self._event_count(event)
+                except pyautogui.FailSafeException:
+                    # 鼠标移到屏幕角落表示要求停止，中止整个序列
+                    logger.error(f"触发故障保护，批量输入中止（{description}）")
+                    raise
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"批量输入失败（{description}）: {e}")
+                    continue
+                acting = time.perf_counter() - step_start
+                inject_time += acting - sleeping
+                if action is not None:
+                    pause = profile_pause(profile, action) if keep_timing else 0.0
+                    timing_stats.record(profile, acting, pause)
+                logger.debug(f"批量输入: {description}")
+        finally:
+            frame_provider.invalidate()
+
+        duration = time.perf_counter() - start
+        self.last_stats = {
+            "events": events_sent,
+            "steps": len(self._steps),
+            "failed": failed,
+            "duration": duration,
+            "inject_time": inject_time,
+            "events_per_second": events_sent / duration if duration > 0 else 0.0,
+            "inject_rate": events_sent / inject_time if inject_time > 0 else 0.0,
+        }
+        logger.info(f"批量输入完成: {len(self._steps)} 步 {events_sent} 个事件，耗时 {duration:.3f} 秒，"
+                     f"{self.last_stats['events_per_second']:.0f} 事件/秒"
+                     f"（注入速率 {self.last_stats['inject_rate']:.0f} 事件/秒，{injector.name}）")
+        return self.last_stats
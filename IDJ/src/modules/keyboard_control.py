@@ -2,19 +2,137 @@ import pyautogui
 import time
 import logging
 
+from modules.screen_capture import frame_provider
+from modules.timing_profiles import (timed_action, resolve_timing_profile, disable_pyautogui_pause,
+                                     DEFAULT_TIMING_PROFILE, ACTION_KEY, ACTION_TYPE, ACTION_HOTKEY)
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 文本输入方式
+TYPE_CHAR = "char"        # 逐字符按键（pyautogui.typewrite），仅支持键盘上的ASCII字符
+TYPE_CHUNKED = "chunked"  # 按块发送Unicode字符，支持中文，间隔作用于块之间
+TYPE_PASTE = "paste"      # 写入剪贴板后Ctrl+V粘贴，完成后恢复原剪贴板内容
+TYPE_AUTO = "auto"        # 按文本长度和字符集自动选择
+TYPE_STRATEGIES = (TYPE_CHAR, TYPE_CHUNKED, TYPE_PASTE, TYPE_AUTO)
+
+# 分块输入时每块的字符数
+TYPE_CHUNK_SIZE = 64
+# 自动选择时，达到该长度的文本使用粘贴
+AUTO_PASTE_MIN_LENGTH = 32
+# 按下Ctrl+V后等待目标程序读取剪贴板的时间，之后才恢复原内容
+PASTE_SETTLE_TIME = 0.1
+
+
+def choose_type_strategy(text, strategy=TYPE_AUTO):
+    """
+    确定实际使用的输入方式
+    
+    自动选择时：含非ASCII字符或文本较长时粘贴，剪贴板不可用则分块输入；
+    短的ASCII文本逐字符输入，保留按键间隔。
+    """
+    from modules.clipboard import clipboard_available
+    
+    if strategy not in TYPE_STRATEGIES:
+        logger.warning(f"未知的输入方式: {strategy}，使用 {TYPE_AUTO}")
+        strategy = TYPE_AUTO
+    if strategy == TYPE_PASTE and not clipboard_available():
+        logger.warning("剪贴板不可用，改为分块输入")
+        return TYPE_CHUNKED
+    if strategy != TYPE_AUTO:
+        return strategy
+    if not text.isascii() or len(text) >= AUTO_PASTE_MIN_LENGTH:
+        return TYPE_PASTE if clipboard_available() else TYPE_CHUNKED
+    return TYPE_CHAR
+
+
+def type_with_strategy(text, interval, strategy):
+    """
+    按指定方式输入文本（KeyboardControl.type_text 与批量输入共用）
+    
+    Args:
+        text: 要输入的文本
+        interval: 逐字符输入时为字符间隔，分块输入时为块间隔，粘贴时忽略
+        strategy: choose_type_strategy 确定的输入方式（不能为 TYPE_AUTO）
+    """
+    if strategy == TYPE_PASTE and _paste_text(text):
+        return
+    if strategy in (TYPE_PASTE, TYPE_CHUNKED):
+        from modules.input_batch import get_injector
+        
+        injector = get_injector()
+        for start in range(0, len(text), TYPE_CHUNK_SIZE):
+            if start and interval > 0:
+                time.sleep(interval)
+            injector.text(text[start:start + TYPE_CHUNK_SIZE])
+    else:
+        pyautogui.typewrite(text, interval=interval)
+
+
+def _paste_text(text):
+    """
+    通过剪贴板粘贴文本，粘贴后恢复原剪贴板内容
+    
+    Returns:
+        是否已粘贴；剪贴板中有无法恢复的内容（如复制的文件）或剪贴板被其他程序占用、
+        读写失败时不粘贴，返回False
+    """
+    from modules.clipboard import save_clipboard, set_clipboard_text
+    
+    try:
+        saved, lost = save_clipboard()
+    except Exception as e:
+        logger.warning(f"读取剪贴板失败，不使用粘贴，改为分块输入: {e}")
+        return False
+    if lost:
+        logger.warning(f"剪贴板中有无法恢复的内容（{', '.join(lost)}），不使用粘贴，改为分块输入")
+        return False
+    try:
+        set_clipboard_text(text)
+    except Exception as e:
+        logger.warning(f"写入剪贴板失败，不使用粘贴，改为分块输入: {e}")
+        _restore_clipboard(saved)
+        return False
+    try:
+        pyautogui.hotkey('ctrl', 'v')
+        # 目标程序处理粘贴消息时才读取剪贴板，过早恢复会粘贴出旧内容
+        time.sleep(PASTE_SETTLE_TIME)
+    finally:
+        _restore_clipboard(saved)
+    return True
+
+
+def _restore_clipboard(saved):
+    """恢复剪贴板内容，失败只记录错误（文本已经粘贴或将改为分块输入）"""
+    from modules.clipboard import restore_clipboard
+    
+    try:
+        restore_clipboard(saved)
+    except Exception as e:
+        logger.error(f"恢复剪贴板失败: {e}")
+
+
 class KeyboardControl:
     """键盘控制模块，提供键盘输入、组合键等功能"""
     
-    def __init__(self):
-        # 设置PyAutoGUI的参数
-        pyautogui.PAUSE = 0.1    # 每次操作后的暂停时间
+    def __init__(self, timing_profile=DEFAULT_TIMING_PROFILE):
+        # 操作后的停顿由节奏配置决定，不再使用 pyautogui.PAUSE
+        disable_pyautogui_pause()
+        self.timing_profile = resolve_timing_profile(timing_profile)
         
         logger.info("键盘控制模块初始化成功")
     
-    def press_key(self, key, presses=1, interval=0.0):
+    def set_timing_profile(self, name):
+        """
+        设置操作节奏
+        
+        Args:
+            name: "turbo"（极速）、"normal"（标准）或 "human"（拟人）
+        """
+        self.timing_profile = resolve_timing_profile(name)
+        logger.info(f"键盘操作节奏: {self.timing_profile}")
+    
+    def press_key(self, key, presses=1, interval=0.0, profile=None):
         """
         按键操作
         
@@ -22,62 +140,76 @@ class KeyboardControl:
             key: 按键名称（字符串）
             presses: 按键次数
             interval: 按键间隔
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
-            pyautogui.press(key, presses=presses, interval=interval)
+            timed_action(profile or self.timing_profile, ACTION_KEY, pyautogui.press, key, presses=presses,
+                         interval=interval)
+            frame_provider.invalidate()
             logger.info(f"按键 '{key}' 被按下 {presses} 次")
         except Exception as e:
             logger.error(f"按键操作失败: {e}")
     
-    def type_text(self, text, interval=0.05):
+    def type_text(self, text, interval=0.05, profile=None, strategy=TYPE_CHAR):
         """
         输入文本
         
         Args:
             text: 要输入的文本
-            interval: 每个字符输入间隔
+            interval: 每个字符输入间隔（分块输入时为每块间隔，粘贴时忽略）
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
+            strategy: 输入方式，TYPE_CHAR/TYPE_CHUNKED/TYPE_PASTE/TYPE_AUTO
         """
         try:
-            pyautogui.typewrite(text, interval=interval)
-            logger.info(f"输入文本: '{text}'")
+            strategy = choose_type_strategy(text, strategy)
+            timed_action(profile or self.timing_profile, ACTION_TYPE, type_with_strategy, text, interval, strategy)
+            frame_provider.invalidate()
+            shown = text if len(text) <= 50 else f"{text[:50]}...（共{len(text)}字）"
+            logger.info(f"输入文本({strategy}): '{shown}'")
         except Exception as e:
             logger.error(f"文本输入失败: {e}")
     
-    def hotkey(self, *args):
+    def hotkey(self, *args, profile=None):
         """
         组合键操作
         
         Args:
             *args: 按键名称列表
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
-            pyautogui.hotkey(*args)
+            timed_action(profile or self.timing_profile, ACTION_HOTKEY, pyautogui.hotkey, *args)
+            frame_provider.invalidate()
             logger.info(f"组合键操作: {', '.join(args)}")
         except Exception as e:
             logger.error(f"组合键操作失败: {e}")
     
-    def key_down(self, key):
+    def key_down(self, key, profile=None):
         """
         按下按键不释放
         
         Args:
             key: 按键名称
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
-            pyautogui.keyDown(key)
+            timed_action(profile or self.timing_profile, ACTION_KEY, pyautogui.keyDown, key)
+            frame_provider.invalidate()
             logger.info(f"按键 '{key}' 按下")
         except Exception as e:
             logger.error(f"按键按下操作失败: {e}")
     
-    def key_up(self, key):
+    def key_up(self, key, profile=None):
         """
         释放按键
         
         Args:
             key: 按键名称
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
-            pyautogui.keyUp(key)
+            timed_action(profile or self.timing_profile, ACTION_KEY, pyautogui.keyUp, key)
+            frame_provider.invalidate()
             logger.info(f"按键 '{key}' 释放")
         except Exception as e:
             logger.error(f"按键释放操作失败: {e}")
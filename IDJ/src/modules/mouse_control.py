@@ -2,34 +2,52 @@ import pyautogui
 import time
 import logging
 
+from modules.screen_capture import frame_provider
+from modules.timing_profiles import (timed_action, resolve_timing_profile, disable_pyautogui_pause,
+                                     DEFAULT_TIMING_PROFILE, ACTION_MOVE, ACTION_CLICK, ACTION_DRAG, ACTION_SCROLL)
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
 class MouseControl:
     """鼠标控制模块，提供鼠标移动、点击、拖拽等功能"""
     
-    def __init__(self):
+    def __init__(self, timing_profile=DEFAULT_TIMING_PROFILE):
         # 设置PyAutoGUI的参数
         pyautogui.FAILSAFE = True  # 启用安全模式
-        pyautogui.PAUSE = 0.1    # 每次操作后的暂停时间
+        # 操作后的停顿由节奏配置决定，不再使用 pyautogui.PAUSE
+        disable_pyautogui_pause()
+        self.timing_profile = resolve_timing_profile(timing_profile)
         
         logger.info("鼠标控制模块初始化成功")
     
-    def move_to(self, x, y, duration=0.5):
+    def set_timing_profile(self, name):
+        """
+        设置操作节奏
+        
+        Args:
+            name: "turbo"（极速）、"normal"（标准）或 "human"（拟人）
+        """
+        self.timing_profile = resolve_timing_profile(name)
+        logger.info(f"鼠标操作节奏: {self.timing_profile}")
+    
+    def move_to(self, x, y, duration=0.5, profile=None):
         """
         移动鼠标到指定坐标
         
         Args:
             x, y: 目标坐标
             duration: 移动时间（秒）
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
-            pyautogui.moveTo(x, y, duration=duration)
+            timed_action(profile or self.timing_profile, ACTION_MOVE, pyautogui.moveTo, x, y, duration=duration)
+            frame_provider.invalidate()
             logger.info(f"鼠标移动到: ({x}, {y})")
         except Exception as e:
             logger.error(f"鼠标移动失败: {e}")
     
-    def click(self, x=None, y=None, button='left', clicks=1, interval=0.0):
+    def click(self, x=None, y=None, button='left', clicks=1, interval=0.0, profile=None):
         """
         点击鼠标
         
@@ -38,53 +56,63 @@ class MouseControl:
             button: 鼠标按钮（'left', 'right', 'middle'）
             clicks: 点击次数
             interval: 点击间隔
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
+            profile = profile or self.timing_profile
             if x is not None and y is not None:
-                pyautogui.click(x, y, clicks=clicks, interval=interval, button=button)
+                timed_action(profile, ACTION_CLICK, pyautogui.click, x, y, clicks=clicks, interval=interval,
+                             button=button)
                 logger.info(f"鼠标{button}键点击: ({x}, {y})")
             else:
-                pyautogui.click(clicks=clicks, interval=interval, button=button)
+                timed_action(profile, ACTION_CLICK, pyautogui.click, clicks=clicks, interval=interval, button=button)
                 logger.info(f"鼠标{button}键点击")
+            frame_provider.invalidate()
         except Exception as e:
             logger.error(f"鼠标点击失败: {e}")
     
-    def double_click(self, x=None, y=None, button='left'):
+    def double_click(self, x=None, y=None, button='left', profile=None):
         """
         双击鼠标
         
         Args:
             x, y: 点击坐标（可选，默认当前位置）
             button: 鼠标按钮
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
+            profile = profile or self.timing_profile
             if x is not None and y is not None:
-                pyautogui.doubleClick(x, y, button=button)
+                timed_action(profile, ACTION_CLICK, pyautogui.doubleClick, x, y, button=button)
                 logger.info(f"鼠标{button}键双击: ({x}, {y})")
             else:
-                pyautogui.doubleClick(button=button)
+                timed_action(profile, ACTION_CLICK, pyautogui.doubleClick, button=button)
                 logger.info(f"鼠标{button}键双击")
+            frame_provider.invalidate()
         except Exception as e:
             logger.error(f"鼠标双击失败: {e}")
     
-    def right_click(self, x=None, y=None):
+    def right_click(self, x=None, y=None, profile=None):
         """
         右键点击
         
         Args:
             x, y: 点击坐标（可选，默认当前位置）
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
+            profile = profile or self.timing_profile
             if x is not None and y is not None:
-                pyautogui.rightClick(x, y)
+                timed_action(profile, ACTION_CLICK, pyautogui.rightClick, x, y)
                 logger.info(f"鼠标右键点击: ({x}, {y})")
             else:
-                pyautogui.rightClick()
+                timed_action(profile, ACTION_CLICK, pyautogui.rightClick)
                 logger.info("鼠标右键点击")
+            frame_provider.invalidate()
         except Exception as e:
             logger.error(f"鼠标右键点击失败: {e}")
     
-    def drag_to(self, x1, y1, x2, y2, duration=0.5, button='left'):
+    def drag_to(self, x1, y1, x2, y2, duration=0.5, button='left', profile=None):
         """
         拖拽操作
         
@@ -93,10 +121,13 @@ class MouseControl:
             x2, y2: 终点坐标
             duration: 拖拽时间（秒）
             button: 鼠标按钮
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
-            pyautogui.moveTo(x1, y1)
-            pyautogui.dragTo(x2, y2, duration=duration, button=button)
+            profile = profile or self.timing_profile
+            timed_action(profile, ACTION_MOVE, pyautogui.moveTo, x1, y1)
+            timed_action(profile, ACTION_DRAG, pyautogui.dragTo, x2, y2, duration=duration, button=button)
+            frame_provider.invalidate()
             logger.info(f"鼠标{button}键拖拽: ({x1}, {y1}) -> ({x2}, {y2})")
         except Exception as e:
             logger.error(f"鼠标拖拽失败: {e}")
@@ -116,20 +147,23 @@ class MouseControl:
             logger.error(f"获取鼠标位置失败: {e}")
             return None
     
-    def scroll(self, amount, x=None, y=None):
+    def scroll(self, amount, x=None, y=None, profile=None):
         """
         滚动鼠标滚轮
         
         Args:
             amount: 滚动量（正数向上，负数向下）
             x, y: 滚动位置（可选，默认当前位置）
+            profile: 仅本次使用的节奏配置，None表示使用当前节奏
         """
         try:
+            profile = profile or self.timing_profile
             if x is not None and y is not None:
-                pyautogui.scroll(amount, x, y)
+                timed_action(profile, ACTION_SCROLL, pyautogui.scroll, amount, x, y)
                 logger.info(f"鼠标滚轮滚动: {amount}，位置: ({x}, {y})")
             else:
-                pyautogui.scroll(amount)
+                timed_action(profile, ACTION_SCROLL, pyautogui.scroll, amount)
                 logger.info(f"鼠标滚轮滚动: {amount}")
+            frame_provider.invalidate()
         except Exception as e:
             logger.error(f"鼠标滚轮滚动失败: {e}")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR工作进程模块
+在独立进程中运行Tesseract，多个脚本组同时识别文字时不会互相排队。
+识别函数本身只依赖pytesseract；但Windows下进程池以spawn方式启动，工作进程会重新
+导入主脚本（main.py）及其顶层导入的界面模块，因此进程池只在首次识别时创建一次并复用。
+"""
+
+import os
+import time
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# OCR进程池的最大进程数
+OCR_MAX_WORKERS = max(1, min(2, (os.cpu_count() or 1) // 2))
+
+_ocr_executor = None
+_ocr_executor_lock = threading.Lock()
+
+
+class OcrCache:
+    """
+    OCR结果缓存
+
+    以 (图像内容哈希, 尺寸, 语言, 参数) 为键缓存逐词结果。内容不变的区域直接返回
+    上次结果，不再调用Tesseract。条目超过数量上限时按LRU淘汰，超过TTL的条目视为过期。
+    """
+
+    def __init__(self, max_entries=128, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (timestamp, words)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(image, lang, config):
+        """根据图像内容和识别参数生成缓存键"""
+        if not image.flags['C_CONTIGUOUS']:
+            image = image.copy()
+        return (zlib.crc32(image), image.shape, lang, config)
+
+    def get(self, key):
+        """
+        获取缓存的逐词结果
+
+        Returns:
+            结果列表的副本，未命中或已过期返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or time.monotonic() - entry[0] <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return [dict(word) for word in entry[1]]
+                del self._entries[key]
+                self.expired += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, words):
+        """保存识别结果"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), [dict(word) for word in words])
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        """淘汰最久未使用的条目直到满足数量上限（调用方持有锁）"""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def configure(self, max_entries=None, ttl=None):
+        """
+        调整缓存大小和过期时间
+
+        Args:
+            max_entries: 最大条目数，0表示禁用缓存
+            ttl: 过期时间（秒）
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(0, int(max_entries))
+            if ttl is not None:
+                self.ttl = float(ttl)
+            self._evict()
+
+    def clear(self):
+        """清空缓存（不重置计数器）"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        获取缓存统计
+
+        Returns:
+            包含 hits/misses/expired/evictions/entries/max_entries/ttl/hit_rate 的字典
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# 进程内共享的OCR结果缓存
+ocr_cache = OcrCache()
+
+
+def run_ocr(image, lang=None, config=""):
+    """
+    对图像执行OCR，返回逐词结果（在工作进程中执行）
+
+    Args:
+        image: RGB图像数组
+        lang: Tesseract语言，如 "chi_sim+eng"，None表示默认语言
+        config: 额外的Tesseract参数
+
+    Returns:
+        [{"text", "left", "top", "width", "height", "conf", "line"}, ...]，
+        line为 (block_num, par_num, line_num)，用于把词拼成行
+    """
+    import pytesseract
+
+    data = pytesseract.image_to_data(image, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+    words = []
+    for i, text in enumerate(data["text"]):
+        text = text.strip()
+        if not text:
+            continue
+        words.append({
+            "text": text,
+            "left": int(data["left"][i]),
+            "top": int(data["top"][i]),
+            "width": int(data["width"][i]),
+            "height": int(data["height"][i]),
+            "conf": float(data["conf"][i]),
+            "line": (int(data["block_num"][i]), int(data["par_num"][i]), int(data["line_num"][i])),
+        })
+    return words
+
+
+def get_ocr_executor():
+    """获取共享的OCR进程池（首次使用时创建）"""
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is None:
+            _ocr_executor = ProcessPoolExecutor(max_workers=OCR_MAX_WORKERS)
+            logger.info(f"OCR进程池已创建，进程数: {OCR_MAX_WORKERS}")
+        return _ocr_executor
+
+
+def _reset_ocr_executor():
+    """丢弃损坏的进程池，下次使用时重新创建"""
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is not None:
+            _ocr_executor.shutdown(wait=False)
+            _ocr_executor = None
+
+
+def ocr_words(image, lang=None, config=""):
+    """
+    在进程池中执行OCR，进程池不可用时退回到当前进程执行
+
+    Args:
+        image: RGB图像数组
+        lang: Tesseract语言
+        config: 额外的Tesseract参数
+
+    Returns:
+        逐词结果列表，格式见 run_ocr
+    """
+    key = None
+    if ocr_cache.max_entries > 0:
+        key = OcrCache.make_key(image, lang, config)
+        words = ocr_cache.get(key)
+        if words is not None:
+            return words
+
+    # 只有进程池本身不可用时才退回到本进程执行；Tesseract自身的错误
+    # （TesseractError，RuntimeError的子类）原样抛给调用方，不重建进程池
+    try:
+        future = get_ocr_executor().submit(run_ocr, image, lang, config)
+    except (BrokenProcessPool, RuntimeError, OSError) as e:
+        # 进程池已关闭或无法创建
+        logger.warning(f"OCR进程池不可用，改为在当前进程识别: {e}")
+        _reset_ocr_executor()
+        future = None
+
+    if future is None:
+        words = run_ocr(image, lang, config)
+    else:
+        try:
+            words = future.result()
+        except BrokenProcessPool as e:
+            # 工作进程崩溃
+            logger.warning(f"OCR进程池已损坏，改为在当前进程识别: {e}")
+            _reset_ocr_executor()
+            words = run_ocr(image, lang, config)
+
+    if key is not None:
+        ocr_cache.put(key, words)
+    return words
+
+
+def shutdown_ocr_executor():
+    """关闭OCR进程池（程序退出时调用）"""
+    _reset_ocr_executor()
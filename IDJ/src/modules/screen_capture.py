@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+屏幕帧提供模块
+在一个刷新周期（epoch）内让所有识别调用共享同一张截图及其BGR转换结果。
+截图由可替换的采集后端完成，通过环境变量 IDJ_CAPTURE_BACKEND 或
+set_capture_backend() 选择。
+"""
+
+import os
+import sys
+import time
+import zlib
+import logging
+import threading
+from collections import deque
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 帧提供器最多保留的可复用帧缓冲区数量
+FRAME_BUFFER_POOL_SIZE = 3
+
+# 后台截图流的环形缓冲区大小与默认帧率
+STREAM_RING_SIZE = 3
+STREAM_DEFAULT_FPS = 30
+
+def _pool_refcount(pool, index):
+    """缓冲池中某个缓冲区的引用计数"""
+    return sys.getrefcount(pool[index])
+
+
+# 只被缓冲池引用时的引用计数（用同一函数标定，不依赖解释器的计数细节）
+_FREE_BUFFER_REFCOUNT = _pool_refcount([np.empty(1)], 0)
+
+
+def _convert_into(source, code, out):
+    """颜色转换；out尺寸匹配时直接写入out，否则分配新数组"""
+    if out is not None and out.shape[:2] == source.shape[:2]:
+        return cv2.cvtColor(source, code, dst=out)
+    return cv2.cvtColor(source, code)
+
+
+class CaptureBackend:
+    """
+    屏幕采集后端基类
+
+    grab() 返回BGR格式的uint8数组；region为 (x, y, width, height)，None表示主屏幕全屏。
+    传入out且尺寸一致时结果直接写入out并返回out，不再分配新数组。
+    """
+
+    name = "base"
+
+    def grab(self, region=None, out=None):
+        raise NotImplementedError
+
+    def close(self):
+        """释放后端占用的资源"""
+        pass
+
+
+class MssBackend(CaptureBackend):
+    """基于mss的原生采集（Windows下为BitBlt），通常是最快的后端"""
+
+    name = "mss"
+
+    def __init__(self):
+        import mss  # 未安装时抛出ImportError，由调用方回退
+        self._mss = mss
+        self._local = threading.local()  # mss实例不能跨线程使用
+
+    def _instance(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss.mss()
+        return sct
+
+    def grab(self, region=None, out=None):
+        sct = self._instance()
+        if region is None:
+            monitor = sct.monitors[1]  # 主屏幕，与pyautogui的坐标系一致
+        else:
+            x, y, width, height = region
+            monitor = {"left": int(x), "top": int(y), "width": int(width), "height": int(height)}
+        shot = sct.grab(monitor)
+        # 直接在mss的原始BGRA缓冲区上建立视图，不经过中间数组
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return _convert_into(bgra, cv2.COLOR_BGRA2BGR, out)
+
+    def close(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class PilBackend(CaptureBackend):
+    """基于PIL ImageGrab的采集"""
+
+    name = "pil"
+
+    def __init__(self):
+        from PIL import ImageGrab
+        self._image_grab = ImageGrab
+
+    def grab(self, region=None, out=None):
+        bbox = None
+        if region is not None:
+            x, y, width, height = region
+            bbox = (x, y, x + width, y + height)
+        return _convert_into(np.asarray(self._image_grab.grab(bbox=bbox)), cv2.COLOR_RGB2BGR, out)
+
+
+class PyAutoGuiBackend(CaptureBackend):
+    """基于pyautogui.screenshot的采集（原有实现）"""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def grab(self, region=None, out=None):
+        screenshot = self._pyautogui.screenshot(region=tuple(region) if region is not None else None)
+        return _convert_into(np.asarray(screenshot), cv2.COLOR_RGB2BGR, out)
+
+
+class QtBackend(CaptureBackend):
+    """基于QScreen.grabWindow的采集，需要已创建QApplication"""
+
+    name = "qt"
+
+    def __init__(self):
+        from PyQt5.QtWidgets import QApplication
+        if QApplication.instance() is None:
+            raise RuntimeError("Qt采集后端需要先创建QApplication")
+        self._application = QApplication
+
+    def grab(self, region=None, out=None):
+        from PyQt5.QtGui import QImage
+        screen = self._application.primaryScreen()
+        if region is None:
+            pixmap = screen.grabWindow(0)
+        else:
+            x, y, width, height = region
+            pixmap = screen.grabWindow(0, int(x), int(y), int(width), int(height))
+        image = pixmap.toImage().convertToFormat(QImage.Format_RGB32)
+        width, height = image.width(), image.height()
+        buffer = image.constBits()
+        buffer.setsize(image.byteCount())
+        # Format_RGB32 在小端机器上的内存布局为 B, G, R, 0xFF
+        array = np.frombuffer(buffer, dtype=np.uint8).reshape(height, image.bytesPerLine() // 4, 4)
+        return _convert_into(array[:, :width], cv2.COLOR_BGRA2BGR, out)
+
+
+class ArrayBackend(CaptureBackend):
+    """
+    基于图像文件或数组的伪采集后端，用于测试和离线调试
+
+    每次grab依次返回下一帧（到末尾后循环），区域采集从该帧裁剪。
+    """
+
+    name = "array"
+
+    def __init__(self, frames):
+        """
+        Args:
+            frames: 单个或多个BGR数组/图像文件路径
+        """
+        if isinstance(frames, (str, np.ndarray)):
+            frames = [frames]
+        self._frames = []
+        for frame in frames:
+            if isinstance(frame, str):
+                image = cv2.imread(frame, cv2.IMREAD_COLOR)
+                if image is None:
+                    raise ValueError(f"无法读取图像文件: {frame}")
+                frame = image
+            self._frames.append(frame)
+        if not self._frames:
+            raise ValueError("至少需要一帧图像")
+        self._index = 0
+        self._lock = threading.Lock()
+
+    def grab(self, region=None, out=None):
+        with self._lock:
+            frame = self._frames[self._index]
+            self._index = (self._index + 1) % len(self._frames)
+        if region is not None:
+            frame = crop_region(frame, region)[0]
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            return out
+        return frame.copy()
+
+
+# 可通过名称选择的采集后端
+CAPTURE_BACKENDS = {
+    "mss": MssBackend,
+    "pil": PilBackend,
+    "qt": QtBackend,
+    "pyautogui": PyAutoGuiBackend,
+}
+
+# "auto" 时依次尝试的后端
+AUTO_BACKEND_ORDER = ("mss", "pil", "pyautogui")
+
+
+def create_capture_backend(name="auto"):
+    """
+    按名称创建采集后端
+
+    Args:
+        name: "auto"、"mss"、"pil"、"qt"、"pyautogui"，或 "replay:<录制目录>"
+              表示原速回放录制的帧（见 frame_recorder 模块）
+
+    Returns:
+        CaptureBackend实例
+    """
+    if name.startswith("replay:"):
+        from modules.frame_recorder import ReplayBackend
+        return ReplayBackend(name[len("replay:"):])
+
+    if name == "auto":
+        for candidate in AUTO_BACKEND_ORDER:
+            try:
+                return CAPTURE_BACKENDS[candidate]()
+            except Exception as e:
+                logger.debug(f"采集后端 {candidate} 不可用: {e}")
+        raise RuntimeError("没有可用的屏幕采集后端")
+
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"未知的采集后端: {name}")
+    return CAPTURE_BACKENDS[name]()
+
+
+class StreamSubscription:
+    """
+    截图流的订阅
+
+    每个订阅者有自己的读取位置：next_frame() 等待比上次读到的更新的帧，
+    两次读取之间被覆盖、没有读到的帧计入 missed。
+    """
+
+    def __init__(self, stream, fps):
+        self._stream = stream
+        self.fps = fps
+        self._last_seq = 0
+        self.received = 0
+        self.missed = 0
+        self.closed = False
+
+    def next_frame(self, timeout=None):
+        """
+        等待下一帧
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            (frame, seq, timestamp)，超时或流已停止返回None
+        """
+        entry = self._stream.wait_frame(after_seq=self._last_seq, timeout=timeout)
+        if entry is None:
+            return None
+        seq = entry[1]
+        if self._last_seq:
+            self.missed += max(0, seq - self._last_seq - 1)
+        self._last_seq = seq
+        self.received += 1
+        return entry
+
+    def close(self):
+        """取消订阅（最后一个订阅者取消时后台线程停止）"""
+        if not self.closed:
+            self.closed = True
+            self._stream._unsubscribe(self)
+
+
+class CaptureStream:
+    """
+    后台截图流
+
+    后台线程按目标帧率截图并写入环形缓冲区，识别调用直接取最新帧，不再在截图上阻塞。
+    多个脚本组通过 subscribe() 共享同一个流，帧率取各订阅者要求的最大值，
+    最后一个订阅者取消时线程停止。
+    """
+
+    def __init__(self, provider, ring_size=STREAM_RING_SIZE):
+        self._provider = provider
+        self.ring_size = max(2, ring_size)
+        self._latest = None  # (frame, seq, timestamp)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._subscribers = []
+        self._thread = None
+        self._stop_event = None
+        self._frame_times = deque(maxlen=120)
+        self.frames = 0
+        self.dropped = 0  # 截图耗时超过帧间隔而错过的帧
+        self.errors = 0
+
+    @property
+    def running(self):
+        """后台线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def target_fps(self):
+        """目标帧率（各订阅者要求的最大值）"""
+        with self._cond:
+            return max((s.fps for s in self._subscribers), default=0)
+
+    def subscribe(self, fps=STREAM_DEFAULT_FPS):
+        """
+        订阅截图流，必要时启动后台线程
+
+        Args:
+            fps: 需要的帧率
+
+        Returns:
+            StreamSubscription
+        """
+        if self._provider.backend.name == "qt":
+            raise RuntimeError("Qt采集后端只能在界面线程截图，不支持后台截图流")
+        subscription = StreamSubscription(self, max(1.0, float(fps)))
+        with self._cond:
+            self._subscribers.append(subscription)
+            if self._thread is None:
+                # 每个线程有自己的停止事件，停止中的旧线程不会被新订阅复活
+                self._stop_event = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop_event,),
+                                                name="CaptureStream", daemon=True)
+                self._thread.start()
+                logger.info(f"后台截图流已启动，目标帧率: {subscription.fps:g}")
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._cond:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            if self._subscribers or self._thread is None:
+                return
+            thread = self._thread
+            self._thread = None
+            self._stop_event.set()
+            self._latest = None
+            self._cond.notify_all()
+        if thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        logger.info("后台截图流已停止")
+
+    def _grab_into_slot(self, slots, index):
+        """
+        截图写入环形缓冲区的一个槽位；槽位中的帧仍被使用时改为新分配
+
+        对外只发布最新帧，而写入的槽位永远不是最新帧所在的槽位。
+        """
+        buffer = None
+        if slots[index] is not None and _pool_refcount(slots, index) <= _FREE_BUFFER_REFCOUNT:
+            buffer = slots[index]
+        frame = self._provider.backend.grab(out=buffer)
+        slots[index] = frame
+        return frame
+
+    def _run(self, stop_event):
+        """后台截图循环"""
+        slots = [None] * self.ring_size  # 本线程的环形缓冲区，帧数组未被引用时原地覆盖
+        next_time = time.perf_counter()
+        while not stop_event.is_set():
+            fps = self.target_fps or STREAM_DEFAULT_FPS
+            interval = 1.0 / fps
+            started = time.perf_counter()
+            try:
+                # 截图时不持有锁，识别调用随时可以取走当前的最新帧
+                frame = self._grab_into_slot(slots, self.frames % self.ring_size)
+                with self._cond:
+                    if stop_event.is_set():
+                        break
+                    self._seq += 1
+                    self._latest = (frame, self._seq, started)
+                    self.frames += 1
+                    self._frame_times.append(time.perf_counter())
+                    self._cond.notify_all()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"后台截图失败: {e}")
+
+            next_time += interval
+            now = time.perf_counter()
+            if now > next_time:
+                # 截图太慢，错过了若干帧的时刻
+                skipped = int((now - next_time) / interval) + 1
+                self.dropped += skipped
+                next_time += skipped * interval
+            stop_event.wait(max(0.0, next_time - time.perf_counter()))
+
+    def latest_frame(self, captured_after=0.0, timeout=None):
+        """
+        获取最新帧
+
+        Args:
+            captured_after: 只接受在该时刻（perf_counter）之后开始截取的帧
+            timeout: 没有满足条件的帧时最长等待秒数
+
+        Returns:
+            (frame, seq, timestamp)，超时或流未运行返回None
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._thread is None or
+                (self._latest is not None and self._latest[2] >= captured_after),
+                timeout)
+            latest = self._latest
+            if self._thread is None or latest is None or latest[2] < captured_after:
+                return None
+            return latest
+
+    def wait_frame(self, after_seq=0, timeout=None):
+        """等待序号大于 after_seq 的帧，返回 (frame, seq, timestamp) 或None"""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._thread is None or (self._latest is not None and self._latest[1] > after_seq),
+                timeout)
+            latest = self._latest
+            if self._thread is None or latest is None or latest[1] <= after_seq:
+                return None
+            return latest
+
+    def stats(self):
+        """
+        获取截图流统计
+
+        Returns:
+            包含 running/target_fps/fps/frames/dropped/errors/subscribers/missed 的字典，
+            fps为最近一段时间的实际帧率，missed为各订阅者未读到的帧数
+        """
+        with self._cond:
+            times = list(self._frame_times)
+            subscribers = list(self._subscribers)
+        fps = 0.0
+        if len(times) >= 2 and times[-1] > times[0]:
+            fps = (len(times) - 1) / (times[-1] - times[0])
+        return {
+            "running": self.running,
+            "target_fps": max((s.fps for s in subscribers), default=0),
+            "fps": fps,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "subscribers": len(subscribers),
+            "missed": [s.missed for s in subscribers],
+        }
+
+
+class FrameProvider:
+    """
+    屏幕帧提供器
+
+    截图在 max_age 秒内被视为新鲜并直接复用；鼠标/键盘注入输入后调用
+    invalidate() 使当前帧失效，下一次识别会重新截图。
+
+    帧数据写入提供器持有的预分配缓冲区。识别调用拿到的是缓冲区本身或其视图，
+    只要还有调用持有视图，该缓冲区就不会被下一次截图覆盖。帧应视为只读。
+
+    后台截图流（stream）运行时，get_frame 直接取流中的最新帧，不再同步截图。
+    """
+
+    def __init__(self, max_age=0.03, backend=None):
+        self.max_age = max_age
+        self._backend = backend  # None表示首次截图时按配置创建
+        self._frame = None  # BGR格式的全屏截图
+        self._timestamp = 0.0
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.captures = 0
+        self.reuses = 0
+        self.reuse_buffers = True
+        self._buffers = []  # 可复用的帧缓冲区
+        self.buffer_allocations = 0
+        self.buffer_reuses = 0
+        self.allocated_bytes = 0
+        self._invalidated_at = 0.0
+        self.stream = CaptureStream(self)
+
+    @property
+    def epoch(self):
+        """当前帧的序号，每次重新截图加一"""
+        return self._epoch
+
+    def set_max_age(self, max_age):
+        """
+        设置帧的新鲜度窗口
+
+        Args:
+            max_age: 秒，0表示每次都重新截图
+        """
+        self.max_age = max(0.0, float(max_age))
+
+    def invalidate(self):
+        """使当前帧失效（输入注入后屏幕可能已变化）"""
+        self._timestamp = 0.0
+        self._invalidated_at = time.perf_counter()
+
+    @property
+    def backend(self):
+        """当前采集后端（首次访问时按 IDJ_CAPTURE_BACKEND 创建，默认auto）"""
+        if self._backend is None:
+            self._backend = create_capture_backend(os.environ.get("IDJ_CAPTURE_BACKEND", "auto"))
+            logger.info(f"屏幕采集后端: {self._backend.name}")
+        return self._backend
+
+    def set_backend(self, backend):
+        """
+        切换采集后端
+
+        Args:
+            backend: CaptureBackend实例或后端名称
+        """
+        if isinstance(backend, str):
+            backend = create_capture_backend(backend)
+        with self._lock:
+            old = self._backend
+            self._backend = backend
+            self._frame = None
+            self._buffers = []
+            self._timestamp = 0.0
+        if old is not None and old is not backend:
+            old.close()
+        logger.info(f"屏幕采集后端切换为: {backend.name}")
+
+    def set_buffer_reuse(self, enabled):
+        """
+        设置是否把截图写入可复用的预分配缓冲区
+
+        Args:
+            enabled: False时每次截图都分配新数组（原有行为）
+        """
+        with self._lock:
+            self.reuse_buffers = bool(enabled)
+            self._buffers = []
+
+    def _acquire_buffer(self):
+        """找一个没有被识别调用引用的缓冲区（调用方持有锁）"""
+        for index in range(len(self._buffers)):
+            # 识别调用持有的帧或视图（通过 .base）会额外引用缓冲区，此时不能覆盖
+            if _pool_refcount(self._buffers, index) <= _FREE_BUFFER_REFCOUNT:
+                return self._buffers[index]
+        return None
+
+    def _capture(self):
+        """用当前后端截取全屏（BGR数组），尽量写入空闲的缓冲区（调用方持有锁）"""
+        if not self.reuse_buffers:
+            frame = self.backend.grab()
+            self.buffer_allocations += 1
+            self.allocated_bytes += frame.nbytes
+            return frame
+
+        self._frame = None  # 放开对旧帧的引用，没有其他使用者时它可以被复用
+        buffer = self._acquire_buffer()
+        frame = self.backend.grab(out=buffer)
+        if buffer is not None and frame is buffer:
+            self.buffer_reuses += 1
+            return frame
+
+        # 首次截图、分辨率变化或缓冲区都在使用中：加入新缓冲区，丢弃尺寸不符的旧缓冲区
+        self.buffer_allocations += 1
+        self.allocated_bytes += frame.nbytes
+        self._buffers = [b for b in self._buffers if b.shape == frame.shape]
+        if len(self._buffers) < FRAME_BUFFER_POOL_SIZE:
+            self._buffers.append(frame)
+        return frame
+
+    def get_frame(self, region=None):
+        """
+        获取当前帧
+
+        Args:
+            region: 搜索区域 (x, y, width, height)；"window" 表示绑定窗口；
+                    None表示全屏
+
+        Returns:
+            (frame, (offset_x, offset_y))，frame为BGR数组（区域时为全屏帧的视图），
+            offset为该帧左上角的屏幕坐标
+        """
+        frame = self._stream_frame()
+        if frame is not None:
+            region = resolve_region(region)
+            if not region:
+                return frame, (0, 0)
+            return crop_region(frame, region)
+
+        with self._lock:
+            now = time.perf_counter()
+            if self._frame is None or now - self._timestamp > self.max_age:
+                self._frame = self._capture()
+                self._timestamp = time.perf_counter()
+                self._epoch += 1
+                self.captures += 1
+            else:
+                self.reuses += 1
+            frame = self._frame
+
+        region = resolve_region(region)
+        if not region:
+            return frame, (0, 0)
+        return crop_region(frame, region)
+
+    def _stream_frame(self):
+        """截图流运行时取其最新帧（失效后等待新截取的帧），不可用时返回None"""
+        if not self.stream.running:
+            return None
+        fps = self.stream.target_fps or STREAM_DEFAULT_FPS
+        # 最多等待几个帧间隔，截图流卡住时退回到同步截图
+        entry = self.stream.latest_frame(captured_after=self._invalidated_at, timeout=max(0.1, 3.0 / fps))
+        if entry is None:
+            return None
+        frame, seq, timestamp = entry
+        with self._lock:
+            if seq != self._epoch:
+                self._epoch = seq
+                self.captures += 1
+            else:
+                self.reuses += 1
+        return frame
+
+    def stats(self):
+        """
+        获取截图统计
+
+        Returns:
+            包含 captures/reuses/epoch/max_age/backend/buffer_allocations/
+            buffer_reuses/allocated_mb 的字典
+        """
+        return {
+            "captures": self.captures,
+            "reuses": self.reuses,
+            "epoch": self._epoch,
+            "max_age": self.max_age,
+            "backend": self._backend.name if self._backend is not None else None,
+            "buffer_allocations": self.buffer_allocations,
+            "buffer_reuses": self.buffer_reuses,
+            "allocated_mb": self.allocated_bytes / (1024 * 1024),
+        }
+
+
+# 主窗口绑定的目标窗口句柄，"window" 搜索范围据此解析
+_bound_window = None
+
+
+def set_bound_window(hwnd):
+    """
+    设置绑定窗口（由主窗口在绑定时调用）
+
+    Args:
+        hwnd: 窗口句柄，None表示解除绑定
+    """
+    global _bound_window
+    _bound_window = hwnd
+    logger.info(f"识别范围绑定窗口: {hwnd}")
+
+
+def get_bound_window_region():
+    """
+    获取绑定窗口当前的屏幕区域
+
+    Returns:
+        (x, y, width, height)，未绑定或窗口不可用时返回None
+    """
+    if not _bound_window:
+        return None
+    try:
+        import win32gui
+        left, top, right, bottom = win32gui.GetWindowRect(_bound_window)
+    except Exception as e:
+        logger.warning(f"获取绑定窗口区域失败: {e}")
+        return None
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right - left, bottom - top)
+
+
+def resolve_region(region):
+    """
+    将搜索范围解析为具体区域
+
+    Args:
+        region: None、(x, y, width, height) 或 "window"
+
+    Returns:
+        (x, y, width, height) 或 None（全屏）
+    """
+    if region is None:
+        return None
+    if isinstance(region, str):
+        if region == "window":
+            window_region = get_bound_window_region()
+            if window_region is None:
+                logger.warning("未绑定窗口或窗口不可用，改为全屏搜索")
+            return window_region
+        logger.warning(f"未知的搜索范围: {region}")
+        return None
+    if len(region) != 4 or region[2] <= 0 or region[3] <= 0:
+        return None
+    return tuple(int(v) for v in region)
+
+
+def crop_region(frame, region):
+    """
+    从帧中裁剪区域（自动裁剪到帧边界内）
+
+    Args:
+        frame: 图像数组
+        region: (x, y, width, height)
+
+    Returns:
+        (视图, (offset_x, offset_y))
+    """
+    x, y, width, height = [int(v) for v in region]
+    frame_h, frame_w = frame.shape[:2]
+    x1 = min(max(x, 0), frame_w)
+    y1 = min(max(y, 0), frame_h)
+    x2 = min(max(x + width, x1), frame_w)
+    y2 = min(max(y + height, y1), frame_h)
+    return frame[y1:y2, x1:x2], (x1, y1)
+
+
+def frame_fingerprint(frame):
+    """
+    计算帧内容指纹，用于轮询时判断两次检查之间搜索区域是否发生变化
+    
+    对区域内的全部像素计算CRC（1080p全屏约3毫秒），任何像素变化都会改变指纹。
+    裁剪后的视图逐行累积计算，不复制整个区域，结果与连续数组相同。
+    
+    Args:
+        frame: 图像数组（可以是裁剪后的视图）
+        
+    Returns:
+        (shape, crc32) 元组
+    """
+    if frame.flags['C_CONTIGUOUS']:
+        return (frame.shape, zlib.crc32(frame))
+    crc = 0
+    for row in frame:
+        crc = zlib.crc32(np.ascontiguousarray(row), crc)
+    return (frame.shape, crc)
+
+
+# 进程内共享的帧提供器
+frame_provider = FrameProvider()
+
+
+def set_capture_backend(backend):
+    """切换进程内共享帧提供器的采集后端（CaptureBackend实例或名称）"""
+    frame_provider.set_backend(backend)
+
+
+def grab_screen(region=None):
+    """
+    用当前采集后端直接截图（不经过帧共享），适合取色等一次性的小区域采集
+
+    Args:
+        region: (x, y, width, height)，None表示全屏
+
+    Returns:
+        BGR数组
+    """
+    return frame_provider.backend.grab(region)
@@ -24,6 +24,8 @@ from PIL import Image
 import numpy as np
 import cv2
 
+from modules.image_saver import save_image_async, SAVE_FAST, SAVE_SMALL
+
 logger = logging.getLogger(__name__)
 
 class QuickScreenShotTool(QWidget):
@@ -571,21 +573,27 @@ class ScreenShotTool(QWidget):
             return
         
         # 打开保存对话框
-        file_path, _ = QFileDialog.getSaveFileName(
+        small_png_filter = "PNG图片-体积更小 (*.png)"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "保存截图",
             "",
-            "PNG图片 (*.png);;JPG图片 (*.jpg);;BMP图片 (*.bmp)"
+            f"PNG图片 (*.png);;{small_png_filter};;JPG图片 (*.jpg);;BMP图片 (*.bmp)"
         )
         
         if file_path:
-            try:
-                self.captured_image.save(file_path)
-                logger.info(f"截图保存成功: {file_path}")
-                QMessageBox.information(self, "成功", "截图保存成功！")
-            except Exception as e:
-                logger.error(f"截图保存失败: {e}")
-                QMessageBox.critical(self, "错误", f"保存失败: {str(e)}")
+            compression = SAVE_SMALL if selected_filter == small_png_filter else SAVE_FAST
+            
+            def on_saved(path, error):
+                if error is None:
+                    logger.info(f"截图保存成功: {path}")
+                    QMessageBox.information(self, "成功", "截图保存成功！")
+                else:
+                    logger.error(f"截图保存失败: {error}")
+                    QMessageBox.critical(self, "错误", f"保存失败: {str(error)}")
+            
+            # 编码和写盘在后台进行，保存完成后在界面线程提示
+            save_image_async(self.captured_image, file_path, compression, callback=on_saved)
     
     def copy_to_clipboard(self):
         """复制截图到剪贴板"""
@@ -761,8 +769,23 @@ class ScreenshotManager:
         tool = QuickScreenShotTool(self.parent, callback)
         return tool
     
-    def capture_window(self, hwnd, save_path=None):
-        """捕获指定窗口截图"""
+    def save_async(self, pixmap, save_path, compression=SAVE_FAST, callback=None):
+        """
+        在后台保存截图，不阻塞界面线程
+        
+        Args:
+            pixmap: 截图
+            save_path: 保存路径
+            compression: SAVE_FAST（编码快）或 SAVE_SMALL（文件小）
+            callback: 可选，文件落盘后在界面线程调用 callback(path, error)
+            
+        Returns:
+            Future，结果为保存路径
+        """
+        return save_image_async(pixmap, save_path, compression, callback)
+    
+    def capture_window(self, hwnd, save_path=None, compression=SAVE_FAST, callback=None):
+        """捕获指定窗口截图，指定save_path时在后台保存"""
         try:
             # 获取窗口位置和尺寸
             left, top, right, bottom = win32gui.GetWindowRect(hwnd)
@@ -774,7 +797,7 @@ class ScreenshotManager:
             pixmap = screen.grabWindow(hwnd, 0, 0, width, height)
             
             if save_path:
-                pixmap.save(save_path)
+                self.save_async(pixmap, save_path, compression, callback)
             
             return pixmap
             
@@ -782,8 +805,8 @@ class ScreenshotManager:
             logger.error(f"窗口截图失败: {e}")
             return None
     
-    def capture_screen(self, rect=None, save_path=None):
-        """捕获屏幕截图"""
+    def capture_screen(self, rect=None, save_path=None, compression=SAVE_FAST, callback=None):
+        """捕获屏幕截图，指定save_path时在后台保存"""
         try:
             screen = QApplication.primaryScreen()
             
@@ -799,7 +822,7 @@ class ScreenshotManager:
                 pixmap = screen.grabWindow(QApplication.desktop().winId())
             
             if save_path:
-                pixmap.save(save_path)
+                self.save_async(pixmap, save_path, compression, callback)
             
             return pixmap
             
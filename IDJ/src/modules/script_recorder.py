@@ -364,12 +364,11 @@ class ColorPicker(QObject):
             
         # 获取点击位置的颜色
         try:
-            import pyautogui
-            from PIL import ImageGrab
+            from modules.screen_capture import grab_screen
             
-            # 截取屏幕上该点的颜色
-            screenshot = ImageGrab.grab(bbox=(x, y, x+1, y+1))
-            color = screenshot.getpixel((0, 0))
+            # 用当前采集后端截取屏幕上该点的颜色（BGR）
+            pixel = grab_screen((x, y, 1, 1))[0, 0]
+            color = (int(pixel[2]), int(pixel[1]), int(pixel[0]))
             
             self.stop_picking()
             self.color_picked.emit(color)
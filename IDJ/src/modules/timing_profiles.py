@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+操作节奏模块
+用命名的节奏配置（极速/标准/拟人）显式设置每类鼠标键盘操作之后的停顿，
+代替 pyautogui.PAUSE 对每次调用隐式附加的固定停顿，并统计各配置下
+停顿与实际操作分别花费的时间。
+"""
+
+import time
+import random
+import logging
+import threading
+
+import pyautogui
+
+logger = logging.getLogger(__name__)
+
+# 操作类别
+ACTION_MOVE = "move"
+ACTION_CLICK = "click"
+ACTION_DRAG = "drag"
+ACTION_SCROLL = "scroll"
+ACTION_KEY = "key"
+ACTION_TYPE = "type"
+ACTION_HOTKEY = "hotkey"
+
+# 节奏配置：操作类别 -> (最短停顿, 最长停顿)，单位秒；两者相同时为固定停顿
+TIMING_PROFILES = {
+    # 极速：操作之间不停顿
+    "turbo": {
+        ACTION_MOVE: (0.0, 0.0),
+        ACTION_CLICK: (0.0, 0.0),
+        ACTION_DRAG: (0.0, 0.0),
+        ACTION_SCROLL: (0.0, 0.0),
+        ACTION_KEY: (0.0, 0.0),
+        ACTION_TYPE: (0.0, 0.0),
+        ACTION_HOTKEY: (0.0, 0.0),
+    },
+    # 标准：每次操作后停顿0.1秒，与原来 pyautogui.PAUSE = 0.1 的节奏相同（输入文本不再逐字符停顿）
+    "normal": {
+        ACTION_MOVE: (0.1, 0.1),
+        ACTION_CLICK: (0.1, 0.1),
+        ACTION_DRAG: (0.1, 0.1),
+        ACTION_SCROLL: (0.1, 0.1),
+        ACTION_KEY: (0.1, 0.1),
+        ACTION_TYPE: (0.1, 0.1),
+        ACTION_HOTKEY: (0.1, 0.1),
+    },
+    # 拟人：随机停顿，点击和按键后停顿更长
+    "human": {
+        ACTION_MOVE: (0.05, 0.15),
+        ACTION_CLICK: (0.12, 0.35),
+        ACTION_DRAG: (0.15, 0.4),
+        ACTION_SCROLL: (0.1, 0.3),
+        ACTION_KEY: (0.08, 0.25),
+        ACTION_TYPE: (0.15, 0.4),
+        ACTION_HOTKEY: (0.15, 0.35),
+    },
+}
+
+DEFAULT_TIMING_PROFILE = "normal"
+
+# 积木属性与界面中使用的显示名称
+TIMING_PROFILE_NAMES = {"turbo": "极速", "normal": "标准", "human": "拟人"}
+
+
+def disable_pyautogui_pause():
+    """
+    关闭pyautogui对每次调用附加的全局停顿，停顿改由节奏配置控制
+
+    在鼠标键盘控制模块初始化时调用；仅导入本模块不会修改pyautogui的全局设置。
+    """
+    if pyautogui.PAUSE:
+        logger.info(f"pyautogui.PAUSE 由 {pyautogui.PAUSE} 置为0，操作停顿改由节奏配置控制")
+        pyautogui.PAUSE = 0
+
+
+def resolve_timing_profile(name):
+    """
+    校验节奏配置名称
+
+    Returns:
+        有效的配置名称，未知名称时返回默认配置并记录警告
+    """
+    if name in TIMING_PROFILES:
+        return name
+    logger.warning(f"未知的节奏配置: {name}，使用 {DEFAULT_TIMING_PROFILE}")
+    return DEFAULT_TIMING_PROFILE
+
+
+class TimingStats:
+    """
+    各节奏配置的耗时统计
+
+    acting 为鼠标键盘调用本身的耗时（含移动动画和积木指定的间隔），
+    sleeping 为节奏配置附加的停顿。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = {}  # 配置名 -> {"actions", "acting", "sleeping"}
+
+    def record(self, profile, acting, sleeping):
+        """记录一次操作"""
+        with self._lock:
+            entry = self._profiles.setdefault(profile, {"actions": 0, "acting": 0.0, "sleeping": 0.0})
+            entry["actions"] += 1
+            entry["acting"] += acting
+            entry["sleeping"] += sleeping
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self._profiles.clear()
+
+    def snapshot(self):
+        """
+        获取当前累计值的副本，传给 report/format_report 的 since 只统计之后的操作
+
+        统计在进程内共享，用快照而不是 reset 区分各次执行，同时运行的其他脚本不受影响。
+        """
+        with self._lock:
+            return {profile: dict(entry) for profile, entry in self._profiles.items()}
+
+    def report(self, since=None):
+        """
+        获取统计报告
+
+        Args:
+            since: snapshot() 返回的快照，None表示进程启动以来的全部操作
+
+        Returns:
+            {配置名: {"actions", "acting", "sleeping", "sleep_ratio"}}，时间单位为秒，
+            sleep_ratio为停顿占总耗时的比例
+        """
+        since = since or {}
+        with self._lock:
+            report = {}
+            for profile, entry in self._profiles.items():
+                base = since.get(profile)
+                if base is not None:
+                    entry = {key: entry[key] - base[key] for key in entry}
+                if not entry["actions"]:
+                    continue
+                total = entry["acting"] + entry["sleeping"]
+                report[profile] = dict(entry, sleep_ratio=entry["sleeping"] / total if total else 0.0)
+            return report
+
+    def format_report(self, since=None):
+        """生成可读的统计文本，since 同 report"""
+        lines = [f"{'节奏':>6} {'操作数':>6} {'操作(秒)':>10} {'停顿(秒)':>10} {'停顿占比':>8}"]
+        for profile, entry in self.report(since).items():
+            lines.append(f"{TIMING_PROFILE_NAMES.get(profile, profile):>6} {entry['actions']:>6} "
+                         f"{entry['acting']:>10.2f} {entry['sleeping']:>10.2f} {entry['sleep_ratio']:>8.0%}")
+        return "\n".join(lines)
+
+
+# 进程内共享的节奏统计
+timing_stats = TimingStats()
+
+
+def profile_pause(profile, action):
+    """
+    按节奏配置停顿
+
+    Args:
+        profile: 节奏配置名称（已校验）
+        action: 操作类别（ACTION_*）
+
+    Returns:
+        实际停顿的秒数
+    """
+    low, high = TIMING_PROFILES[profile].get(action, (0.0, 0.0))
+    pause = random.uniform(low, high) if high > low else low
+    if pause <= 0:
+        return 0.0
+    start = time.perf_counter()
+    time.sleep(pause)
+    return time.perf_counter() - start
+
+
+def timed_action(profile, action, func, *args, **kwargs):
+    """
+    执行一次鼠标键盘操作，然后按节奏配置停顿并记录耗时
+
+    Args:
+        profile: 节奏配置名称
+        action: 操作类别（ACTION_*）
+        func: pyautogui 函数，其余参数原样传给它
+
+    Returns:
+        func 的返回值
+    """
+    profile = resolve_timing_profile(profile)
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    acting = time.perf_counter() - start
+    timing_stats.record(profile, acting, profile_pause(profile, action))
+    return result
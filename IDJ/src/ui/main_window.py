@@ -112,6 +112,9 @@ from modules.mouse_control import MouseControl
 
 from modules.keyboard_control import KeyboardControl
 
+from modules.screen_capture import set_bound_window
+from modules.timing_profiles import timing_stats
+
 
 
 
@@ -1048,6 +1051,9 @@ class MainWindow(QMainWindow):
 
                 self.bound_window = hwnd
 
+                # 识别积木的"仅绑定窗口"搜索范围使用该窗口
+                set_bound_window(hwnd)
+
 
 
                 self.status_label.setText(f"状态 已绑定窗口- {selected_window['title']}")
@@ -1792,6 +1798,8 @@ class ExecutionThread(QThread):
 
     def run(self):
         """线程运行方法"""
+        # 本次执行开始时的节奏统计，结束时只报告本次执行的操作
+        timing_start = timing_stats.snapshot()
         try:
             # 创建执行代码的命名空间，包含 step_changed 信号和控制变量
             namespace = {
@@ -1805,6 +1813,12 @@ class ExecutionThread(QThread):
             self.finished.emit()
         except Exception as e:
             self.error.emit(str(e))
+        finally:
+            # 脚本结束或被停止时取消其后台截图订阅
+            recognizer = namespace.get('image_recognizer')
+            if recognizer is not None and hasattr(recognizer, 'stop_capture_stream'):
+                recognizer.stop_capture_stream()
+            logger.info("本次执行的操作节奏统计（停顿与操作耗时）:\n" + timing_stats.format_report(timing_start))
     
     def check_execution_control(self):
         """检查执行控制状态，供生成的代码调用"""
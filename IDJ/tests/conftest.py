@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""测试配置：与 main.py 一样把 src 目录加入模块搜索路径"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
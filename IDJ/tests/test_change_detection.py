@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""帧指纹与识别结果缓存（轮询时的帧变化检测）测试"""
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.screen_capture import ArrayBackend, frame_fingerprint, frame_provider
+from modules.image_recognition import ImageRecognition, MatchResultCache, result_cache
+
+
+def test_fingerprint_tracks_content_and_shape():
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    fingerprint = frame_fingerprint(frame)
+
+    assert frame_fingerprint(frame.copy()) == fingerprint
+    changed = frame.copy()
+    changed[0, 0] = 255
+    assert frame_fingerprint(changed) != fingerprint
+    assert frame_fingerprint(frame[:, :1000]) != fingerprint
+
+
+def test_fingerprint_detects_small_change_between_grid_points():
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    changed = frame.copy()
+    changed[1:5, 1:5] = 255
+
+    assert frame_fingerprint(changed) != frame_fingerprint(frame)
+    assert frame_fingerprint(changed[1:1000, 1:1900]) != frame_fingerprint(frame[1:1000, 1:1900])
+
+
+def test_fingerprint_of_cropped_view_matches_copy():
+    frame = np.random.default_rng(0).integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    view = frame[50:250, 100:300]
+
+    assert frame_fingerprint(view) == frame_fingerprint(view.copy())
+
+
+def test_result_cache_invalidated_by_fingerprint():
+    cache = MatchResultCache()
+    key = ("find_image", "button.png")
+
+    assert cache.lookup(key, "a") == (False, None)
+    cache.store(key, "a", (10, 20))
+    assert cache.lookup(key, "a") == (True, (10, 20))
+    assert cache.lookup(key, "b") == (False, None)
+    cache.store(key, "b", None)
+    assert cache.lookup(key, "b") == (True, None)
+    assert cache.stats()["skipped"] == 2
+    assert cache.stats()["executed"] == 2
+
+
+def test_result_cache_disabled_and_bounded():
+    cache = MatchResultCache(max_entries=2)
+    for i in range(3):
+        cache.store(i, "same", i)
+    assert cache.lookup(0, "same") == (False, None)
+    assert cache.lookup(2, "same") == (True, 2)
+
+    cache.enabled = False
+    assert cache.lookup(2, "same") == (False, None)
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    """用数组作为屏幕，每次识别都重新截图"""
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    frame[40:60, 70:90] = (0, 0, 255)
+    frame[45:55, 75:85] = (255, 255, 255)
+    monkeypatch.setattr(frame_provider, "_backend", ArrayBackend(frame))
+    monkeypatch.setattr(frame_provider, "max_age", 0.0)
+    result_cache.clear()
+    yield frame
+    result_cache.clear()
+
+
+def _executed():
+    return result_cache.stats()["executed"]
+
+
+def test_find_image_skips_unchanged_frame(screen, tmp_path):
+    template = tmp_path / "target.png"
+    cv2.imwrite(str(template), screen[38:62, 68:92])
+    recognition = ImageRecognition()
+
+    position = recognition.find_image(str(template), change_detection=True)
+    assert position is not None
+    executed = _executed()
+    assert recognition.find_image(str(template), change_detection=True) == position
+    assert _executed() == executed
+
+    # 画面变化后重新匹配
+    screen[0:10, 0:10] = 128
+    assert recognition.find_image(str(template), change_detection=True) == position
+    assert _executed() == executed + 1
+
+    # 模板文件被替换后重新匹配
+    cv2.imwrite(str(template), screen[0:24, 0:24])
+    stat = os.stat(template)
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    recognition.find_image(str(template), change_detection=True)
+    assert _executed() == executed + 2
+
+
+def test_find_image_without_change_detection_always_matches(screen, tmp_path):
+    template = tmp_path / "target.png"
+    cv2.imwrite(str(template), screen[38:62, 68:92])
+    recognition = ImageRecognition()
+
+    stats = result_cache.stats()
+    recognition.find_image(str(template))
+    recognition.find_image(str(template))
+
+    assert result_cache.stats()["executed"] == stats["executed"]
+    assert result_cache.stats()["skipped"] == stats["skipped"]
+
+
+def test_find_color_sees_small_change_on_full_screen(screen, monkeypatch):
+    full_screen = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    monkeypatch.setattr(frame_provider, "_backend", ArrayBackend(full_screen))
+    recognition = ImageRecognition()
+
+    assert recognition.find_color((0, 255, 0), tolerance=0, change_detection=True) is None
+    full_screen[101:104, 121:124] = (0, 255, 0)
+    assert recognition.find_color((0, 255, 0), tolerance=0, change_detection=True) == (121, 101)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""颜色参数解析在各颜色搜索中保持一致的测试"""
+
+import numpy as np
+import pytest
+
+from modules.screen_capture import ArrayBackend, frame_provider
+from modules.image_recognition import ImageRecognition
+
+
+@pytest.fixture
+def recognition(monkeypatch):
+    frame = np.zeros((40, 60, 3), dtype=np.uint8)
+    frame[10, 20] = (0, 128, 255)  # BGR，即RGB (255, 128, 0)
+    monkeypatch.setattr(frame_provider, "_backend", ArrayBackend(frame))
+    monkeypatch.setattr(frame_provider, "max_age", 0.0)
+    return ImageRecognition()
+
+
+@pytest.mark.parametrize("color", ["#FF8000", "ff8000", (255, 128, 0), [255, 128, 0], ("255", "128", "0")])
+def test_color_formats_accepted_everywhere(recognition, color):
+    assert recognition.find_color(color, tolerance=0) == (20, 10)
+    assert recognition.find_all_colors(color, tolerance=0) == [(20, 10)]
+    assert recognition.find_colors([color], tolerance=0)[tuple(color) if isinstance(color, list) else color] == (20, 10)
+
+
+@pytest.mark.parametrize("color", ["#GG0000", "#FFF", (255, 128), None])
+def test_invalid_colors_rejected_everywhere(recognition, color, caplog):
+    assert recognition.find_color(color) is None
+    assert recognition.find_all_colors(color) == []
+    assert recognition.wait_for_color(color, timeout=0) is None
+
+    errors = [record.getMessage() for record in caplog.records if record.levelname == "ERROR"]
+    assert len(errors) == 3
+    assert all(message.startswith("无效的颜色格式") for message in errors)
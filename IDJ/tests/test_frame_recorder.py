@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""帧录制的异或差值编码与分块解码测试"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from modules.frame_recorder import FrameRecorder, FrameRecording, RECORDING_INDEX
+from modules.image_saver import ImageSaveQueue
+
+
+@pytest.fixture
+def writer():
+    queue = ImageSaveQueue(max_workers=1)
+    yield queue
+    queue.shutdown()
+
+
+def _frames(count, shape=(24, 32, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    frames = [rng.integers(0, 256, shape, dtype=np.uint8)]
+    for _ in range(count - 1):
+        frame = frames[-1].copy()
+        frame[rng.integers(0, shape[0]), :] = rng.integers(0, 256, shape[1:], dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+
+def _index(path):
+    with open(os.path.join(path, RECORDING_INDEX), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_roundtrip_across_chunks(tmp_path, writer):
+    frames = _frames(7)
+    with FrameRecorder(str(tmp_path), chunk_frames=3, writer=writer) as recorder:
+        for i, frame in enumerate(frames):
+            recorder.add(frame, timestamp=i * 0.1)
+
+    recording = FrameRecording(str(tmp_path))
+    assert len(recording) == 7
+    assert [chunk["count"] for chunk in _index(str(tmp_path))["chunks"]] == [3, 3, 1]
+    for i, frame in enumerate(frames):
+        np.testing.assert_array_equal(recording.frame(i), frame)
+    assert recording.duration == pytest.approx(0.6)
+    assert recording.index_at(0.35) == 3
+
+
+def test_chunk_size_limited_by_bytes(tmp_path, writer):
+    frames = _frames(5)
+    with FrameRecorder(str(tmp_path), chunk_frames=30, chunk_max_bytes=frames[0].nbytes * 2,
+                       writer=writer) as recorder:
+        for frame in frames:
+            recorder.add(frame)
+
+    assert [chunk["count"] for chunk in _index(str(tmp_path))["chunks"]] == [2, 2, 1]
+    recording = FrameRecording(str(tmp_path))
+    for i, frame in enumerate(frames):
+        np.testing.assert_array_equal(recording.frame(i), frame)
+
+
+def test_resolution_change_starts_new_chunk(tmp_path, writer):
+    small = _frames(2, shape=(10, 10, 3), seed=1)
+    large = _frames(2, shape=(20, 16, 3), seed=2)
+    with FrameRecorder(str(tmp_path), chunk_frames=10, writer=writer) as recorder:
+        for frame in small + large:
+            recorder.add(frame)
+
+    chunks = _index(str(tmp_path))["chunks"]
+    assert [chunk["shape"] for chunk in chunks] == [[10, 10, 3], [20, 16, 3]]
+    recording = FrameRecording(str(tmp_path))
+    for i, frame in enumerate(small + large):
+        np.testing.assert_array_equal(recording.frame(i), frame)
+
+
+def test_add_after_close_raises(tmp_path, writer):
+    recorder = FrameRecorder(str(tmp_path), writer=writer)
+    recorder.close()
+    with pytest.raises(RuntimeError):
+        recorder.add(np.zeros((4, 4, 3), dtype=np.uint8))
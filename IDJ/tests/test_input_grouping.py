@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""相邻输入积木合并为批量输入积木的测试"""
+
+from blocks.input_grouping import group_input_batches
+
+
+def _block(name, block_type):
+    return {'name': name, 'type': block_type, 'properties': {}}
+
+
+def test_adjacent_input_blocks_are_merged():
+    click = _block("点击", "mouse_click")
+    text = _block("输入", "keyboard_input")
+    key = _block("回车", "keyboard_key")
+    wait = _block("等待", "delay")
+
+    grouped = group_input_batches([click, text, key, wait])
+
+    assert len(grouped) == 2
+    assert grouped[0]['type'] == "input_batch"
+    assert grouped[0]['blocks'] == [click, text, key]
+    assert grouped[0]['name'] == "点击、输入、回车"
+    assert grouped[1] is wait
+
+
+def test_single_input_block_is_kept():
+    wait = _block("等待", "delay")
+    click = _block("点击", "mouse_click")
+    find = _block("找图", "find_image")
+
+    assert group_input_batches([wait, click, find]) == [wait, click, find]
+
+
+def test_move_and_drag_are_not_batched():
+    blocks = [_block("移动", "mouse_move"), _block("拖动", "mouse_drag"), _block("点击", "mouse_click")]
+
+    assert group_input_batches(blocks) == blocks
+
+
+def test_runs_split_by_other_blocks():
+    blocks = [
+        _block("a", "mouse_click"), _block("b", "keyboard_key"),
+        _block("等待", "delay"),
+        _block("c", "keyboard_input"), _block("d", "mouse_click"),
+    ]
+
+    grouped = group_input_batches(blocks)
+
+    assert [block['type'] for block in grouped] == ["input_batch", "delay", "input_batch"]
+    assert [len(block['blocks']) for block in (grouped[0], grouped[2])] == [2, 2]
+
+
+def test_empty_and_trailing_runs():
+    assert group_input_batches([]) == []
+    grouped = group_input_batches([_block("等待", "delay"), _block("a", "keyboard_key"), _block("b", "keyboard_key")])
+    assert grouped[-1]['type'] == "input_batch"
+    assert [block['name'] for block in grouped[-1]['blocks']] == ["a", "b"]
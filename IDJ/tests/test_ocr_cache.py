@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""OCR结果缓存的键、过期和淘汰测试"""
+
+import time
+
+import numpy as np
+
+from modules.ocr_worker import OcrCache
+
+WORDS = [{"text": "确定", "left": 1, "top": 2, "width": 30, "height": 12, "conf": 90.0}]
+
+
+def test_key_follows_region_content():
+    image = np.zeros((20, 40), dtype=np.uint8)
+    key = OcrCache.make_key(image, "chi_sim", "")
+
+    assert OcrCache.make_key(image.copy(), "chi_sim", "") == key
+    changed = image.copy()
+    changed[5, 5] = 1
+    assert OcrCache.make_key(changed, "chi_sim", "") != key
+    assert OcrCache.make_key(image, "eng", "") != key
+    assert OcrCache.make_key(image, "chi_sim", "--psm 7") != key
+
+
+def test_key_of_cropped_view_matches_copy():
+    frame = np.random.default_rng(0).integers(0, 256, (100, 100), dtype=np.uint8)
+    view = frame[10:60, 20:80]
+
+    assert OcrCache.make_key(view, None, "") == OcrCache.make_key(view.copy(), None, "")
+
+
+def test_hit_returns_copy():
+    cache = OcrCache()
+    cache.put("key", WORDS)
+
+    words = cache.get("key")
+    assert words == WORDS
+    words[0]["text"] = "取消"
+    assert cache.get("key") == WORDS
+    assert cache.stats()["hits"] == 2
+
+
+def test_expired_entry_is_dropped():
+    cache = OcrCache(ttl=0.01)
+    cache.put("key", WORDS)
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+    stats = cache.stats()
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+
+
+def test_lru_eviction_and_disable():
+    cache = OcrCache(max_entries=2)
+    cache.put("a", WORDS)
+    cache.put("b", WORDS)
+    cache.get("a")
+    cache.put("c", WORDS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == WORDS
+    assert cache.stats()["evictions"] == 1
+
+    cache.configure(max_entries=0)
+    assert cache.stats()["entries"] == 0
+    cache.put("d", WORDS)
+    assert cache.get("d") is None
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""模板图像缓存的命中、文件替换失效和字节预算淘汰测试"""
+
+import os
+
+import cv2
+import numpy as np
+
+from modules.image_recognition import TemplateCache
+
+
+def _write(path, value, size=(8, 8)):
+    image = np.full(size + (3,), value, dtype=np.uint8)
+    assert cv2.imwrite(str(path), image)
+    return image
+
+
+def test_hit_returns_cached_image(tmp_path):
+    path = tmp_path / "button.png"
+    _write(path, 100)
+    cache = TemplateCache()
+
+    first = cache.get(str(path))
+    second = cache.get(str(path))
+
+    assert second is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_replaced_file_is_reloaded(tmp_path):
+    path = tmp_path / "button.png"
+    _write(path, 100)
+    cache = TemplateCache()
+    assert cache.get(str(path))[0, 0, 0] == 100
+
+    _write(path, 200)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(str(path))[0, 0, 0] == 200
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["entries"] == 1
+
+
+def test_read_mode_is_part_of_key(tmp_path):
+    path = tmp_path / "button.png"
+    _write(path, 100)
+    cache = TemplateCache()
+
+    assert cache.get(str(path), cv2.IMREAD_COLOR).ndim == 3
+    assert cache.get(str(path), cv2.IMREAD_GRAYSCALE).ndim == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path):
+    paths = [tmp_path / f"{i}.png" for i in range(3)]
+    for i, path in enumerate(paths):
+        _write(path, i)
+    image_bytes = 8 * 8 * 3
+    cache = TemplateCache(max_bytes=image_bytes * 2)
+
+    cache.get(str(paths[0]))
+    cache.get(str(paths[1]))
+    cache.get(str(paths[0]))
+    cache.get(str(paths[2]))
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+    cache.get(str(paths[0]))
+    assert cache.stats()["hits"] == 2
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert TemplateCache().get(str(tmp_path / "missing.png")) is None
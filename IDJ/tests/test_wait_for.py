@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""等待图像/颜色出现的轮询测试"""
+
+import numpy as np
+import pytest
+
+from modules.screen_capture import ArrayBackend, frame_provider
+from modules.image_recognition import ImageRecognition, result_cache
+
+
+@pytest.fixture
+def use_frames(monkeypatch):
+    """依次把给定的数组作为屏幕"""
+    def use(frames):
+        monkeypatch.setattr(frame_provider, "_backend", ArrayBackend(frames))
+    return use
+
+
+def test_small_target_appearing_later_is_found(use_frames):
+    blank = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    target = blank.copy()
+    target[1:5, 1:5] = (0, 255, 0)
+    use_frames([blank, blank, blank, target])
+    stats = result_cache.stats()
+
+    assert ImageRecognition().wait_for_color((0, 255, 0), timeout=5.0, tolerance=0) == (1, 1)
+    assert result_cache.stats()["executed"] == stats["executed"]
+    assert result_cache.stats()["skipped"] == stats["skipped"]
+
+
+def test_unchanged_frame_is_checked_once(use_frames, monkeypatch):
+    use_frames(np.zeros((100, 100, 3), dtype=np.uint8))
+    recognition = ImageRecognition()
+    checks = []
+    find_color_in_frame = recognition._find_color_in_frame
+    monkeypatch.setattr(recognition, "_find_color_in_frame",
+                        lambda *args, **kwargs: checks.append(1) or find_color_in_frame(*args, **kwargs))
+
+    assert recognition.wait_for_color((0, 255, 0), timeout=0.3, tolerance=0) is None
+    assert len(checks) == 1
+
+
+def test_on_poll_can_stop_waiting(use_frames):
+    use_frames(np.zeros((100, 100, 3), dtype=np.uint8))
+
+    def stop():
+        raise InterruptedError
+
+    with pytest.raises(InterruptedError):
+        ImageRecognition().wait_for_color((0, 255, 0), timeout=5.0, on_poll=stop)